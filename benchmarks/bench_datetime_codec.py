@@ -0,0 +1,66 @@
+"""Benchmark of parsing and formatting RFC3339 datetimes, comparing the datetime codec to the
+previous helper implementations. Rows of survey data repeat many identical timestamps, which is
+modelled by a pool of distinct values.
+
+Run with :code:`python -m benchmarks.bench_datetime_codec`.
+"""
+
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from caplena.datetime_codec import DatetimeCodec
+
+VALUES = 10000
+DISTINCT = 500
+NUMBER = 10
+
+
+def legacy_from_rfc3339_datetime(value: str) -> datetime:
+    iso_8601 = value.replace("Z", "+00:00")
+    return datetime.fromisoformat(iso_8601)
+
+
+def legacy_to_rfc3339_datetime(dt: datetime) -> str:
+    rfc3339 = dt.strftime("%Y-%m-%dT%H:%M:%S.")
+    rfc3339 += dt.strftime("%f")[:3]
+
+    tz = dt.strftime("%z")
+    if tz == "+0000":
+        tz = "Z"
+    elif tz != "":
+        tz = tz[:3] + ":" + tz[3:]
+    return rfc3339 + tz
+
+
+def build_values() -> List[str]:
+    start = datetime(2022, 3, 14, 8, 18, 38, 910000, tzinfo=timezone.utc)
+    distinct = [legacy_to_rfc3339_datetime(start + timedelta(minutes=i)) for i in range(DISTINCT)]
+    return [distinct[i % DISTINCT] for i in range(VALUES)]
+
+
+def report(name: str, elapsed: float) -> None:
+    print(f"{name:>22}: {elapsed / NUMBER / VALUES * 1e9:.0f} ns per datetime")
+
+
+def main() -> None:
+    values = build_values()
+    dts = [legacy_from_rfc3339_datetime(value) for value in values]
+    codec = DatetimeCodec()
+
+    report(
+        "legacy parse",
+        timeit.timeit(lambda: [legacy_from_rfc3339_datetime(v) for v in values], number=NUMBER),
+    )
+    report("codec parse", timeit.timeit(lambda: [codec.parse(v) for v in values], number=NUMBER))
+    report("codec parse_many", timeit.timeit(lambda: codec.parse_many(values), number=NUMBER))
+    report(
+        "legacy format",
+        timeit.timeit(lambda: [legacy_to_rfc3339_datetime(dt) for dt in dts], number=NUMBER),
+    )
+    report("codec format", timeit.timeit(lambda: [codec.format(dt) for dt in dts], number=NUMBER))
+    report("codec format_many", timeit.timeit(lambda: codec.format_many(dts), number=NUMBER))
+
+
+if __name__ == "__main__":
+    main()
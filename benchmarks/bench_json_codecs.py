@@ -0,0 +1,58 @@
+"""Benchmark of encoding a bulk upload of rows with every available JSON codec. As all codecs encode
+datetimes as RFC3339 strings with millisecond precision, orjson formats every datetime in Python, and
+msgspec formats all of them in a pass over the payload before encoding it. Encoding with msgspec's
+native datetime format is measured for comparison.
+
+Run with :code:`python -m benchmarks.bench_json_codecs`.
+"""
+
+import timeit
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from caplena.http.json_codec import (
+    JsonCodec,
+    MsgspecCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+)
+
+ROWS = 10000
+NUMBER = 5
+
+
+def build_rows() -> List[Dict[str, Any]]:
+    start = datetime(2022, 1, 5, 10, tzinfo=timezone.utc)
+    return [
+        {
+            "columns": [
+                {"ref": "age", "value": idx % 90},
+                {"ref": "visited", "value": start + timedelta(minutes=idx)},
+                {"ref": "feedback", "value": f"Good price, friendly staff. ({idx})"},
+            ]
+        }
+        for idx in range(ROWS)
+    ]
+
+
+def main() -> None:
+    rows = build_rows()
+    encoders: List[Tuple[str, Callable[[Any], bytes]]] = [("json", StdlibJsonCodec().encode)]
+    for codec_cls in (OrjsonCodec, MsgspecCodec):
+        try:
+            codec: JsonCodec = codec_cls()
+        except ImportError:
+            continue
+        encoders.append((codec.identifier, codec.encode))
+        if isinstance(codec, MsgspecCodec):
+            import msgspec
+
+            encoders.append(("msgspec (native)", msgspec.json.Encoder().encode))
+
+    for name, encode in encoders:
+        elapsed = min(timeit.repeat(lambda: encode(rows), number=NUMBER, repeat=7)) / NUMBER
+        print(f"{name:>20}: {elapsed * 1e3:>7.1f} ms per {ROWS} rows")
+
+
+if __name__ == "__main__":
+    main()
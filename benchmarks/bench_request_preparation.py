@@ -0,0 +1,42 @@
+"""Micro-benchmark of preparing a request, i.e. building its uri and headers.
+
+Run with :code:`python -m benchmarks.bench_request_preparation`.
+"""
+
+import timeit
+from typing import List, Tuple, Union
+
+from caplena.api import ApiBaseUri, ApiRequestor, ApiRoute, ApiVersion
+from caplena.http.requests_http_client import RequestsHttpClient
+from caplena.logging.default_logger import DefaultLogger
+
+NUMBER = 50_000
+ROUTE = ApiRoute("/projects/{p_id}/rows/{r_id}")
+
+
+def main() -> None:
+    api_requestor = ApiRequestor(
+        http_client=RequestsHttpClient(), logger=DefaultLogger(name="benchmark")
+    )
+    path_params = {"p_id": "pj_1234", "r_id": "ro_5678"}
+
+    def prepare(path: Union[str, ApiRoute]) -> None:
+        api_requestor.build_uri(
+            base_uri=ApiBaseUri.PRODUCTION,
+            path=path,
+            path_params=path_params,
+            query_params={"limit": "10"},
+        )
+        api_requestor.build_request_headers(api_key="key", api_version=ApiVersion.VER_2022_11_22)
+
+    paths: List[Tuple[str, Union[str, ApiRoute]]] = [
+        ("string path", ROUTE.path),
+        ("precompiled route", ROUTE),
+    ]
+    for name, path in paths:
+        elapsed = timeit.timeit(lambda: prepare(path), number=NUMBER)
+        print(f"{name:>20}: {elapsed / NUMBER * 1e6:.2f} us per request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""Benchmark of decoding a page of rows, either by parsing the decoded dictionaries, generically or
+with a parser compiled for the project, or by decoding the response body straight into rows using
+typed schemas.
+
+Run with :code:`python -m benchmarks.bench_row_decoding`.
+"""
+
+import json
+import timeit
+from typing import Any, Dict
+
+from caplena.endpoints.projects_endpoint import Row
+from caplena.endpoints.row_parser import RowParser
+
+PAGE_SIZE = 1000
+NUMBER = 5
+
+
+def build_row(idx: int) -> Dict[str, Any]:
+    return {
+        "id": f"ro_{idx}",
+        "created": "2022-03-14T08:18:38.910Z",
+        "last_modified": "2022-03-14T08:18:38.910Z",
+        "columns": [
+            {"ref": "age", "type": "numerical", "value": idx},
+            {"ref": "visited", "type": "date", "value": "2022-01-05T10:00:00.000Z"},
+            {
+                "ref": "feedback",
+                "type": "text_to_analyze",
+                "value": "Good price, friendly staff.",
+                "was_reviewed": False,
+                "sentiment_overall": "positive",
+                "source_language": "en",
+                "translated_value": None,
+                "topics": [
+                    {
+                        "id": f"cd_{code}",
+                        "label": f"topic {code}",
+                        "category": "SERVICE",
+                        "code": code,
+                        "sentiment_label": f"topic {code} positive",
+                        "sentiment": "positive",
+                    }
+                    for code in range(3)
+                ],
+            },
+        ],
+    }
+
+
+def main() -> None:
+    page = {"results": [build_row(i) for i in range(PAGE_SIZE)], "next_url": None, "count": 1}
+    content = json.dumps(page).encode("utf-8")
+
+    def parse() -> None:
+        for row in json.loads(content)["results"]:
+            Row.build_obj(row, controller=None, obj_exists=True, metadata={"project": "pj_1"})
+
+    elapsed = timeit.timeit(parse, number=NUMBER) / NUMBER
+    print(f"{'parse_obj':>16}: {elapsed * 1e3:.1f} ms per page of {PAGE_SIZE} rows")
+
+    results = json.loads(content)["results"]
+    parser = RowParser.from_row("pj_1", results[0])
+
+    def parse_compiled() -> None:
+        for row in json.loads(content)["results"]:
+            parser.parse(row, controller=None)
+
+    elapsed = timeit.timeit(parse_compiled, number=NUMBER) / NUMBER
+    print(f"{'compiled parser':>16}: {elapsed * 1e3:.1f} ms per page of {PAGE_SIZE} rows")
+
+    try:
+        from caplena.endpoints.projects_schema import TYPED_DECODERS
+    except ImportError:
+        print("msgspec is not installed, skipping typed decoding.")
+        return
+
+    decoder = TYPED_DECODERS[Row]
+    elapsed = timeit.timeit(
+        lambda: decoder.decode_page(content, controller=None, metadata={"project": "pj_1"}),
+        number=NUMBER,
+    )
+    print(f"{'typed decoding':>16}: {elapsed / NUMBER * 1e3:.1f} ms per page of {PAGE_SIZE} rows")
+
+
+if __name__ == "__main__":
+    main()
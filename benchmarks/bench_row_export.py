@@ -0,0 +1,48 @@
+"""Benchmark of exporting pages of rows into columnar batches, either by building rows in the calling
+process, or by converting the raw pages in a growing number of worker processes.
+
+Run with :code:`python -m benchmarks.bench_row_export`.
+"""
+
+import json
+import os
+import time
+
+from benchmarks.bench_row_decoding import build_row
+from caplena.endpoints.projects_endpoint import Row
+from caplena.endpoints.row_export import RowExport
+
+PAGES = 64
+PAGE_SIZE = 1000
+LAYOUT = (("age", "numerical"), ("visited", "date"), ("feedback", "text_to_analyze"))
+
+
+def main() -> None:
+    page = {"results": [build_row(i) for i in range(PAGE_SIZE)], "next_url": None, "count": 1}
+    content = json.dumps(page).encode("utf-8")
+    rows = PAGES * PAGE_SIZE
+
+    start = time.perf_counter()
+    for _ in range(PAGES):
+        Row.to_columnar(
+            Row.build_obj(row, controller=None, obj_exists=True)
+            for row in json.loads(content)["results"]
+        )
+    elapsed = time.perf_counter() - start
+    print(f"{'build rows':>16}: {rows / elapsed:>9,.0f} rows/s")
+
+    processes = 1
+    while processes <= (os.cpu_count() or 1):
+        export = RowExport(
+            layout=LAYOUT, pages=PAGES, fetch_page=lambda _: content, processes=processes
+        )
+        start = time.perf_counter()
+        for _ in export.iter_columnar():
+            pass
+        elapsed = time.perf_counter() - start
+        print(f"{f'{processes} process(es)':>16}: {rows / elapsed:>9,.0f} rows/s")
+        processes *= 2
+
+
+if __name__ == "__main__":
+    main()
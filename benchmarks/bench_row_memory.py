@@ -0,0 +1,47 @@
+"""Benchmark of the memory held by parsed rows, with and without interning the values repeated
+across the rows of a project.
+
+Run with :code:`python -m benchmarks.bench_row_memory`.
+"""
+
+import json
+import tracemalloc
+from typing import Any, Dict, List, Optional
+
+from benchmarks.bench_row_decoding import build_row
+from caplena.endpoints.projects_endpoint import Row
+
+ROWS = 5000
+
+
+def parse_rows(payload: bytes, metadata: Optional[Dict[str, Any]]) -> List[Row]:
+    rows = []
+    for obj in json.loads(payload):
+        row = Row.build_obj(
+            obj, controller=None, obj_exists=True, metadata=dict(metadata) if metadata else None
+        )
+        for column in row.columns:
+            column.dict()
+        rows.append(row)
+    return rows
+
+
+def measure(payload: bytes, metadata: Optional[Dict[str, Any]]) -> int:
+    tracemalloc.start()
+    rows = parse_rows(payload, metadata)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del rows
+    return size
+
+
+def main() -> None:
+    payload = json.dumps([build_row(i) for i in range(ROWS)]).encode("utf-8")
+
+    for name, metadata in [("without interning", None), ("interned", {"project": "pj_1"})]:
+        size = measure(payload, metadata)
+        print(f"{name:>18}: {size / ROWS / 1024:.1f} KiB per row")
+
+
+if __name__ == "__main__":
+    main()
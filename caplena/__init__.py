@@ -2,9 +2,19 @@
 
 from caplena.api import ApiBaseUri, ApiOrdering, ApiVersion
 from caplena.client import Client
+from caplena.http.http_cache import FileHttpCache, HttpCache, InMemoryHttpCache
 from caplena.http.http_client import HttpMethod, HttpRetry
+from caplena.http.json_codec import (
+    JsonCodec,
+    MsgspecCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+)
 from caplena.http.requests_http_client import RequestsHttpClient
+from caplena.http.sqlite_http_cache import SqliteHttpCache
 from caplena.logging.logger import LoggingLevel
+from caplena.object_cache import ObjectCache
+from caplena.unit_of_work import UnitOfWork
 from caplena.version import __version__
 
 __all__ = [
@@ -16,5 +26,15 @@ __all__ = [
     "HttpRetry",
     "HttpMethod",
     "RequestsHttpClient",
+    "HttpCache",
+    "InMemoryHttpCache",
+    "FileHttpCache",
+    "SqliteHttpCache",
+    "JsonCodec",
+    "StdlibJsonCodec",
+    "OrjsonCodec",
+    "MsgspecCodec",
     "LoggingLevel",
+    "ObjectCache",
+    "UnitOfWork",
 ]
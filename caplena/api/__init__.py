@@ -3,12 +3,14 @@ from caplena.api.api_exception import ApiException
 from caplena.api.api_filter import ApiFilter, ZeroOrMany
 from caplena.api.api_ordering import ApiOrdering
 from caplena.api.api_requestor import ApiRequestor
+from caplena.api.api_route import ApiRoute
 from caplena.api.api_version import ApiVersion
 
 __all__ = [
     "ApiBaseUri",
     "ApiException",
     "ApiRequestor",
+    "ApiRoute",
     "ApiVersion",
     "ApiFilter",
     "ZeroOrMany",
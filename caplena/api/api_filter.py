@@ -1,6 +1,21 @@
-import copy
 from datetime import datetime
-from typing import Any, ClassVar, Dict, List, Optional, Type, TypeVar, Union
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlencode
 
 from caplena.helpers import Helpers
 
@@ -8,36 +23,245 @@ T = TypeVar("T")
 U = TypeVar("U", bound="ApiFilter")
 
 ZeroOrMany = Optional[Union[T, List[T]]]
-Constraints = Dict[str, List[Dict[str, List[Any]]]]
+Constraints = Mapping[str, Sequence[Mapping[str, Sequence[Any]]]]
+
+# note: a compiled literal consists of the columnar field name, a getter that extracts the
+# field from a single object and a test that is evaluated on the extracted field value.
+CompiledLiteral = Tuple[str, Callable[[Any], Any], Callable[[Any], bool]]
+
+
+class _Clause(Mapping[str, Tuple[Any, ...]]):
+    """An immutable disjunction of filter literals, mapping every filter modifier to its values.
+    Clauses are shared by all filters combined from them, such that they are only serialized once.
+    """
+
+    __slots__ = ("_literals", "_serialized")
+
+    def __init__(self, literals: Mapping[str, Sequence[Any]]):
+        self._literals: Dict[str, Tuple[Any, ...]] = {
+            modifier: tuple(values) for modifier, values in literals.items()
+        }
+        self._serialized: Optional[str] = None
+
+    @classmethod
+    def of(cls, clause: Mapping[str, Sequence[Any]]) -> "_Clause":
+        return clause if isinstance(clause, _Clause) else cls(clause)
+
+    def __getitem__(self, modifier: str) -> Tuple[Any, ...]:
+        return self._literals[modifier]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._literals)
+
+    def __len__(self) -> int:
+        return len(self._literals)
+
+    def __repr__(self) -> str:
+        return f"_Clause({self._literals})"
+
+    def merge(self, other: "_Clause") -> "_Clause":
+        literals = dict(self._literals)
+        for modifier, values in other.items():
+            literals[modifier] = literals.get(modifier, ()) + values
+        return _Clause(literals)
+
+    def serialize(self, *, default: str, to_string: Callable[[Any], str]) -> str:
+        if self._serialized is None:
+            stringified_literals: List[str] = []
+            for modifier, values in self._literals.items():
+                for value in values:
+                    str_value = Helpers.build_escaped_filter_str(to_string(value))
+                    if modifier != default:
+                        str_value = f"{modifier}:" + str_value
+                    stringified_literals.append(str_value)
+            self._serialized = ",".join(stringified_literals)
+        return self._serialized
 
 
 class ApiFilter:
+    """An immutable filter in conjunctive normal form, mapping every filter name to the conjunction
+    of its clauses. Combining filters shares their clauses instead of copying them, and both the
+    query parameters and the locally evaluated predicate are only computed once.
+    """
+
     DEFAULT: ClassVar[str] = "__default__"
 
+    _constraints: Dict[str, Tuple[_Clause, ...]]
+    _has_conjunction: bool
+    _query_params: Optional[Dict[str, str]]
+    _compiled: Optional[List[List[CompiledLiteral]]]
+
     def __init__(
         self,
         constraints: Optional[Constraints] = None,
         has_conjunction: bool = False,
     ):
         # TODO: how to restrict AND, OR, NONE operations
-        self._constraints: Constraints = constraints if constraints is not None else {}
-        self._has_conjunction = has_conjunction
+        constraints = constraints if constraints is not None else {}
+        self._init_attr(
+            "_constraints",
+            {
+                name: tuple(_Clause.of(clause) for clause in clauses)
+                for name, clauses in constraints.items()
+            },
+        )
+        self._init_attr("_has_conjunction", has_conjunction)
+        self._init_attr("_query_params", None)
+        self._init_attr("_compiled", None)
+
+    def _init_attr(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(
+            f"{name}. HINT: Filters are immutable, please combine them using `&` and `|` instead."
+        )
 
     def to_query_params(self) -> Dict[str, str]:
-        query_params: Dict[str, str] = {}
-        for query_param, clauses in self._constraints.items():
-            stringified_clauses: List[str] = []
+        query_params = self._query_params
+        if query_params is None:
+            query_params = {
+                query_param: ";".join(
+                    clause.serialize(default=self.DEFAULT, to_string=self._to_string)
+                    for clause in clauses
+                )
+                for query_param, clauses in self._constraints.items()
+            }
+            self._init_attr("_query_params", query_params)
+        # note: a copy is returned, such that the cached query parameters cannot be modified
+        return dict(query_params)
+
+    def _to_string(self, value: Any) -> str:
+        return self.to_string(value=value)
+
+    def split(self: U, *, max_length: int) -> List[U]:
+        """Splits this filter into multiple filters, such that each of them serializes into a query
+        string of at most :code:`max_length` characters. An object matches this filter if and only if
+        it matches at least one of the returned filters. Filters that are short enough are not split.
+
+        :param max_length: The maximum length of the query string of a single filter.
+        :raises ValueError: If a single filter value exceeds the maximum length.
+        """
+        if len(urlencode(self.to_query_params())) <= max_length:
+            return [self]
+
+        # note: the disjunction with the most values is split in half. as conjunctions distribute
+        # over disjunctions, (a | b) & c is equivalent to (a & c) | (b & c).
+        name, index = max(
+            (
+                (name, index)
+                for name, clauses in self._constraints.items()
+                for index in range(len(clauses))
+            ),
+            key=lambda key: sum(
+                len(values) for values in self._constraints[key[0]][key[1]].values()
+            ),
+        )
+        literals = [
+            (modifier, value)
+            for modifier, values in self._constraints[name][index].items()
+            for value in values
+        ]
+        if len(literals) <= 1:
+            raise ValueError(
+                f"Cannot split filter `{name}`, as a single value exceeds the maximum query length. HINT: "
+                "Please shorten the filter values."
+            )
+
+        half = len(literals) // 2
+        shards: List[U] = []
+        for part in (literals[:half], literals[half:]):
+            literals_by_modifier: Dict[str, List[Any]] = {}
+            for modifier, value in part:
+                literals_by_modifier.setdefault(modifier, []).append(value)
+            clauses = self._constraints[name]
+            constraints = {
+                **self._constraints,
+                name: (*clauses[:index], _Clause(literals_by_modifier), *clauses[index + 1 :]),
+            }
+            shard = type(self)(constraints=constraints, has_conjunction=self._has_conjunction)
+            shards.extend(shard.split(max_length=max_length))
+        return shards
+
+    def to_predicate(self) -> Callable[[Any], bool]:
+        """Compiles this filter into a predicate that can be evaluated locally on objects that
+        have already been retrieved, without sending any requests to the API.
+
+        :raises ValueError: If the filter contains constraints that cannot be evaluated locally.
+        """
+        clauses = self._compile()
+
+        def predicate(obj: Any) -> bool:
             for clause in clauses:
-                stringified_literals: List[str] = []
-                for modifier, values in clause.items():
-                    for value in values:
-                        str_value = Helpers.build_escaped_filter_str(self.to_string(value=value))
-                        if modifier != self.DEFAULT:
-                            str_value = f"{modifier}:" + str_value
-                        stringified_literals.append(str_value)
-                stringified_clauses.append(",".join(stringified_literals))
-            query_params[query_param] = ";".join(stringified_clauses)
-        return query_params
+                for _, getter, test in clause:
+                    if test(getter(obj)):
+                        break
+                else:
+                    return False
+            return True
+
+        return predicate
+
+    def apply(self, objects: Iterable[T]) -> List[T]:
+        """Returns all objects matching this filter, evaluated locally.
+
+        :param objects: The objects to filter.
+        :raises ValueError: If the filter contains constraints that cannot be evaluated locally.
+        """
+        predicate = self.to_predicate()
+        return [obj for obj in objects if predicate(obj)]
+
+    def to_mask(self, batch: Mapping[str, Sequence[Any]]) -> List[bool]:
+        """Evaluates this filter locally on a columnar batch, mapping field names to their values.
+        Returns a list of booleans, indicating for every entry whether it matches this filter.
+
+        :param batch: The columnar batch to evaluate this filter on.
+        :raises ValueError: If the filter contains constraints that cannot be evaluated locally, or
+            if the batch does not contain a field that the filter requires.
+        """
+        size = len(next(iter(batch.values()))) if len(batch) > 0 else 0
+        mask = [True] * size
+        for clause in self._compile():
+            clause_mask = [False] * size
+            for field, _, test in clause:
+                if field not in batch:
+                    raise ValueError(
+                        f"Cannot evaluate filter on field `{field}`, as it is missing in the given batch."
+                    )
+                clause_mask = [
+                    matched or (selected and test(value))
+                    for matched, selected, value in zip(clause_mask, mask, batch[field])
+                ]
+            mask = [selected and matched for selected, matched in zip(mask, clause_mask)]
+        return mask
+
+    def compile_literal(self, name: str, modifier: str, values: Sequence[Any]) -> CompiledLiteral:
+        """Compiles the disjunction of all values of a single filter modifier into a literal that
+        can be evaluated locally. Subclasses should override this method for all the filters
+        they support.
+
+        :param name: The name of the filter, e.g. :code:`created`.
+        :param modifier: The filter modifier, e.g. :code:`year.gte`.
+        :param values: The values given for this filter modifier.
+        """
+        raise ValueError(
+            f"Filter `{name}` with modifier `{modifier}` cannot be evaluated locally. HINT: Please send "
+            "this filter to our API servers instead."
+        )
+
+    def _compile(self) -> List[List[CompiledLiteral]]:
+        compiled: Optional[List[List[CompiledLiteral]]] = self._compiled
+        if compiled is None:
+            compiled = [
+                [
+                    self.compile_literal(name, modifier, values)
+                    for modifier, values in clause.items()
+                ]
+                for name, clauses in self._constraints.items()
+                for clause in clauses
+            ]
+            object.__setattr__(self, "_compiled", compiled)
+        return compiled
 
     def __str__(self) -> str:
         stringified_clauses: List[str] = []
@@ -63,18 +287,14 @@ class ApiFilter:
         :type other: Filter
         :rtype: Filter
         """
-        new_constraints = copy.deepcopy(self._constraints)
-        other_constraints = copy.deepcopy(other._constraints)
-
-        has_conjunction = len(new_constraints.keys()) > 0 and len(other_constraints.keys()) > 0
+        has_conjunction = len(self._constraints) > 0 and len(other._constraints) > 0
         has_conjunction = self._has_conjunction if self._has_conjunction else has_conjunction
         has_conjunction = other._has_conjunction if other._has_conjunction else has_conjunction
 
-        for name, clauses in other_constraints.items():
-            if name in new_constraints:
-                new_constraints[name].extend(clauses)
-            else:
-                new_constraints[name] = clauses
+        # note: the clauses are shared with the original filters, as they are immutable
+        new_constraints = dict(self._constraints)
+        for name, clauses in other._constraints.items():
+            new_constraints[name] = new_constraints.get(name, ()) + clauses
 
         return type(self)(constraints=new_constraints, has_conjunction=has_conjunction)
 
@@ -88,15 +308,14 @@ class ApiFilter:
         :type other: Filter
         :rtype: Filter
         """
-        new_constraints = copy.deepcopy(self._constraints)
-        other_constraints = copy.deepcopy(other._constraints)
-        new_filters = list(new_constraints.keys())
-        other_filters = list(other_constraints.keys())
+        new_constraints = self._constraints
+        new_filters = list(self._constraints.keys())
+        other_filters = list(other._constraints.keys())
 
         has_conjunction = False
         if len(new_filters) == 0:
             has_conjunction = other._has_conjunction
-            new_constraints = other_constraints
+            new_constraints = other._constraints
         elif len(other_filters) == 0:
             has_conjunction = other._has_conjunction
         elif self._has_conjunction or other._has_conjunction:
@@ -118,23 +337,22 @@ class ApiFilter:
                 )
             elif len(new_filters) == 1 and len(other_filters) == 1:
                 name = new_filters[0]
-                for filt_name, values in other_constraints[name][0].items():
-                    new_constraints[name][0].setdefault(filt_name, [])
-                    new_constraints[name][0][filt_name].extend(values)
+                clauses = self._constraints[name]
+                new_constraints = {
+                    name: (clauses[0].merge(other._constraints[name][0]), *clauses[1:])
+                }
 
         return type(self)(constraints=new_constraints, has_conjunction=has_conjunction)
 
     @classmethod
     def construct(cls: Type[U], *, name: str, filters: Dict[str, ZeroOrMany[Any]]) -> U:
-        constraints: Constraints = {}
+        constraints: Dict[str, List[_Clause]] = {}
 
-        clauses: List[Dict[str, List[Any]]] = []
+        clauses: List[_Clause] = []
         for filter_name, values in filters.items():
             values_list = cls.to_list(values=values)
             if values_list is not None:
-                clause: Dict[str, List[Any]] = {}
-                clause[filter_name] = values_list
-                clauses.append(clause)
+                clauses.append(_Clause({filter_name: values_list}))
 
         if len(clauses) > 0:
             constraints[name] = clauses
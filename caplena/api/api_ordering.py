@@ -1,27 +1,96 @@
-import copy
-from typing import Dict, List, Optional, Tuple, Type, TypeVar
+from operator import attrgetter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
 
 from typing_extensions import Literal
 
 from caplena.helpers import Helpers
 
 T = TypeVar("T", bound="ApiOrdering")
-Ordering = List[Tuple[Literal["asc", "desc"], str]]
+U = TypeVar("U")
+Ordering = Sequence[Tuple[Literal["asc", "desc"], str]]
+
+
+class _SortValue:
+    """Wraps a single value of a sort key. Missing values are sorted last in ascending
+    and first in descending order, matching the ordering applied by our API servers.
+    """
+
+    __slots__ = ("value", "reverse")
+
+    def __init__(self, value: Any, reverse: bool):
+        self.value = value
+        self.reverse = reverse
+
+    def __lt__(self, other: "_SortValue") -> bool:
+        left, right = (other.value, self.value) if self.reverse else (self.value, other.value)
+        if left is None:
+            return False
+        elif right is None:
+            return True
+        else:
+            return bool(left < right)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, _SortValue) and bool(self.value == other.value)
 
 
 class ApiOrdering:
+    """An immutable ordering. Its query parameters are only computed once."""
+
     def __init__(self, ordering: Optional[Ordering] = None):
-        if ordering is None:
-            self._ordering = []
-        else:
-            self._ordering = ordering
+        self._ordering: Tuple[Tuple[Literal["asc", "desc"], str], ...] = (
+            tuple(ordering) if ordering is not None else ()
+        )
+        self._order_by: Optional[str] = None
 
     def to_query_params(self) -> Dict[str, str]:
-        stringified_ordering: List[str] = []
-        for direction, name in self._ordering:
-            name = Helpers.build_escaped_filter_str(name)
-            stringified_ordering.append(f"{direction}:{name}")
-        return {"order_by": ";".join(stringified_ordering)}
+        if self._order_by is None:
+            stringified_ordering: List[str] = []
+            for direction, name in self._ordering:
+                name = Helpers.build_escaped_filter_str(name)
+                stringified_ordering.append(f"{direction}:{name}")
+            self._order_by = ";".join(stringified_ordering)
+        return {"order_by": self._order_by}
+
+    def to_sort_key(self) -> Callable[[Any], Tuple[_SortValue, ...]]:
+        """Compiles this ordering into a sort key that can be used to order objects locally."""
+        getters = [(attrgetter(name), direction == "desc") for direction, name in self._ordering]
+
+        def sort_key(obj: Any) -> Tuple[_SortValue, ...]:
+            return tuple(_SortValue(getter(obj), reverse) for getter, reverse in getters)
+
+        return sort_key
+
+    def sort(self, objects: Iterable[U]) -> List[U]:
+        """Returns a new list of the given objects, ordered locally by this ordering.
+
+        :param objects: The objects to order.
+        """
+        return sorted(objects, key=self.to_sort_key())
+
+    def argsort(self, batch: Mapping[str, Sequence[Any]]) -> List[int]:
+        """Returns the indices that would order the given columnar batch by this ordering.
+
+        :param batch: The columnar batch, mapping field names to their values.
+        """
+        size = len(next(iter(batch.values()))) if len(batch) > 0 else 0
+        columns = [(batch[name], direction == "desc") for direction, name in self._ordering]
+        return sorted(
+            range(size),
+            key=lambda idx: tuple(_SortValue(values[idx], reverse) for values, reverse in columns),
+        )
 
     def __str__(self) -> str:
         stringified_ordering: List[str] = []
@@ -38,8 +107,4 @@ class ApiOrdering:
         return cls(ordering=[("desc", name)])
 
     def __and__(self: T, other: T) -> T:
-        new_ordering = copy.deepcopy(self._ordering)
-        other_ordering = copy.deepcopy(other._ordering)
-        new_ordering.extend(other_ordering)
-
-        return type(self)(ordering=new_ordering)
+        return type(self)(ordering=self._ordering + other._ordering)
@@ -1,15 +1,20 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlencode
 
 from caplena.api.api_base_uri import ApiBaseUri
 from caplena.api.api_exception import ApiException
 from caplena.api.api_filter import ApiFilter
 from caplena.api.api_ordering import ApiOrdering
+from caplena.api.api_route import ApiRoute
 from caplena.api.api_version import ApiVersion
+from caplena.constants import MAX_FILTER_QUERY_LENGTH
 from caplena.helpers import Helpers
 from caplena.http.http_client import HttpClient, HttpMethod, HttpRetry
 from caplena.http.http_response import HttpResponse
 from caplena.logging.logger import Logger
 
+F = TypeVar("F", bound=ApiFilter)
+
 
 class ApiRequestor:
     def __init__(
@@ -17,9 +22,12 @@ class ApiRequestor:
         *,
         http_client: HttpClient,
         logger: Logger,
+        max_filter_query_length: int = MAX_FILTER_QUERY_LENGTH,
     ):
         self.http_client = http_client
         self.logger = logger
+        self.max_filter_query_length = max_filter_query_length
+        self._header_templates: Dict[Tuple[str, Optional[str], ApiVersion], Dict[str, str]] = {}
 
     def build_payload(self, **kwargs: Any) -> Dict[str, Any]:
         return Helpers.build_dict(**kwargs)
@@ -28,21 +36,18 @@ class ApiRequestor:
         self,
         *,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         path_params: Optional[Dict[str, str]] = None,
         query_params: Optional[Dict[str, str]] = None,
     ) -> str:
-        path_params = path_params if path_params is not None else {}
-        query_params = query_params if query_params is not None else {}
         if isinstance(base_uri, ApiBaseUri):
             base_uri = base_uri.url
+        route = path if isinstance(path, ApiRoute) else ApiRoute.compile(path)
 
-        absolute_uri = Helpers.append_path(base_uri=base_uri, path=path)
-        return Helpers.build_qualified_uri(
-            absolute_uri,
-            path_params=path_params,
-            query_params=query_params,
-        )
+        uri = route.build_uri(base_uri, path_params if path_params is not None else {})
+        if query_params:
+            uri += "?" + urlencode(query_params)
+        return uri
 
     def build_query_params(
         self,
@@ -62,6 +67,17 @@ class ApiRequestor:
 
         return new_query_params
 
+    def split_filter(self, filter: F) -> List[F]:
+        """Splits filters exceeding the maximum query length into multiple filters, whose results
+        need to be merged. Filters that do not exceed the maximum query length are returned as is.
+        """
+        shards = filter.split(max_length=self.max_filter_query_length)
+        if len(shards) > 1:
+            self.logger.info(
+                "Splitting oversized filter into multiple requests", shards=str(len(shards))
+            )
+        return shards
+
     def build_request_headers(
         self,
         *,
@@ -69,17 +85,20 @@ class ApiRequestor:
         api_version: ApiVersion = ApiVersion.DEFAULT,
         api_key: Optional[str] = None,
     ) -> Dict[str, str]:
-        headers = {} if headers is None else headers.copy()
-        headers.setdefault("Accept", "application/json")
+        identifier = self.http_client.identifier
+        fixed_headers = self._header_templates.get((identifier, api_key, api_version))
+        if fixed_headers is None:
+            fixed_headers = {"User-Agent": Helpers.get_user_agent(identifier=identifier)}
+            if api_key is not None:
+                fixed_headers["Caplena-API-Key"] = api_key
+            if api_version != ApiVersion.DEFAULT:
+                fixed_headers["Caplena-API-Version"] = api_version.version
+            self._header_templates[(identifier, api_key, api_version)] = fixed_headers
 
         # note: we do not allow clients to overwrite user-agent, caplena-api-key or caplena-api-version
-        headers["User-Agent"] = Helpers.get_user_agent(identifier=self.http_client.identifier)
-        if api_key is not None:
-            headers["Caplena-API-Key"] = api_key
-        if api_version != ApiVersion.DEFAULT:
-            headers["Caplena-API-Version"] = api_version.version
-
-        return headers
+        if not headers:
+            return {"Accept": "application/json", **fixed_headers}
+        return {"Accept": "application/json", **headers, **fixed_headers}
 
     def build_exc(self, response: HttpResponse) -> ApiException:
         exc_body = response.json
@@ -101,7 +120,7 @@ class ApiRequestor:
     def request_raw(
         self,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         method: HttpMethod = HttpMethod.GET,
         api_version: ApiVersion = ApiVersion.DEFAULT,
@@ -137,7 +156,7 @@ class ApiRequestor:
     def get(
         self,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         api_version: ApiVersion = ApiVersion.DEFAULT,
         api_key: Optional[str] = None,
@@ -169,7 +188,7 @@ class ApiRequestor:
     def post(
         self,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         api_version: ApiVersion = ApiVersion.DEFAULT,
         api_key: Optional[str] = None,
@@ -197,7 +216,7 @@ class ApiRequestor:
     def put(
         self,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         api_version: ApiVersion = ApiVersion.DEFAULT,
         api_key: Optional[str] = None,
@@ -225,7 +244,7 @@ class ApiRequestor:
     def patch(
         self,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         api_version: ApiVersion = ApiVersion.DEFAULT,
         api_key: Optional[str] = None,
@@ -253,7 +272,7 @@ class ApiRequestor:
     def delete(
         self,
         base_uri: Union[str, ApiBaseUri],
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         api_version: ApiVersion = ApiVersion.DEFAULT,
         api_key: Optional[str] = None,
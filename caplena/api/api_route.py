@@ -0,0 +1,71 @@
+import re
+from functools import lru_cache
+from typing import ClassVar, List, Mapping, Optional, Pattern, Tuple
+
+
+class ApiRoute:
+    """A route template, e.g. :code:`/projects/{p_id}/rows/{r_id}`. The template is parsed and
+    validated once, such that building a path only joins its segments with the given parameters.
+
+    :param path: The path template, with parameters enclosed in curly braces.
+    :raises ValueError: If the template specifies a parameter without a name.
+    """
+
+    PARAM_PATTERN: ClassVar[Pattern[str]] = re.compile(r"{(.*?)}")
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def params(self) -> Tuple[str, ...]:
+        """The names of all parameters of this route, in order of appearance."""
+        return tuple(param for _, param in self._segments if param is not None)
+
+    def __init__(self, path: str):
+        self._path = path
+        self._is_empty = path == ""
+        # note: the leading slash is removed once here, such that joining the route
+        # with a base uri never duplicates it.
+        relative = path if path == "" or path[0] != "/" else path[1:]
+
+        self._segments: List[Tuple[str, Optional[str]]] = []
+        position = 0
+        for match in self.PARAM_PATTERN.finditer(relative):
+            if match.group(1) == "":
+                raise ValueError(
+                    "Path specifies an invalid path parameter. Parameter name must not be empty."
+                )
+            self._segments.append((relative[position : match.start()], match.group(1)))
+            position = match.end()
+        self._segments.append((relative[position:], None))
+
+    def __repr__(self) -> str:
+        return f"ApiRoute({self._path!r})"
+
+    def build_path(self, path_params: Mapping[str, str]) -> str:
+        """Returns the path of this route relative to the base uri, without a leading slash.
+
+        :param path_params: The values of all parameters of this route.
+        :raises ValueError: If the value of a parameter is missing.
+        """
+        parts: List[str] = []
+        for literal, param in self._segments:
+            parts.append(literal)
+            if param is not None:
+                if param not in path_params:
+                    raise ValueError(f"Path requires `{param}` parameter, but none is given.")
+                parts.append(str(path_params[param]))
+        return "".join(parts)
+
+    def build_uri(self, base_uri: str, path_params: Mapping[str, str]) -> str:
+        if self._is_empty:
+            return base_uri
+        base_uri = base_uri if base_uri[-1] != "/" else base_uri[:-1]
+        return base_uri + "/" + self.build_path(path_params)
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def compile(path: str) -> "ApiRoute":
+        """Returns the route for the given path template, parsing every template only once."""
+        return ApiRoute(path)
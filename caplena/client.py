@@ -1,16 +1,20 @@
-from typing import Type, Union
+from typing import Optional, Type, Union
 
 from caplena.api import ApiBaseUri, ApiVersion
 from caplena.configuration import Configuration
 from caplena.controllers import ProjectsController
+from caplena.http.http_cache import HttpCache
 from caplena.http.http_client import HttpClient, HttpRetry
+from caplena.http.json_codec import JsonCodec
 from caplena.http.requests_http_client import RequestsHttpClient
 from caplena.logging.logger import LoggingLevel
+from caplena.object_cache import ObjectCache
 
 
 class Client:
     """Represents a client connection that connects to Caplena. This class is used
-    to interact with the Caplena REST API.
+    to interact with the Caplena REST API. Clients are thread-safe, a single client can be shared
+    by all threads of a worker pool.
 
     :param api_key: The API key to use for making requests.
     :param api_base_uri: The API Base URI to use, defaults to :code:`https://api.caplena.com/v2`.
@@ -26,9 +30,24 @@ class Client:
     :type retry_methods: Iterable[HttpMethod]
     :param http_client: The HTTP client class or instance to use for making requests, defaults to :code:`RequestsHttpClient`.
         If an HTTP class is given, the factory method :code:`build_http_client` is used to create an instance.
+        If an instance is given, the client uses a configured copy of it, the instance itself is not modified.
     :type http_client: Union[HttpClient, Type[HttpClient]]
     :param logging_level: The level of events to log out to console, defaults to :code:`WARNING`.
     :type logging_level: LoggingLevel
+    :param http_cache: The cache used to store responses of GET requests, defaults to :code:`None`.
+        Cached responses are revalidated with conditional requests, so that unchanged resources
+        are neither transferred nor decoded again.
+    :type http_cache: Optional[HttpCache]
+    :param object_cache: The cache used to keep recently retrieved and written resources, defaults to
+        :code:`None`. Retrieving a cached resource does not send any request.
+    :type object_cache: Optional[ObjectCache]
+    :param coalesce_requests: Whether identical GET requests that are sent concurrently, e.g. by multiple threads,
+        should be coalesced into a single request, defaults to :code:`False`. All callers receive the same response.
+    :param json_codec: The codec used to encode request bodies and decode response bodies, defaults to
+        :code:`None`, meaning that orjson or msgspec are used if installed, and the standard library otherwise.
+    :type json_codec: Optional[JsonCodec]
+    :param typed_decoding: Whether projects and rows should be decoded straight into objects using typed
+        schemas, defaults to :code:`False`. This is considerably faster, but requires msgspec, see :code:`caplena[typed]`.
     """
 
     @property
@@ -51,6 +70,11 @@ class Client:
         backoff_factor: float = HttpRetry.DEFAULT_BACKOFF_FACTOR,
         http_client: Union[Type[HttpClient], HttpClient] = RequestsHttpClient,
         logging_level: LoggingLevel = LoggingLevel.WARNING,
+        http_cache: Optional[HttpCache] = None,
+        object_cache: Optional[ObjectCache] = None,
+        coalesce_requests: bool = False,
+        json_codec: Optional[JsonCodec] = None,
+        typed_decoding: bool = False,
     ):
         self._config = Configuration(
             api_key=api_key,
@@ -61,6 +85,11 @@ class Client:
             max_retries=max_retries,
             backoff_factor=backoff_factor,
             logging_level=logging_level,
+            http_cache=http_cache,
+            object_cache=object_cache,
+            coalesce_requests=coalesce_requests,
+            json_codec=json_codec,
+            typed_decoding=typed_decoding,
         )
 
         self._projects_controller = ProjectsController(config=self._config)
@@ -0,0 +1,79 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional, Sequence, TypeVar, Union
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class RateLimiter:
+    """Limits the rate at which calls are started, shared by all threads using it. Calls are spaced
+    evenly, allowing short bursts of up to :code:`burst` calls after idle periods.
+
+    :param rate: The maximum number of calls per second.
+    :param burst: The maximum number of calls that may be started at once, defaults to :code:`1`.
+    """
+
+    def __init__(self, rate: float, *, burst: int = 1):
+        if rate <= 0:
+            raise ValueError(f"rate must be a positive number, got {rate}.")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until another call may be started."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated_at) * self.rate)
+            self._updated_at = now
+            self._tokens -= 1
+            # note: the token is reserved before sleeping, such that waiting threads are
+            # queued in order instead of competing for the next token.
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if delay > 0:
+            time.sleep(delay)
+
+
+def map_concurrently(
+    fn: Callable[[T], R],
+    items: Sequence[T],
+    *,
+    max_workers: int,
+    rate_limiter: Optional[RateLimiter] = None,
+    on_progress: Optional[Callable[[int, int], None]] = None,
+) -> List[Union[R, Exception]]:
+    """Calls :code:`fn` for every item using at most :code:`max_workers` threads. Results are
+    returned in the order of the given items. If a call raises an exception, the exception is
+    returned in place of its result, such that a single failure does not discard all other results.
+    After every call, :code:`on_progress` is called with the number of completed and total calls.
+    """
+    if max_workers < 1:
+        raise ValueError(f"max_workers must be a positive integer, got {max_workers}.")
+
+    lock = threading.Lock()
+    completed = 0
+
+    def call(item: T) -> Union[R, Exception]:
+        nonlocal completed
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            return fn(item)
+        except Exception as exc:
+            return exc
+        finally:
+            if on_progress is not None:
+                with lock:
+                    completed += 1
+                    on_progress(completed, len(items))
+
+    if len(items) <= 1 or max_workers == 1:
+        return [call(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(call, items))
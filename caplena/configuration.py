@@ -1,9 +1,14 @@
-from typing import Type, Union
+import importlib.util
+from typing import Optional, Type, Union
 
 from caplena.api import ApiBaseUri, ApiRequestor, ApiVersion
+from caplena.http.http_cache import HttpCache
 from caplena.http.http_client import HttpClient, HttpRetry
+from caplena.http.json_codec import JsonCodec
+from caplena.http.single_flight import SingleFlight
 from caplena.logging.default_logger import DefaultLogger
 from caplena.logging.logger import Logger, LoggingLevel
+from caplena.object_cache import ObjectCache
 
 
 class Configuration:
@@ -47,6 +52,26 @@ class Configuration:
     def logger(self) -> Logger:
         return self._logger
 
+    @property
+    def http_cache(self) -> Optional[HttpCache]:
+        return self._http_cache
+
+    @property
+    def object_cache(self) -> Optional[ObjectCache]:
+        return self._object_cache
+
+    @property
+    def coalesce_requests(self) -> bool:
+        return self._coalesce_requests
+
+    @property
+    def json_codec(self) -> JsonCodec:
+        return self._http_client.json_codec
+
+    @property
+    def typed_decoding(self) -> bool:
+        return self._typed_decoding
+
     def __init__(
         self,
         *,
@@ -58,7 +83,17 @@ class Configuration:
         max_retries: int = HttpRetry.DEFAULT_MAX_RETRIES,
         backoff_factor: float = HttpRetry.DEFAULT_BACKOFF_FACTOR,
         logging_level: LoggingLevel = LoggingLevel.WARNING,
+        http_cache: Optional[HttpCache] = None,
+        object_cache: Optional[ObjectCache] = None,
+        coalesce_requests: bool = False,
+        json_codec: Optional[JsonCodec] = None,
+        typed_decoding: bool = False,
     ):
+        if typed_decoding and importlib.util.find_spec("msgspec") is None:
+            raise ValueError(
+                "Typed decoding requires msgspec. HINT: Please install msgspec using `pip install caplena[typed]`."
+            )
+
         self._api_key = api_key
         self._api_base_uri = api_base_uri
         self._api_version = api_version
@@ -66,6 +101,10 @@ class Configuration:
         self._max_retries = max_retries
         self._backoff_factor = backoff_factor
         self._logging_level = logging_level
+        self._http_cache = http_cache
+        self._object_cache = object_cache
+        self._coalesce_requests = coalesce_requests
+        self._typed_decoding = typed_decoding
 
         self._logger = DefaultLogger("caplena", self._logging_level)
         self._http_client = self.build_http_client(
@@ -74,6 +113,9 @@ class Configuration:
             timeout=timeout,
             max_retries=max_retries,
             backoff_factor=backoff_factor,
+            cache=http_cache,
+            coalesce_requests=coalesce_requests,
+            json_codec=json_codec,
         )
         self._api_requestor = ApiRequestor(
             http_client=self._http_client,
@@ -88,14 +130,23 @@ class Configuration:
         timeout: int = HttpClient.DEFAULT_TIMEOUT,
         max_retries: int = HttpRetry.DEFAULT_MAX_RETRIES,
         backoff_factor: float = HttpRetry.DEFAULT_BACKOFF_FACTOR,
+        cache: Optional[HttpCache] = None,
+        coalesce_requests: bool = False,
+        json_codec: Optional[JsonCodec] = None,
     ) -> HttpClient:
         # check if we get http client instance or if we should instantiate it ourselves
         if not isinstance(http_client, HttpClient):
             http_client = http_client()
 
-        http_client.logger = logger
-        http_client.timeout = timeout
-        http_client.retry.max_retries = max_retries
-        http_client.retry.backoff_factor = backoff_factor
-
-        return http_client
+        # note: the given client might be shared with other configurations, so it is never
+        # modified. instead, every configuration uses its own copy of the client.
+        return http_client.with_options(
+            timeout=timeout,
+            retry=HttpRetry(max_retries=max_retries, backoff_factor=backoff_factor),
+            logger=logger,
+            cache=cache,
+            single_flight=(
+                SingleFlight() if coalesce_requests and http_client.single_flight is None else None
+            ),
+            json_codec=json_codec,
+        )
@@ -19,3 +19,9 @@ NOT_SET: Any = _NOT_SET()
 
 # Pagination limits
 LIST_PAGINATION_LIMIT = 30
+
+# Maximum length of the query string of filters, longer filters are split into multiple requests
+MAX_FILTER_QUERY_LENGTH = 4096
+
+# Maximum number of requests sent concurrently by bulk operations
+DEFAULT_MAX_WORKERS = 8
@@ -0,0 +1,111 @@
+import sys
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import ClassVar, Iterable, List, Optional
+
+# note: before python 3.11, fromisoformat does not accept the `Z` suffix
+_PARSES_UTC_SUFFIX = sys.version_info >= (3, 11)
+
+
+class DatetimeCodec:
+    """Parses and formats RFC3339 datetimes as sent and expected by the API. As responses
+    typically repeat the same timestamps many times, parsed datetimes are remembered by their
+    string, such that repeated values are only parsed once.
+
+    :param maxsize: The maximum number of parsed strings to remember, defaults to :code:`4096`.
+        Once full, the least recently used strings are forgotten. A value of :code:`0` disables
+        remembering.
+    """
+
+    DEFAULT_MAXSIZE: ClassVar[int] = 4096
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    @property
+    def size(self) -> int:
+        """The number of parsed strings currently remembered."""
+        return len(self._memo)
+
+    def __init__(self, *, maxsize: int = DEFAULT_MAXSIZE):
+        if maxsize < 0:
+            raise ValueError(
+                f"Invalid maxsize of {maxsize}. HINT: Please specify a non-negative number."
+            )
+
+        self._maxsize = maxsize
+        # note: datetimes are immutable, so the same instance can be returned for equal strings
+        self._memo: "OrderedDict[str, datetime]" = OrderedDict()
+
+    def parse(self, value: str) -> datetime:
+        """Parses the given RFC3339 string, e.g. :code:`2022-03-14T08:18:38.910Z`.
+
+        :param value: The string to parse.
+        """
+        memo = self._memo
+        dt = memo.get(value)
+        if dt is not None:
+            memo.move_to_end(value)
+            return dt
+
+        if _PARSES_UTC_SUFFIX and len(value) == 24 and value[23] == "Z":
+            # note: fast path for the format sent by the API, e.g. 2022-03-14T08:18:38.910Z.
+            # fromisoformat is implemented in C and outperforms parsing fixed-offset slices.
+            dt = datetime.fromisoformat(value)
+        else:
+            dt = datetime.fromisoformat(value.replace("Z", "+00:00"))
+        if self._maxsize:
+            memo[value] = dt
+            if len(memo) > self._maxsize:
+                memo.popitem(last=False)
+        return dt
+
+    def parse_many(self, values: Iterable[Optional[str]]) -> List[Optional[datetime]]:
+        """Parses the given RFC3339 strings, keeping missing values as :code:`None`.
+
+        :param values: The strings to parse.
+        """
+        parse = self.parse
+        return [None if value is None else parse(value) for value in values]
+
+    def format(self, dt: datetime) -> str:
+        """Formats the given datetime as RFC3339 string with millisecond precision. Timezone-aware
+        datetimes in UTC use the :code:`Z` suffix, naive datetimes have no offset.
+
+        :param dt: The datetime to format.
+        """
+        if dt.tzinfo is timezone.utc:
+            # note: fast path for the most common case, about a third faster than isoformat
+            return "%04d-%02d-%02dT%02d:%02d:%02d.%03dZ" % (
+                dt.year,
+                dt.month,
+                dt.day,
+                dt.hour,
+                dt.minute,
+                dt.second,
+                dt.microsecond // 1000,
+            )
+        rfc3339 = dt.isoformat(timespec="milliseconds")
+        offset = dt.utcoffset()
+        if offset is not None and not offset:
+            rfc3339 = rfc3339[:-6] + "Z"
+        return rfc3339
+
+    def format_many(self, dts: Iterable[Optional[datetime]]) -> List[Optional[str]]:
+        """Formats the given datetimes, keeping missing values as :code:`None`.
+
+        :param dts: The datetimes to format.
+        """
+        format = self.format
+        return [None if dt is None else format(dt) for dt in dts]
+
+    def clear(self) -> None:
+        """Forgets all remembered strings."""
+        self._memo.clear()
+
+    def __str__(self) -> str:
+        return f"DatetimeCodec(size={self.size}, maxsize={self._maxsize})"
+
+
+DEFAULT_DATETIME_CODEC = DatetimeCodec()
@@ -1,11 +1,17 @@
+import heapq
+import threading
+from contextlib import contextmanager
 from copy import deepcopy
+from itertools import islice
 from typing import (
+    TYPE_CHECKING,
     Any,
     Callable,
     ClassVar,
     Dict,
     Generic,
     Iterable,
+    Iterator,
     List,
     Optional,
     Set,
@@ -17,15 +23,25 @@ from typing import (
 
 from caplena.api import ApiFilter, ApiOrdering
 from caplena.api.api_requestor import ApiRequestor
+from caplena.api.api_route import ApiRoute
+from caplena.concurrency import map_concurrently
 from caplena.configuration import Configuration
-from caplena.constants import NOT_SET
+from caplena.constants import DEFAULT_MAX_WORKERS, LIST_PAGINATION_LIMIT, NOT_SET
 from caplena.helpers import Helpers
 from caplena.http.http_response import HttpResponse
 from caplena.iterator import CaplenaIterator
+from caplena.lazy import LazyValue
 from caplena.list import CaplenaList
+from caplena.object_cache import CacheKey, ObjectCache
+from caplena.unit_of_work import UnitOfWork
+
+if TYPE_CHECKING:
+    from caplena.endpoints.typed_decoder import TypedDecoder
 
 BO = TypeVar("BO", bound="BaseObject[Any]")
 BC = TypeVar("BC", bound="BaseController")
+BR = TypeVar("BR", bound="BaseResource[Any]")
+F = TypeVar("F", bound=ApiFilter)
 T = TypeVar("T")
 
 
@@ -42,15 +58,63 @@ class BaseController:
     def api(self) -> ApiRequestor:
         return self._config.api_requestor
 
+    @property
+    def object_cache(self) -> Optional[ObjectCache]:
+        return self._config.object_cache
+
     def __init__(self, *, config: Configuration):
         self._config = config
+        self._local = threading.local()
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "BaseController":
+        # note: controllers are shared by all objects, copying an object must not copy its
+        # controller, nor the http client and caches it holds on to.
+        return self
+
+    @contextmanager
+    def unit_of_work(
+        self, *, max_workers: int = DEFAULT_MAX_WORKERS, rate_limit: Optional[float] = None
+    ) -> Iterator[UnitOfWork]:
+        """Returns a context manager tracking all objects retrieved by this controller within it.
+        When exiting the context, all modified objects are saved concurrently. Objects that were not
+        modified are skipped, and objects that could not be saved are reported in :code:`errors`.
+        If an exception is raised within the context, no objects are saved.
+
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :param rate_limit: The maximum number of requests per second, defaults to :code:`None`,
+            meaning that requests are not rate limited.
+        """
+        uow = UnitOfWork(max_workers=max_workers, rate_limit=rate_limit, logger=self._config.logger)
+        # note: units of work are tracked per thread, such that other threads sharing this
+        # controller do not have their objects tracked.
+        units_of_work = self._units_of_work
+        units_of_work.append(uow)
+        try:
+            yield uow
+        finally:
+            units_of_work.remove(uow)
+        uow.commit()
+
+    @property
+    def _units_of_work(self) -> List[UnitOfWork]:
+        units_of_work: Optional[List[UnitOfWork]] = getattr(self._local, "units_of_work", None)
+        if units_of_work is None:
+            units_of_work = self._local.units_of_work = []
+        return units_of_work
+
+    def track(self, obj: T) -> T:
+        """Adds the given object to the innermost active unit of work, if any."""
+        units_of_work = self._units_of_work
+        if units_of_work and isinstance(obj, BaseResource) and hasattr(obj, "save"):
+            units_of_work[-1].add(obj)
+        return obj
 
     def build(self, resource: Type[BO], obj: Dict[str, Any]) -> BO:
         return resource.build_obj(obj=obj, controller=self, obj_exists=False)
 
     def get(
         self,
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         allowed_codes: Iterable[int] = DEFAULT_ALLOWED_CODES,
         path_params: Optional[Dict[str, str]] = None,
@@ -76,7 +140,7 @@ class BaseController:
 
     def post(
         self,
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         allowed_codes: Iterable[int] = DEFAULT_ALLOWED_POST_CODES,
         path_params: Optional[Dict[str, str]] = None,
@@ -100,7 +164,7 @@ class BaseController:
 
     def put(
         self,
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         allowed_codes: Iterable[int] = DEFAULT_ALLOWED_CODES,
         path_params: Optional[Dict[str, str]] = None,
@@ -124,7 +188,7 @@ class BaseController:
 
     def patch(
         self,
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         allowed_codes: Iterable[int] = DEFAULT_ALLOWED_CODES,
         path_params: Optional[Dict[str, str]] = None,
@@ -148,7 +212,7 @@ class BaseController:
 
     def delete(
         self,
-        path: str,
+        path: Union[str, ApiRoute],
         *,
         allowed_codes: Iterable[int] = DEFAULT_ALLOWED_DELETE_CODES,
         path_params: Optional[Dict[str, str]] = None,
@@ -174,20 +238,81 @@ class BaseController:
         *,
         resource: Type[BO],
         metadata: Optional[Dict[str, Any]] = None,
+        cache_key: Optional[CacheKey] = None,
+        typed_decoder: Optional["TypedDecoder[BO]"] = None,
     ) -> BO:
+        # note: the object cache stores decoded dictionaries, so the typed decoder is only used
+        # if the response does not need to be cached.
+        if typed_decoder is not None and (cache_key is None or self.object_cache is None):
+            content = self._retrieve_content_or_raise(response)
+            return self.track(typed_decoder.decode(content, controller=self, metadata=metadata))
+
         json = self._retrieve_json_or_raise(response)
-        return resource.build_obj(obj=json, controller=self, obj_exists=True, metadata=metadata)
+        if cache_key is not None:
+            self.store_cached(cache_key, response)
+        return self.track(
+            resource.build_obj(obj=json, controller=self, obj_exists=True, metadata=metadata)
+        )
+
+    def build_cached_response(
+        self,
+        cache_key: CacheKey,
+        *,
+        fetcher: Callable[[], HttpResponse],
+        resource: Type[BO],
+        metadata: Optional[Dict[str, Any]] = None,
+        typed_decoder: Optional["TypedDecoder[BO]"] = None,
+    ) -> BO:
+        json = self.object_cache.get(cache_key) if self.object_cache is not None else None
+        if json is None:
+            return self.build_response(
+                fetcher(),
+                resource=resource,
+                metadata=metadata,
+                cache_key=cache_key,
+                typed_decoder=typed_decoder,
+            )
+        return self.track(
+            resource.build_obj(obj=json, controller=self, obj_exists=True, metadata=metadata)
+        )
+
+    def store_cached(self, cache_key: CacheKey, response: HttpResponse) -> None:
+        if self.object_cache is not None:
+            self.object_cache.set(cache_key, self._retrieve_json_or_raise(response))
+
+    def evict_cached(self, cache_key: CacheKey, *, prefix: bool = False) -> None:
+        if self.object_cache is None:
+            return
+        elif prefix:
+            self.object_cache.evict_prefix(cache_key)
+        else:
+            self.object_cache.evict(cache_key)
 
     def build_iterator(
         self,
         *,
-        fetcher: Callable[[int], HttpResponse],
+        fetcher: Callable[[int, int], HttpResponse],
         resource: Type[BO],
         limit: Optional[int] = None,
         metadata: Optional[Dict[str, Any]] = None,
+        typed_decoder: Optional["TypedDecoder[BO]"] = None,
+        count: Optional[Callable[[], int]] = None,
     ) -> CaplenaIterator[BO]:
+        """Builds an iterator of the given resource. The fetcher is called with the number and size
+        of the page to request, pages are only as large as the limit requires. If given,
+        :code:`count` determines the total count without fetching the first page.
+        """
+        page_size = CaplenaIterator.page_size_for(limit)
+
         def results_fetcher(page: int) -> Tuple[List[BO], bool, int]:
-            response = fetcher(page)
+            response = fetcher(page, page_size)
+            if typed_decoder is not None:
+                content = self._retrieve_content_or_raise(response)
+                results, has_next, count = typed_decoder.decode_page(
+                    content, controller=self, metadata=metadata
+                )
+                return results, has_next, count
+
             json = self._retrieve_json_or_raise(response)
 
             results = [
@@ -196,11 +321,108 @@ class BaseController:
             ]
             return results, json["next_url"] is not None, json["count"]
 
+        # note: results are tracked by the iterator, as pages might be fetched by worker threads,
+        # which do not see the units of work of the consuming thread.
         return CaplenaIterator(
             results_fetcher=results_fetcher,
             limit=limit,
+            page_size=page_size,
+            track=self.track,
+            counter=count,
         )
 
+    def build_sharded_iterator(
+        self,
+        *,
+        filter: Optional[F],
+        build_iterator: Callable[[Optional[F], Optional[Callable[[], int]]], CaplenaIterator[BR]],
+        count: Callable[[], int],
+        order_by: ApiOrdering,
+        limit: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> CaplenaIterator[BR]:
+        """Builds an iterator for the given filter. Filters exceeding the maximum query length are split
+        into multiple shards, whose first pages are fetched concurrently. The shards are then merged
+        lazily in the given order, and objects matching multiple shards are only returned once.
+        The total count is always determined by :code:`count`, which is passed to
+        :code:`build_iterator` for filters that are not split, and is only called once the first
+        page is requested or the count is accessed otherwise.
+        """
+        shards: List[Optional[F]] = (
+            list(self.api.split_filter(filter)) if filter is not None else [filter]
+        )
+        if len(shards) == 1:
+            return build_iterator(shards[0], count)
+
+        lock = threading.Lock()
+        sort_key = order_by.to_sort_key()
+        merged: Optional[Iterator[BR]] = None
+        # note: only the merged objects from the start of the last requested page onwards are kept,
+        # offset being the position of the first kept object within the merged shards
+        results: List[BR] = []
+        offset = 0
+        total_count: Optional[int] = None
+
+        def merge() -> Iterator[BR]:
+            iterators = [build_iterator(shard, None) for shard in shards]
+            # note: the first pages are fetched concurrently, iterating a shard reuses its first page
+            for first_page in map_concurrently(
+                lambda iterator: iterator.count, iterators, max_workers=max_workers
+            ):
+                if isinstance(first_page, Exception):
+                    raise first_page
+
+            # note: every shard is returned in the requested order, so a k-way merge suffices. an
+            # object matching multiple shards has the same sort key in all of them, so only the
+            # identifiers of objects sharing the current sort key need to be remembered. the shards
+            # are wrapped in generators, as heapq.merge iterates the last remaining shard again,
+            # which would restart a CaplenaIterator at the beginning of its current page.
+            seen: Set[str] = set()
+            current_key: Any = None
+            shard_objs = [(obj for obj in iterator) for iterator in iterators]
+            for obj in heapq.merge(*shard_objs, key=sort_key):
+                key = sort_key(obj)
+                if key != current_key:
+                    seen.clear()
+                    current_key = key
+                if obj.id not in seen:
+                    seen.add(obj.id)
+                    yield obj
+
+        def results_fetcher(page: int) -> Tuple[List[BR], bool, int]:
+            nonlocal merged, offset, total_count
+            start, end = (page - 1) * LIST_PAGINATION_LIMIT, page * LIST_PAGINATION_LIMIT
+            with lock:
+                if total_count is None:
+                    total_count = count()
+                if merged is None or start < offset:
+                    # note: pages before the kept objects are merged again from the start
+                    merged = merge()
+                    results.clear()
+                    offset = 0
+
+                # note: objects before the requested page are released, or skipped if not merged yet
+                dropped = min(start - offset, len(results))
+                del results[:dropped]
+                offset += dropped
+                offset += sum(1 for _ in islice(merged, start - offset))
+
+                # note: one more object than the page holds is merged to know whether there is a next page
+                results.extend(islice(merged, max(end + 1 - offset - len(results), 0)))
+                page_results = results[start - offset : end - offset]
+                return page_results, offset + len(results) > end, total_count
+
+        return CaplenaIterator(
+            results_fetcher=results_fetcher, limit=limit, track=self.track, counter=count
+        )
+
+    def _retrieve_content_or_raise(self, response: HttpResponse) -> bytes:
+        content = response.content
+        if not content:
+            raise self.api.build_exc(response)
+        else:
+            return content
+
     def _retrieve_json_or_raise(self, response: HttpResponse) -> Dict[str, Any]:
         json = response.json
         if json is None:
@@ -217,6 +439,7 @@ class BaseObject(Generic[BC]):
     _previous: Dict[str, Any]
     _metadata: Dict[str, Any]
     _controller: Optional[BC]
+    _obj_exists: bool
 
     @property
     def controller(self) -> BC:
@@ -234,6 +457,7 @@ class BaseObject(Generic[BC]):
 
     def __init__(self, **attrs: Any):
         self._controller = None
+        self._obj_exists = False
         self._metadata = {}
         self._previous = {}
         self._attrs = Helpers.partial_dict(attrs, self.__fields__)
@@ -247,7 +471,7 @@ class BaseObject(Generic[BC]):
 
         resource: Dict[str, Any] = {}
         for field in self.__fields__:
-            attr = self._attrs[field]
+            attr = self._attr(field)
             resource[field] = self._rec_dict(attr)
 
         return resource
@@ -257,11 +481,14 @@ class BaseObject(Generic[BC]):
         for field in self.__fields__:
             if field not in self._previous:
                 resource[field] = self._rec_modified_dict(
-                    previous=NOT_SET, next=self._attrs[field], field=field
+                    previous=NOT_SET, next=self._attr(field), field=field
                 )
             elif self._previous[field] != self._attrs[field]:
+                previous = self._previous[field]
+                if isinstance(previous, LazyValue):
+                    previous = self._previous[field] = previous.parse()
                 resource[field] = self._rec_modified_dict(
-                    previous=self._previous[field], next=self._attrs[field], field=field
+                    previous=previous, next=self._attr(field), field=field
                 )
 
         return resource if resource != {} else NOT_SET
@@ -269,6 +496,7 @@ class BaseObject(Generic[BC]):
     def _refresh_from(self, *, attrs: Dict[str, Any]) -> None:
         self._attrs = Helpers.partial_dict(attrs, self.__fields__)
         self._previous = deepcopy(self._attrs)
+        self._obj_exists = True
 
     def _prepare(
         self,
@@ -277,12 +505,37 @@ class BaseObject(Generic[BC]):
         obj_exists: bool = False,
     ) -> None:
         self._controller = controller
+        self._obj_exists = obj_exists
         if obj_exists:
+            # note: lazy values are shared with the previous version, as they are immutable
             self._previous = deepcopy(self._attrs)
+        else:
+            # note: objects built as existing ones, such as parsed row columns, have no previous
+            # version once they are part of a new object
+            self._previous = {}
 
         for field in self.__fields__:
             self._rec_prepare(self._attrs[field], controller=controller, obj_exists=obj_exists)
 
+    def _attr(self, name: str) -> Any:
+        """Returns the value of the given field, parsing it first if it is still lazy."""
+        value = self._attrs[name]
+        if isinstance(value, LazyValue):
+            value = self._materialize(name, value)
+        return value
+
+    def _materialize(self, name: str, lazy: "LazyValue[Any]") -> Any:
+        value = lazy.parse()
+        self._rec_prepare(value, controller=self._controller, obj_exists=self._obj_exists)
+        self._attrs[name] = value
+
+        # note: the previous version is parsed separately, such that it is not affected by
+        # modifications of the parsed value.
+        previous = self._previous.get(name)
+        if isinstance(previous, LazyValue):
+            self._previous[name] = previous.parse()
+        return value
+
     def _rec_dict(self, attr: Any) -> Any:
         if isinstance(attr, BaseObject):
             return attr.dict()
@@ -335,7 +588,7 @@ class BaseObject(Generic[BC]):
 
     def __getattr__(self, name: str) -> Any:
         if name in self.__fields__:
-            return self._attrs[name]
+            return self._attr(name)
         else:
             return super().__getattribute__(name)
 
@@ -350,7 +603,11 @@ class BaseObject(Generic[BC]):
             return False
 
         for field in self.__fields__:
-            if self._attrs[field] != other._attrs[field]:
+            attr, other_attr = self._attrs[field], other._attrs[field]
+            # note: lazy values are only parsed if they cannot be compared to each other
+            if isinstance(attr, LazyValue) != isinstance(other_attr, LazyValue):
+                attr, other_attr = self._attr(field), other._attr(field)
+            if attr != other_attr:
                 return False
 
         return True
@@ -370,10 +627,46 @@ class BaseObject(Generic[BC]):
 
         return instance
 
+    @classmethod
+    def build_prepared(
+        cls: Type[BO],
+        attrs: Dict[str, Any],
+        *,
+        previous: Dict[str, Any],
+        controller: Optional[BC],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> BO:
+        """Builds an existing object from already parsed attributes, skipping :code:`parse_obj` and
+        :code:`_prepare`. The previous attributes must not share any mutable values with :code:`attrs`.
+        """
+        instance = cls.__new__(cls)
+        # note: writing to __dict__ directly bypasses the field checks of `__setattr__`
+        instance.__dict__.update(
+            _controller=controller,
+            _metadata=metadata if metadata is not None else {},
+            _attrs=attrs,
+            _previous=previous,
+            _obj_exists=True,
+        )
+        return instance
+
     @classmethod
     def parse_obj(cls: Type[BO], obj: Dict[str, Any]) -> BO:
         return cls(**obj)
 
+    @classmethod
+    def to_columnar(cls: Type[BO], objects: Iterable[BO]) -> Dict[str, List[Any]]:
+        """Converts the given objects into a columnar batch, mapping every field name
+        to the list of its values.
+
+        :param objects: The objects to convert.
+        """
+        columnar: Dict[str, List[Any]] = {field: [] for field in sorted(cls.__fields__)}
+        for obj in objects:
+            for field, values in columnar.items():
+                values.append(obj._attr(field))
+        return columnar
+
 
 class BaseResource(BaseObject[BC]):
     @property
@@ -391,3 +684,10 @@ class BaseResource(BaseObject[BC]):
         resource = super().dict()
         resource["id"] = self._id
         return resource
+
+    @classmethod
+    def to_columnar(cls: Type[BO], objects: Iterable[BO]) -> Dict[str, List[Any]]:
+        objects = list(objects)
+        columnar: Dict[str, List[Any]] = {"id": [obj.id for obj in objects]}
+        columnar.update(super().to_columnar(objects))
+        return columnar
@@ -1,21 +1,58 @@
+import operator
+import threading
 import uuid
+from copy import deepcopy
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Protocol, Union
-
+from functools import partial
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Protocol,
+    Sequence,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
+
+from cachetools import LRUCache, TTLCache
 from cachetools.func import ttl_cache
 from typing_extensions import Literal
 
-from caplena.api import ApiOrdering
-from caplena.constants import LIST_PAGINATION_LIMIT, NOT_SET
-from caplena.endpoints.base_endpoint import BaseController, BaseObject, BaseResource
+from caplena.api import ApiFilter, ApiOrdering
+from caplena.api.api_route import ApiRoute
+from caplena.concurrency import RateLimiter, map_concurrently
+from caplena.configuration import Configuration
+from caplena.constants import DEFAULT_MAX_WORKERS, LIST_PAGINATION_LIMIT, NOT_SET
+from caplena.datetime_codec import DEFAULT_DATETIME_CODEC
+from caplena.endpoints.base_endpoint import BO, BaseController, BaseObject, BaseResource
 from caplena.filters.projects_filter import ProjectsFilter, RowsFilter
+from caplena.flyweight import FlyweightTable
 from caplena.helpers import Helpers
 from caplena.http.http_response import HttpResponse
 from caplena.iterator import CaplenaIterator
+from caplena.lazy import LazyValue
 from caplena.list import CaplenaList
+from caplena.object_cache import CacheKey
+
+if TYPE_CHECKING:
+    from caplena.endpoints.row_export import RowExport
+    from caplena.endpoints.row_parser import RowLayout, RowParser
+    from caplena.endpoints.typed_decoder import TypedDecoder
 
 # --- Controller --- #
 TTL_STATUS_CACHE_EXPIRE = 10
+TTL_COUNT_CACHE_EXPIRE = 10
+
+# note: counts are cached by project identifier, or None for projects, and filter query
+CountKey = Tuple[Optional[str], Tuple[Tuple[str, str], ...]]
 
 
 class ProjectsController(BaseController):
@@ -24,6 +61,93 @@ class ProjectsController(BaseController):
     :param config: The configuration object that a particular controller should use.
     """
 
+    PROJECTS_ROUTE: ClassVar[ApiRoute] = ApiRoute("/projects")
+    PROJECT_ROUTE: ClassVar[ApiRoute] = ApiRoute("/projects/{id}")
+    ROWS_ROUTE: ClassVar[ApiRoute] = ApiRoute("/projects/{id}/rows")
+    ROW_ROUTE: ClassVar[ApiRoute] = ApiRoute("/projects/{p_id}/rows/{r_id}")
+    ROWS_BULK_ROUTE: ClassVar[ApiRoute] = ApiRoute("/projects/{id}/rows/bulk")
+    ROWS_BULK_TASK_ROUTE: ClassVar[ApiRoute] = ApiRoute("/projects/{id}/rows/bulk/{task_id}")
+    ROW_PARSERS_MAXSIZE: ClassVar[int] = 64
+    FLYWEIGHTS_MAXSIZE: ClassVar[int] = 64
+    COUNTS_MAXSIZE: ClassVar[int] = 1024
+
+    def __init__(self, *, config: Configuration):
+        super().__init__(config=config)
+        self._row_parsers: "LRUCache[Tuple[str, RowLayout], RowParser]" = LRUCache(
+            maxsize=self.ROW_PARSERS_MAXSIZE
+        )
+        self._row_parsers_lock = threading.Lock()
+        self._flyweight_tables: "LRUCache[str, FlyweightTable]" = LRUCache(
+            maxsize=self.FLYWEIGHTS_MAXSIZE
+        )
+        self._flyweight_tables_lock = threading.Lock()
+        self._counts: "TTLCache[CountKey, int]" = TTLCache(
+            maxsize=self.COUNTS_MAXSIZE, ttl=TTL_COUNT_CACHE_EXPIRE
+        )
+        self._counts_lock = threading.Lock()
+
+    @staticmethod
+    def _project_key(id: str) -> CacheKey:
+        return ("projects", id)
+
+    @staticmethod
+    def _row_key(p_id: str, r_id: str) -> CacheKey:
+        return ("projects", p_id, "rows", r_id)
+
+    def _typed_decoder(self, resource: Type[BO]) -> Optional["TypedDecoder[BO]"]:
+        if not self.config.typed_decoding:
+            return None
+        # note: imported lazily, as the schemas require msgspec and refer to the resources below
+        from caplena.endpoints.projects_schema import TYPED_DECODERS
+
+        return TYPED_DECODERS.get(resource)
+
+    def _flyweights(self, p_id: str) -> FlyweightTable:
+        """Returns the flyweight table shared by all rows of the given project retrieved by this
+        controller, such that rows of different clients never share any values.
+        """
+        with self._flyweight_tables_lock:
+            table = self._flyweight_tables.get(p_id)
+            if table is None:
+                table = self._flyweight_tables[p_id] = FlyweightTable(p_id)
+            return table
+
+    def _row_parser(self, p_id: str, columns: List[Dict[str, Any]]) -> "RowParser":
+        """Returns the parser compiled for rows of the given project with the layout of the given
+        columns. Parsers are compiled once per layout, either from the project once it was retrieved
+        or from the first row with that layout, such that rows keep being parsed correctly after the
+        schema of the project changed.
+        """
+        # note: imported lazily, as the parser refers to the resources below
+        from caplena.endpoints.row_parser import RowParser
+
+        key = (p_id, RowParser.layout_of(columns))
+        with self._row_parsers_lock:
+            parser = self._row_parsers.get(key)
+        if parser is None:
+            parser = RowParser(project=p_id, layout=key[1], flyweights=self._flyweights(p_id))
+            with self._row_parsers_lock:
+                parser = self._row_parsers.setdefault(key, parser)
+        return parser
+
+    def _parse_row(
+        self, p_id: str, obj: Dict[str, Any], *, metadata: Optional[Dict[str, Any]] = None
+    ) -> "Row":
+        """Parses the given row using the parser compiled for its project and column layout."""
+        return self._row_parser(p_id, obj["columns"]).parse(obj, controller=self, metadata=metadata)
+
+    def _compile_row_parser(self, project: "ProjectDetail") -> None:
+        from caplena.endpoints.row_parser import RowParser
+
+        layout = tuple((column.ref, column.type) for column in project.columns)
+        with self._row_parsers_lock:
+            if (project.id, layout) in self._row_parsers:
+                return
+
+        parser = RowParser.from_project(project, flyweights=self._flyweights(project.id))
+        with self._row_parsers_lock:
+            self._row_parsers.setdefault((project.id, layout), parser)
+
     def create(
         self,
         *,
@@ -58,8 +182,13 @@ class ProjectsController(BaseController):
             anonymize_pii=anonymize_pii,
         )
 
-        response = self.post(path="/projects", json=json)
-        return self.build_response(response, resource=ProjectDetail)
+        response = self.post(path=self.PROJECTS_ROUTE, json=json)
+        project = self.build_response(
+            response, resource=ProjectDetail, typed_decoder=self._typed_decoder(ProjectDetail)
+        )
+        self.store_cached(self._project_key(project.id), response)
+        self._evict_counts(None)
+        return project
 
     def retrieve(self, *, id: str) -> "ProjectDetail":
         """Retrieves a project you have previously created.
@@ -67,8 +196,29 @@ class ProjectsController(BaseController):
         :param id: The project identifier.
         :raises caplena.api.ApiException: An API exception.
         """
-        response = self.get(path="/projects/{id}", path_params={"id": id})
-        return self.build_response(response, resource=ProjectDetail)
+        project = self.build_cached_response(
+            self._project_key(id),
+            fetcher=lambda: self.get(path=self.PROJECT_ROUTE, path_params={"id": id}),
+            resource=ProjectDetail,
+            typed_decoder=self._typed_decoder(ProjectDetail),
+        )
+        # note: rows of the project are parsed according to its latest schema
+        self._compile_row_parser(project)
+        return project
+
+    def retrieve_many(
+        self, *, ids: Sequence[str], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[Union["ProjectDetail", Exception]]:
+        """Retrieves multiple projects you have previously created, sending up to :code:`max_workers`
+        requests concurrently. The projects are returned in the order of the given identifiers. If a
+        project cannot be retrieved, its exception is returned in its place.
+
+        :param ids: The project identifiers.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        """
+        projects = map_concurrently(lambda id: self.retrieve(id=id), ids, max_workers=max_workers)
+        # note: the projects are retrieved by worker threads, which do not see this thread's unit of work
+        return [self.track(project) for project in projects]
 
     def remove(self, *, id: str) -> None:
         """Removes a previously created project.
@@ -76,7 +226,10 @@ class ProjectsController(BaseController):
         :param id: The project identifier.
         :raises caplena.api.ApiException: An API exception.
         """
-        self.delete(path="/projects/{id}", path_params={"id": id})
+        self.delete(path=self.PROJECT_ROUTE, path_params={"id": id})
+        self.evict_cached(self._project_key(id), prefix=True)
+        self._evict_counts(None)
+        self._evict_counts(id)
 
     def list(
         self,
@@ -95,18 +248,63 @@ class ProjectsController(BaseController):
         :raises caplena.api.ApiException: An API exception.
         """
 
-        def fetcher(page: int) -> HttpResponse:
-            return self.get(
-                path="/projects",
-                query_params={
-                    "page": str(page),
-                    "limit": str(LIST_PAGINATION_LIMIT),
-                },
-                filter=filter,
-                order_by=order_by,
+        def build_iterator(
+            filt: Optional[ProjectsFilter], count: Optional[Callable[[], int]]
+        ) -> "CaplenaIterator[ListedProject]":
+            def fetcher(page: int, page_size: int) -> HttpResponse:
+                return self.get(
+                    path=self.PROJECTS_ROUTE,
+                    query_params={
+                        "page": str(page),
+                        "limit": str(page_size),
+                    },
+                    filter=filt,
+                    order_by=order_by,
+                )
+
+            return self.build_iterator(
+                fetcher=fetcher,
+                limit=limit,
+                resource=ListedProject,
+                typed_decoder=self._typed_decoder(ListedProject),
+                count=count,
             )
 
-        return self.build_iterator(fetcher=fetcher, limit=limit, resource=ListedProject)
+        return self.build_sharded_iterator(
+            filter=filter,
+            build_iterator=build_iterator,
+            count=lambda: self.count_projects(filter=filter),
+            order_by=order_by,
+            limit=limit,
+        )
+
+    def count_projects(self, *, filter: Optional[ProjectsFilter] = None) -> int:
+        """Returns the number of projects you have previously created. Only the count is requested,
+        no projects are fetched, and counts are cached for a few seconds per filter. Filters exceeding
+        the maximum query length are split into shards, which may overlap. In that case, the identifiers
+        of all matching projects are listed instead, costing one request per page of every shard.
+
+        :param filter: Filters to apply to this request. If omitted, no filters are applied.
+        :raises caplena.api.ApiException: An API exception.
+        """
+        return self._count(None, filter=filter)
+
+    def count_projects_many(
+        self,
+        *,
+        filters: Sequence[Optional[ProjectsFilter]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[Union[int, Exception]]:
+        """Returns the number of projects matching each of the given filters, sending up to
+        :code:`max_workers` requests concurrently. The counts are returned in the order of the given
+        filters. If a count cannot be retrieved, its exception is returned in its place.
+
+        :param filters: The filters to count the projects of, :code:`None` counts all projects.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        """
+        return map_concurrently(
+            lambda filt: self.count_projects(filter=filt), filters, max_workers=max_workers
+        )
 
     def update(
         self,
@@ -130,8 +328,14 @@ class ProjectsController(BaseController):
             columns=columns,
         )
 
-        response = self.patch(path="/projects/{id}", path_params={"id": id}, json=json)
-        return self.build_response(response, resource=ProjectDetail)
+        response = self.patch(path=self.PROJECT_ROUTE, path_params={"id": id}, json=json)
+        self._evict_counts(None)
+        return self.build_response(
+            response,
+            resource=ProjectDetail,
+            cache_key=self._project_key(id),
+            typed_decoder=self._typed_decoder(ProjectDetail),
+        )
 
     def append_rows(
         self,
@@ -147,11 +351,13 @@ class ProjectsController(BaseController):
         :raises caplena.api.ApiException: An API exception.
         """
         response = self.post(
-            path="/projects/{id}/rows/bulk",
+            path=self.ROWS_BULK_ROUTE,
             path_params={"id": id},
             json=rows,
             allowed_codes={202},
         )
+        self.evict_cached(self._project_key(id))
+        self._evict_counts(id)
 
         return self.build_response(response, resource=RowsAppend)
 
@@ -170,19 +376,19 @@ class ProjectsController(BaseController):
         :raises caplena.api.ApiException: An API exception.
         :raises ValueError: when task_id is not proper UUID or uuid in a string
         """
-        params = {"project_id": project_id}
+        params = {"id": project_id}
         if task_id and not isinstance(task_id, uuid.UUID):
             try:
                 task_id = uuid.UUID(task_id)
             except (AttributeError, ValueError) as exc:
                 raise ValueError("task_id must be UUID or uuid in a string") from exc
-        url = "/projects/{project_id}/rows/bulk"
+        route = self.ROWS_BULK_ROUTE
         if task_id:
-            url = f"{url}/{task_id}"
+            route = self.ROWS_BULK_TASK_ROUTE
             params["task_id"] = str(task_id)
 
         response = self.get(
-            path=url,
+            path=route,
             path_params=params,
             allowed_codes={200},
         )
@@ -202,12 +408,22 @@ class ProjectsController(BaseController):
         """
         json = self.api.build_payload(columns=columns)
         response = self.post(
-            path="/projects/{id}/rows",
+            path=self.ROWS_ROUTE,
             path_params={"id": id},
             json=json,
         )
-
-        return self.build_response(response, resource=Row, metadata={"project": id})
+        # note: the project is evicted, as appending rows changes its row counts
+        self.evict_cached(self._project_key(id))
+        self._evict_counts(id)
+
+        row = self.build_response(
+            response,
+            resource=Row,
+            metadata={"project": id},
+            typed_decoder=self._typed_decoder(Row),
+        )
+        self.store_cached(self._row_key(id, row.id), response)
+        return row
 
     def list_rows(
         self,
@@ -225,19 +441,121 @@ class ProjectsController(BaseController):
         :raises caplena.api.ApiException: An API exception.
         """
 
-        def fetcher(page: int) -> HttpResponse:
-            return self.get(
-                path="/projects/{id}/rows",
+        def build_iterator(
+            filt: Optional[RowsFilter], count: Optional[Callable[[], int]]
+        ) -> "CaplenaIterator[Row]":
+            def fetcher(page: int, page_size: int) -> HttpResponse:
+                return self.get(
+                    path=self.ROWS_ROUTE,
+                    path_params={"id": id},
+                    query_params={
+                        "page": str(page),
+                        "limit": str(page_size),
+                    },
+                    filter=filt,
+                )
+
+            return self.build_iterator(
+                fetcher=fetcher,
+                limit=limit,
+                resource=Row,
+                metadata={"project": id},
+                typed_decoder=self._typed_decoder(Row),
+                count=count,
+            )
+
+        # note: rows are returned in the order they were added, which is used to merge sharded filters
+        return self.build_sharded_iterator(
+            filter=filter,
+            build_iterator=build_iterator,
+            count=lambda: self.count_rows(id=id, filter=filter),
+            order_by=ApiOrdering.asc("created"),
+            limit=limit,
+        )
+
+    def count_rows(self, *, id: str, filter: Optional[RowsFilter] = None) -> int:
+        """Returns the number of rows you have previously created for this project. Only the count is
+        requested, no rows are fetched, and counts are cached for a few seconds per filter. Filters
+        exceeding the maximum query length are split into shards, which may overlap. In that case, the
+        identifiers of all matching rows are listed instead, costing one request per page of every shard.
+
+        :param id: The project identifier.
+        :param filter: Filters to apply to this request. If omitted, no filters are applied.
+        :raises caplena.api.ApiException: An API exception.
+        """
+        return self._count(id, filter=filter)
+
+    def count_rows_many(
+        self,
+        *,
+        id: str,
+        filters: Sequence[Optional[RowsFilter]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> List[Union[int, Exception]]:
+        """Returns the number of rows of this project matching each of the given filters, sending up
+        to :code:`max_workers` requests concurrently. The counts are returned in the order of the given
+        filters. If a count cannot be retrieved, its exception is returned in its place.
+
+        :param id: The project identifier.
+        :param filters: The filters to count the rows of, :code:`None` counts all rows.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        """
+        return map_concurrently(
+            lambda filt: self.count_rows(id=id, filter=filt), filters, max_workers=max_workers
+        )
+
+    def export_rows(
+        self,
+        *,
+        id: str,
+        filter: Optional[RowsFilter] = None,
+        processes: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> "RowExport":
+        """Returns an export of all rows of this project, e.g. to populate a database. Pages are fetched
+        concurrently and decoded by a pool of worker processes, which convert the rows into tuples or
+        columnar batches of plain values instead of building rows.
+
+        :param id: The project identifier.
+        :param filter: Filters to apply to this request. If omitted, no filters are applied.
+        :param processes: The number of worker processes, defaults to :code:`None`, meaning one per CPU.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :raises caplena.api.ApiException: An API exception.
+        """
+        # note: imported lazily, as the export refers to the resources below
+        from caplena.endpoints.row_export import RowExport
+
+        if filter is not None and len(self.api.split_filter(filter)) > 1:
+            raise ValueError(
+                "Cannot export rows with an oversized filter. HINT: Please use a shorter filter, "
+                "or list the rows instead."
+            )
+
+        project = self.retrieve(id=id)
+        page_size = LIST_PAGINATION_LIMIT
+        # note: the cached count might be outdated, the export continues past the estimated pages
+        # as long as there are more rows, though.
+        count = self._retrieve_page(id, page=1, limit=1, filter=filter)["count"]
+
+        def fetch_page(page: int) -> Optional[bytes]:
+            # note: pages after the first are out of range if rows were removed after counting
+            response = self.get(
+                path=self.ROWS_ROUTE,
+                allowed_codes={200, 404} if page > 1 else {200},
                 path_params={"id": id},
-                query_params={
-                    "page": str(page),
-                    "limit": str(LIST_PAGINATION_LIMIT),
-                },
+                query_params={"page": str(page), "limit": str(page_size)},
                 filter=filter,
             )
-
-        return self.build_iterator(
-            fetcher=fetcher, limit=limit, resource=Row, metadata={"project": id}
+            if response.status_code == 404:
+                return None
+            return self._retrieve_content_or_raise(response)
+
+        return RowExport(
+            layout=[(column.ref, column.type) for column in project.columns],
+            pages=-(-count // page_size),
+            fetch_page=fetch_page,
+            processes=processes,
+            max_workers=max_workers,
         )
 
     def retrieve_row(self, *, p_id: str, r_id: str) -> "Row":
@@ -247,11 +565,32 @@ class ProjectsController(BaseController):
         :param r_id: The row identifier.
         :raises caplena.api.ApiException: An API exception.
         """
-        response = self.get(
-            path="/projects/{p_id}/rows/{r_id}",
-            path_params={"p_id": p_id, "r_id": r_id},
+        return self.build_cached_response(
+            self._row_key(p_id, r_id),
+            fetcher=lambda: self.get(
+                path=self.ROW_ROUTE,
+                path_params={"p_id": p_id, "r_id": r_id},
+            ),
+            resource=Row,
+            metadata={"project": p_id},
+            typed_decoder=self._typed_decoder(Row),
+        )
+
+    def retrieve_rows(
+        self, *, p_id: str, r_ids: Sequence[str], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[Union["Row", Exception]]:
+        """Retrieves multiple rows of a project you have previously created, sending up to
+        :code:`max_workers` requests concurrently. The rows are returned in the order of the given
+        identifiers. If a row cannot be retrieved, its exception is returned in its place.
+
+        :param p_id: The project identifier.
+        :param r_ids: The row identifiers.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        """
+        rows = map_concurrently(
+            lambda r_id: self.retrieve_row(p_id=p_id, r_id=r_id), r_ids, max_workers=max_workers
         )
-        return self.build_response(response, resource=Row, metadata={"project": id})
+        return [self.track(row) for row in rows]
 
     def remove_row(self, *, p_id: str, r_id: str) -> None:
         """Removes a previously created row.
@@ -260,7 +599,10 @@ class ProjectsController(BaseController):
         :param r_id: The row identifier.
         :raises caplena.api.ApiException: An API exception.
         """
-        self.delete(path="/projects/{p_id}/rows/{r_id}", path_params={"p_id": p_id, "r_id": r_id})
+        self.delete(path=self.ROW_ROUTE, path_params={"p_id": p_id, "r_id": r_id})
+        self.evict_cached(self._project_key(p_id))
+        self._evict_counts(p_id)
+        self.evict_cached(self._row_key(p_id, r_id))
 
     def update_row(
         self,
@@ -279,9 +621,154 @@ class ProjectsController(BaseController):
         json = self.api.build_payload(columns=columns)
 
         response = self.patch(
-            path="/projects/{p_id}/rows/{r_id}", path_params={"p_id": p_id, "r_id": r_id}, json=json
+            path=self.ROW_ROUTE, path_params={"p_id": p_id, "r_id": r_id}, json=json
+        )
+        self.evict_cached(self._project_key(p_id))
+        self._evict_counts(p_id)
+        return self.build_response(
+            response,
+            resource=Row,
+            metadata={"project": p_id},
+            cache_key=self._row_key(p_id, r_id),
+            typed_decoder=self._typed_decoder(Row),
         )
-        return self.build_response(response, resource=Row, metadata={"project": id})
+
+    def remove_rows(
+        self,
+        *,
+        p_id: str,
+        ids: Optional[Sequence[str]] = None,
+        filter: Optional[RowsFilter] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Exception]:
+        """Removes multiple previously created rows, either given by their identifiers or by a filter,
+        sending up to :code:`max_workers` requests concurrently. Rows that cannot be removed do not
+        prevent the other rows from being removed.
+
+        :param p_id: The project identifier.
+        :param ids: The identifiers of the rows to remove.
+        :param filter: Filters selecting the rows to remove. All matching rows are listed before any
+            row is removed.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :param rate_limit: The maximum number of requests per second, defaults to :code:`None`,
+            meaning that requests are not rate limited.
+        :param on_progress: Called with the number of completed and total removals after every removal.
+        :returns: The exceptions of all rows that could not be removed, keyed by row identifier.
+        :raises caplena.api.ApiException: An API exception, if the rows matching the filter cannot be listed.
+        """
+        if (ids is None) == (filter is None):
+            raise ValueError(
+                "Cannot remove rows. HINT: Please specify either the `ids` or the `filter` of the rows to remove."
+            )
+        r_ids = list(ids) if ids is not None else self._list_row_ids(p_id=p_id, filter=filter)
+
+        results = map_concurrently(
+            lambda r_id: self.remove_row(p_id=p_id, r_id=r_id),
+            r_ids,
+            max_workers=max_workers,
+            rate_limiter=RateLimiter(rate_limit) if rate_limit is not None else None,
+            on_progress=on_progress,
+        )
+        return {
+            r_id: result for r_id, result in zip(r_ids, results) if isinstance(result, Exception)
+        }
+
+    def update_rows(
+        self,
+        *,
+        p_id: str,
+        updates: Sequence[Dict[str, Any]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Union["Row", Exception]]:
+        """Updates multiple previously created rows, sending up to :code:`max_workers` requests
+        concurrently. The updated rows are returned in the order of the given updates. If a row
+        cannot be updated, its exception is returned in its place.
+
+        :param p_id: The project identifier.
+        :param updates: The updates to apply, each consisting of the row :code:`id` and its :code:`columns`,
+            e.g. :code:`[{"id": "ro_1", "columns": [{"ref": "age", "value": 42}]}]`.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :param rate_limit: The maximum number of requests per second, defaults to :code:`None`,
+            meaning that requests are not rate limited.
+        :param on_progress: Called with the number of completed and total updates after every update.
+        """
+        rows = map_concurrently(
+            lambda update: self.update_row(p_id=p_id, r_id=update["id"], columns=update["columns"]),
+            updates,
+            max_workers=max_workers,
+            rate_limiter=RateLimiter(rate_limit) if rate_limit is not None else None,
+            on_progress=on_progress,
+        )
+        return [self.track(row) for row in rows]
+
+    def _list_row_ids(self, *, p_id: str, filter: Optional[RowsFilter]) -> List[str]:
+        return self._list_ids(p_id, filter=filter)
+
+    def _list_ids(self, p_id: Optional[str], *, filter: Optional[ApiFilter]) -> List[str]:
+        # note: only the identifiers are extracted from the raw pages, no objects are built.
+        ids: List[str] = []
+        page, has_next = 1, True
+        while has_next:
+            json = self._retrieve_page(p_id, page=page, limit=LIST_PAGINATION_LIMIT, filter=filter)
+            ids.extend(obj["id"] for obj in json["results"])
+            page, has_next = page + 1, json["next_url"] is not None
+        return ids
+
+    def _retrieve_page(
+        self, p_id: Optional[str], *, page: int, limit: int, filter: Optional[ApiFilter]
+    ) -> Dict[str, Any]:
+        # note: pages of rows if a project identifier is given, pages of projects otherwise
+        response = self.get(
+            path=self.PROJECTS_ROUTE if p_id is None else self.ROWS_ROUTE,
+            path_params=None if p_id is None else {"id": p_id},
+            query_params={"page": str(page), "limit": str(limit)},
+            filter=filter,
+        )
+        return self._retrieve_json_or_raise(response)
+
+    def _count(self, p_id: Optional[str], *, filter: Optional[ApiFilter]) -> int:
+        key: CountKey = (
+            p_id,
+            tuple(sorted(filter.to_query_params().items())) if filter is not None else (),
+        )
+        with self._counts_lock:
+            count = self._counts.get(key)
+        if count is not None:
+            return count
+
+        shards = self.api.split_filter(filter) if filter is not None else [filter]
+        if len(shards) == 1:
+            # note: the smallest page suffices, as only the total count of the page is read
+            count = self._retrieve_page(p_id, page=1, limit=1, filter=shards[0])["count"]
+        else:
+            # note: objects matching multiple shards must only be counted once. as shards split a
+            # disjunction, e.g. of topics or case-insensitive texts, they can overlap in general, so
+            # summing their counts would overcount. all identifiers are listed instead.
+            shard_ids = map_concurrently(
+                lambda shard: self._list_ids(p_id, filter=shard),
+                shards,
+                max_workers=DEFAULT_MAX_WORKERS,
+            )
+            ids: Set[str] = set()
+            for shard_result in shard_ids:
+                if isinstance(shard_result, Exception):
+                    raise shard_result
+                ids.update(shard_result)
+            count = len(ids)
+
+        with self._counts_lock:
+            self._counts[key] = count
+        return count
+
+    def _evict_counts(self, p_id: Optional[str]) -> None:
+        # note: counts of rows are evicted per project, counts of projects if no project is given
+        with self._counts_lock:
+            for key in [key for key in self._counts if key[0] == p_id]:
+                del self._counts[key]
 
 
 # --- Resources & Objects--- #
@@ -316,6 +803,32 @@ class RowOperationsMixin(OperationsProtocol, Protocol):
         """
         return self.controller.list_rows(id=self.id, limit=limit, filter=filter)
 
+    def count_rows(self, *, filter: Optional[RowsFilter] = None) -> int:
+        """Returns the number of rows of this project, without fetching any rows.
+
+        :param filter: Filters to apply to this request. If omitted, no filters are applied.
+        :raises caplena.api.ApiException: An API exception.
+        """
+        return self.controller.count_rows(id=self.id, filter=filter)
+
+    def export_rows(
+        self,
+        *,
+        filter: Optional[RowsFilter] = None,
+        processes: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ) -> "RowExport":
+        """Returns an export of all rows of this project, decoded by a pool of worker processes.
+
+        :param filter: Filters to apply to this request. If omitted, no filters are applied.
+        :param processes: The number of worker processes, defaults to :code:`None`, meaning one per CPU.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :raises caplena.api.ApiException: An API exception.
+        """
+        return self.controller.export_rows(
+            id=self.id, filter=filter, processes=processes, max_workers=max_workers
+        )
+
     def retrieve_row(self, *, id: str) -> "Row":
         """Retrieves a previously created row for this project.
 
@@ -324,6 +837,67 @@ class RowOperationsMixin(OperationsProtocol, Protocol):
         """
         return self.controller.retrieve_row(p_id=self.id, r_id=id)
 
+    def retrieve_rows(
+        self, *, ids: Sequence[str], max_workers: int = DEFAULT_MAX_WORKERS
+    ) -> List[Union["Row", Exception]]:
+        """Retrieves multiple previously created rows of this project concurrently. The rows are returned
+        in the order of the given identifiers, with exceptions in place of rows that cannot be retrieved.
+
+        :param ids: The row identifiers.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        """
+        return self.controller.retrieve_rows(p_id=self.id, r_ids=ids, max_workers=max_workers)
+
+    def remove_rows(
+        self,
+        *,
+        ids: Optional[Sequence[str]] = None,
+        filter: Optional[RowsFilter] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Exception]:
+        """Removes multiple rows of this project concurrently, either given by their identifiers or by a filter.
+
+        :param ids: The identifiers of the rows to remove.
+        :param filter: Filters selecting the rows to remove.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :param rate_limit: The maximum number of requests per second, defaults to :code:`None`.
+        :param on_progress: Called with the number of completed and total removals after every removal.
+        :returns: The exceptions of all rows that could not be removed, keyed by row identifier.
+        """
+        return self.controller.remove_rows(
+            p_id=self.id,
+            ids=ids,
+            filter=filter,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            on_progress=on_progress,
+        )
+
+    def update_rows(
+        self,
+        *,
+        updates: Sequence[Dict[str, Any]],
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: Optional[float] = None,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+    ) -> List[Union["Row", Exception]]:
+        """Updates multiple rows of this project concurrently, returning them in the order of the given updates.
+
+        :param updates: The updates to apply, each consisting of the row :code:`id` and its :code:`columns`.
+        :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+        :param rate_limit: The maximum number of requests per second, defaults to :code:`None`.
+        :param on_progress: Called with the number of completed and total updates after every update.
+        """
+        return self.controller.update_rows(
+            p_id=self.id,
+            updates=updates,
+            max_workers=max_workers,
+            rate_limit=rate_limit,
+            on_progress=on_progress,
+        )
+
     def append_row(self, *, columns: List[Dict[str, Any]]) -> "Row":
         """Appends a single row to this project.
 
@@ -370,6 +944,7 @@ class BaseProjectOperationsMixin(OperationsProtocol, Protocol):
 
         :raises caplena.api.ApiException: An API exception.
         """
+        self.controller.evict_cached(ProjectsController._project_key(self.id))
         project = self.controller.retrieve(id=self.id)
         self._refresh_from(attrs=project._attrs)
 
@@ -384,6 +959,9 @@ class BaseProjectOperationsMixin(OperationsProtocol, Protocol):
             self._refresh_from(attrs=project._attrs)
 
 
+ProjectIndex = Dict[Tuple[str, Union[str, int]], Any]
+
+
 class ProjectDetail(
     BaseResource[ProjectsController], BaseProjectOperationsMixin, RowOperationsMixin
 ):
@@ -472,11 +1050,20 @@ class ProjectDetail(
 
             @classmethod
             def parse_obj(cls, obj: Dict[str, Any]) -> "ProjectDetail.TextToAnalyze.Topic":
-                obj["sentiment_neutral"] = cls.Sentiment.parse_obj(obj["sentiment_neutral"])
-                obj["sentiment_negative"] = cls.Sentiment.parse_obj(obj["sentiment_negative"])
-                obj["sentiment_positive"] = cls.Sentiment.parse_obj(obj["sentiment_positive"])
-
-                return super().parse_obj(obj)
+                return super().parse_obj(
+                    {
+                        **obj,
+                        "sentiment_neutral": LazyValue(
+                            obj["sentiment_neutral"], cls.Sentiment.parse_obj
+                        ),
+                        "sentiment_negative": LazyValue(
+                            obj["sentiment_negative"], cls.Sentiment.parse_obj
+                        ),
+                        "sentiment_positive": LazyValue(
+                            obj["sentiment_positive"], cls.Sentiment.parse_obj
+                        ),
+                    }
+                )
 
         class Metadata(BaseObject[ProjectsController]):
             class LearnsForm(BaseObject[ProjectsController]):
@@ -521,11 +1108,19 @@ class ProjectDetail(
 
         @classmethod
         def parse_obj(cls, obj: Dict[str, Any]) -> "ProjectDetail.TextToAnalyze":
-            obj["topics"] = CaplenaList(
-                values=[cls.Topic.parse_obj(topic) for topic in obj["topics"]]
+            return super().parse_obj(
+                {
+                    **obj,
+                    "topics": LazyValue(obj["topics"], cls._parse_topics),
+                    "metadata": cls.Metadata.parse_obj(obj["metadata"]),
+                }
             )
-            obj["metadata"] = cls.Metadata.parse_obj(obj["metadata"])
-            return super().parse_obj(obj)
+
+        @classmethod
+        def _parse_topics(
+            cls, topics: List[Dict[str, Any]]
+        ) -> CaplenaList["ProjectDetail.TextToAnalyze.Topic"]:
+            return CaplenaList(values=[cls.Topic.parse_obj(topic) for topic in topics])
 
     class Auxiliary(Column):
         type: Literal["numerical", "boolean", "text", "date", "any"]
@@ -580,22 +1175,72 @@ class ProjectDetail(
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(id={self.id}, name={self.name}, columns={self.columns.__repr__()})"
 
+    def column(self, ref: str) -> Optional["ProjectDetail.Column"]:
+        """Returns the column with the given reference, or :code:`None` if there is no such column.
+
+        :param ref: The column reference.
+        """
+        column: Optional[ProjectDetail.Column] = self._lookup().get(("column", ref))
+        return column
+
+    def topic(self, key: Union[str, int]) -> Optional["ProjectDetail.TextToAnalyze.Topic"]:
+        """Returns the topic with the given identifier or sentiment code, or :code:`None` if there
+        is no such topic. Topics of rows can be joined with their definition using their :code:`id`
+        or :code:`code`.
+
+        :param key: The topic identifier, or the code of any of its sentiments.
+        """
+        topic: Optional[ProjectDetail.TextToAnalyze.Topic] = self._lookup().get(("topic", key))
+        return topic
+
+    def _lookup(self) -> "ProjectIndex":
+        # note: the index is built once and kept as long as the columns are not refreshed
+        columns = self.columns
+        cached = cast(Optional[Tuple[Any, ProjectIndex]], self.__dict__.get("_index"))
+        if cached is not None and cached[0] is columns:
+            return cached[1]
+
+        index: ProjectIndex = {}
+        for column in columns:
+            index.setdefault(("column", column.ref), column)
+            if isinstance(column, ProjectDetail.TextToAnalyze):
+                for topic in column.topics:
+                    index.setdefault(("topic", topic.id), topic)
+                    for sentiment in (
+                        topic.sentiment_neutral,
+                        topic.sentiment_negative,
+                        topic.sentiment_positive,
+                    ):
+                        index.setdefault(("topic", sentiment.code), topic)
+        self._index = (columns, index)
+        return index
+
     @classmethod
     def parse_obj(cls, obj: Dict[str, Any]) -> "ProjectDetail":
-        obj["columns"] = CaplenaList(
+        # note: parsing never modifies the given object, as decoded responses might be cached.
+        # nested fields are only parsed once they are accessed.
+        return super().parse_obj(
+            {
+                **obj,
+                "tags": list(obj["tags"]),
+                "columns": LazyValue(obj["columns"], cls._parse_columns),
+                "created": LazyValue(obj["created"], Helpers.from_rfc3339_datetime),
+                "last_modified": LazyValue(obj["last_modified"], Helpers.from_rfc3339_datetime),
+            }
+        )
+
+    @classmethod
+    def _parse_columns(cls, columns: List[Dict[str, Any]]) -> CaplenaList["ProjectDetail.Column"]:
+        return CaplenaList(
             values=[
                 (
                     cls.TextToAnalyze.parse_obj(column)
                     if column["type"] == "text_to_analyze"
                     else cls.Auxiliary.parse_obj(column)
                 )
-                for column in obj["columns"]
+                for column in columns
             ]
         )
-        obj["created"] = Helpers.from_rfc3339_datetime(obj["created"])
-        obj["last_modified"] = Helpers.from_rfc3339_datetime(obj["last_modified"])
-
-        return super().parse_obj(obj)
 
 
 class ListedProject(
@@ -648,10 +1293,14 @@ class ListedProject(
 
     @classmethod
     def parse_obj(cls, obj: Dict[str, Any]) -> "ListedProject":
-        obj["created"] = Helpers.from_rfc3339_datetime(obj["created"])
-        obj["last_modified"] = Helpers.from_rfc3339_datetime(obj["last_modified"])
-
-        return super().parse_obj(obj)
+        return super().parse_obj(
+            {
+                **obj,
+                "tags": list(obj["tags"]),
+                "created": LazyValue(obj["created"], Helpers.from_rfc3339_datetime),
+                "last_modified": LazyValue(obj["last_modified"], Helpers.from_rfc3339_datetime),
+            }
+        )
 
 
 class RowsAppend(BaseObject[ProjectsController]):
@@ -682,10 +1331,14 @@ class RowsAppend(BaseObject[ProjectsController]):
 
     @classmethod
     def parse_obj(cls, obj: Dict[str, Any]) -> "RowsAppend":
-        obj["results"] = CaplenaList(
-            values=[cls.RowsAppendResult.parse_obj(res) for res in obj["results"]]
+        return super().parse_obj(
+            {
+                **obj,
+                "results": CaplenaList(
+                    values=[cls.RowsAppendResult.parse_obj(res) for res in obj["results"]]
+                ),
+            }
         )
-        return super().parse_obj(obj)
 
 
 class RowsAppendStatus(BaseObject[ProjectsController]):
@@ -711,6 +1364,9 @@ class RowsAppendStatus(BaseObject[ProjectsController]):
     """tasks of the project"""
 
 
+_column_ref = operator.attrgetter("ref")
+
+
 class Row(BaseResource[ProjectsController]):
     """The Row resource."""
 
@@ -761,7 +1417,7 @@ class Row(BaseResource[ProjectsController]):
         @classmethod
         def parse_obj(cls, obj: Dict[str, Any]) -> "Row.DateColumn":
             if obj["value"] is not None:
-                obj["value"] = Helpers.from_rfc3339_datetime(obj["value"])
+                obj = {**obj, "value": LazyValue(obj["value"], Helpers.from_rfc3339_datetime)}
 
             return super().parse_obj(obj)
 
@@ -772,6 +1428,12 @@ class Row(BaseResource[ProjectsController]):
         value: None
         """Any value assigned to this column."""
 
+        @classmethod
+        def parse_obj(cls, obj: Dict[str, Any]) -> "Row.AnyColumn":
+            # note: values of any type might be mutable, and the given object might be cached,
+            # so the column gets its own copy, which it may modify without changing the cache.
+            return super().parse_obj({**obj, "value": deepcopy(obj["value"])})
+
     class TextColumn(Column):
         type: Literal["text"]
         """Type of this column."""
@@ -848,13 +1510,25 @@ class Row(BaseResource[ProjectsController]):
 
         @classmethod
         def parse_obj(cls, obj: Dict[str, Any]) -> "Row.TextToAnalyzeColumn":
-            obj["topics"] = CaplenaList(
-                values=[cls.Topic.parse_obj(topic) for topic in obj["topics"]]
-            )
-            return super().parse_obj(obj)
+            return super().parse_obj({**obj, "topics": LazyValue(obj["topics"], cls._parse_topics)})
+
+        @classmethod
+        def _parse_topics(
+            cls, topics: List[Dict[str, Any]], *, flyweights: Optional[FlyweightTable] = None
+        ) -> CaplenaList["Row.TextToAnalyzeColumn.Topic"]:
+            if flyweights is None:
+                return CaplenaList(values=[cls.Topic.parse_obj(topic) for topic in topics])
+
+            parsed = [cls.Topic.parse_obj(flyweights.topic(topic)) for topic in topics]
+            for topic in parsed:
+                topic._metadata = flyweights.column_metadata
+            return CaplenaList(values=parsed)
 
     __fields__ = {"created", "last_modified", "columns"}
 
+    # note: set when the row is built for a project, holding the values shared with other rows
+    _flyweights: Optional[FlyweightTable] = None
+
     created: datetime
     """Timestamp at which this row was created."""
 
@@ -867,6 +1541,17 @@ class Row(BaseResource[ProjectsController]):
     def __repr__(self) -> str:
         return f"{self.__class__.__name__}(id={self.id}, columns={self.columns.__repr__()})"
 
+    def column(self, ref: str) -> Optional["Row.Column"]:
+        """Returns the column with the given reference, or :code:`None` if this row has no such
+        column. Rows of the same project share a single index of their column positions.
+
+        :param ref: The column reference.
+        """
+        columns: CaplenaList[Row.Column] = self.columns
+        if self._flyweights is None:
+            return next((column for column in columns if column.ref == ref), None)
+        return self._flyweights.index("row_columns", _column_ref).find(columns, ref)
+
     def remove(self) -> None:
         """Removes this row.
 
@@ -879,7 +1564,9 @@ class Row(BaseResource[ProjectsController]):
 
         :raises caplena.api.ApiException: An API exception.
         """
-        row = self.controller.retrieve_row(p_id=self._metadata["project"], r_id=self.id)
+        p_id = self._metadata["project"]
+        self.controller.evict_cached(ProjectsController._row_key(p_id, self.id))
+        row = self.controller.retrieve_row(p_id=p_id, r_id=self.id)
         self._refresh_from(attrs=row._attrs)
 
     def save(self) -> None:
@@ -904,19 +1591,103 @@ class Row(BaseResource[ProjectsController]):
         return self.controller.retrieve(id=self._metadata["project"])
 
     @classmethod
-    def parse_obj(cls, obj: Dict[str, Any]) -> "Row":
-        type_to_column = {
-            "numerical": cls.NumericalColumn,
-            "boolean": cls.BooleanColumn,
-            "date": cls.DateColumn,
-            "any": cls.AnyColumn,
-            "text": cls.TextColumn,
-            "text_to_analyze": cls.TextToAnalyzeColumn,
+    def to_columnar(cls, objects: Iterable["Row"]) -> Dict[str, List[Any]]:
+        """Converts the given rows into a columnar batch. Column values are stored under
+        :code:`columns.<ref>`, additional column properties such as :code:`was_reviewed` under
+        :code:`columns.<ref>.<property>`. Missing values are filled with :code:`None`.
+
+        :param objects: The rows to convert.
+        """
+        rows = list(objects)
+        columnar: Dict[str, List[Any]] = {
+            "id": [row.id for row in rows],
+            "created": cls._datetime_values(rows, "created"),
+            "last_modified": cls._datetime_values(rows, "last_modified"),
         }
-        obj["columns"] = CaplenaList(
-            values=[type_to_column[column["type"]].parse_obj(column) for column in obj["columns"]]
+        for idx, row in enumerate(rows):
+            for column in row.columns:
+                for field in sorted(column.__fields__ - {"ref", "type"}):
+                    key = f"columns.{column.ref}"
+                    if field != "value":
+                        key += f".{field}"
+                    values = columnar.setdefault(key, [None] * len(rows))
+                    values[idx] = column._attr(field)
+        return columnar
+
+    @staticmethod
+    def _datetime_values(rows: List["Row"], field: str) -> List[Any]:
+        # note: datetimes that were not accessed yet are parsed in one batch, without
+        # materializing them on the rows.
+        values = [row._attrs[field] for row in rows]
+        lazy = [idx for idx, value in enumerate(values) if isinstance(value, LazyValue)]
+        parsed = DEFAULT_DATETIME_CODEC.parse_many(values[idx].raw for idx in lazy)
+        for idx, dt in zip(lazy, parsed):
+            values[idx] = dt
+        return values
+
+    @classmethod
+    def build_obj(
+        cls,
+        obj: Dict[str, Any],
+        *,
+        controller: Optional["ProjectsController"],
+        obj_exists: bool = False,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> "Row":
+        if not metadata or "project" not in metadata:
+            return super().build_obj(
+                obj, controller=controller, obj_exists=obj_exists, metadata=metadata
+            )
+
+        if obj_exists and controller is not None:
+            return controller._parse_row(metadata["project"], obj, metadata=metadata)
+
+        # note: values are only interned for rows of a controller, which holds the shared tables
+        flyweights = controller._flyweights(metadata["project"]) if controller is not None else None
+        instance = cls.parse_obj(obj, flyweights=flyweights)
+        instance._prepare(controller=controller, obj_exists=obj_exists)
+        # note: rows of the same project share their metadata, which is never modified
+        if flyweights is not None and metadata == flyweights.metadata:
+            metadata = flyweights.metadata
+        instance._metadata = metadata
+        instance._flyweights = flyweights
+        return instance
+
+    @classmethod
+    def parse_obj(
+        cls, obj: Dict[str, Any], *, flyweights: Optional[FlyweightTable] = None
+    ) -> "Row":
+        """Parses the given row. If a flyweight table is given, the values repeated across rows,
+        such as column references and topics, are interned.
+
+        :param obj: The row as received from the API.
+        :param flyweights: The flyweight table of the project the row belongs to.
+        """
+        # note: nested fields are only parsed once they are accessed, such that iterating over
+        # rows and reading a few of their fields doesn't pay for parsing all columns and topics.
+        parse_columns: Callable[[List[Dict[str, Any]]], CaplenaList[Row.Column]] = (
+            cls._parse_columns
+            if flyweights is None
+            else partial(cls._parse_columns, flyweights=flyweights)
+        )
+        return super().parse_obj(
+            {
+                **obj,
+                "columns": LazyValue(obj["columns"], parse_columns),
+                "created": LazyValue(obj["created"], Helpers.from_rfc3339_datetime),
+                "last_modified": LazyValue(obj["last_modified"], Helpers.from_rfc3339_datetime),
+            }
         )
-        obj["created"] = Helpers.from_rfc3339_datetime(obj["created"])
-        obj["last_modified"] = Helpers.from_rfc3339_datetime(obj["last_modified"])
 
-        return super().parse_obj(obj)
+    @classmethod
+    def _parse_columns(
+        cls, columns: List[Dict[str, Any]], *, flyweights: Optional[FlyweightTable] = None
+    ) -> CaplenaList["Row.Column"]:
+        # note: imported lazily, as the parser refers to the resources of this module
+        from caplena.endpoints.row_parser import RowParser
+
+        project = flyweights.project if flyweights is not None else None
+        parser = RowParser(
+            project=project, layout=RowParser.layout_of(columns), flyweights=flyweights
+        )
+        return CaplenaList(values=parser.build_columns(columns, controller=None))
@@ -0,0 +1,359 @@
+"""Typed schemas of the project and row resources, used to decode responses straight into resource
+objects. Requires `msgspec <https://jcristharif.com/msgspec/>`_ to be installed.
+"""
+
+from copy import copy
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Type, Union
+
+import msgspec
+
+from caplena.endpoints.base_endpoint import BaseController, BaseObject
+from caplena.endpoints.projects_endpoint import (
+    ListedProject,
+    ProjectDetail,
+    ProjectsController,
+    Row,
+)
+from caplena.endpoints.row_parser import RowParser
+from caplena.endpoints.typed_decoder import TypedDecoder
+from caplena.list import CaplenaList
+
+
+def _snapshot(obj: BaseObject[Any]) -> Any:
+    """Returns the previous version of the given object, as kept by its parent object."""
+    # note: the previous attributes of an object are never modified in place, such that they
+    # can be shared with its snapshot instead of being copied.
+    snapshot = type(obj).build_prepared(
+        obj._previous, previous={}, controller=None, metadata=obj._metadata
+    )
+    if "_id" in obj.__dict__:
+        snapshot.__dict__["_id"] = obj.__dict__["_id"]
+    return snapshot
+
+
+def _snapshots(objs: List[Any]) -> CaplenaList[Any]:
+    return CaplenaList(values=[_snapshot(obj) for obj in objs])
+
+
+def _build_object(
+    cls: Type[BaseObject[Any]],
+    attrs: Dict[str, Any],
+    *,
+    previous: Dict[str, Any],
+    controller: Optional[BaseController],
+    id: Optional[str] = None,
+    metadata: Optional[Dict[str, Any]] = None,
+) -> Any:
+    """Builds an existing object from the given attributes. Instead of a deep copy, its previous
+    attributes hold the snapshots of all nested objects.
+    """
+    instance = cls.build_prepared(
+        attrs, previous=previous, controller=controller, metadata=metadata
+    )
+    if id is not None:
+        instance.__dict__["_id"] = id
+    return instance
+
+
+# --- Rows --- #
+
+
+class RowTopicSchema(msgspec.Struct):
+    id: str
+    label: str
+    category: str
+    code: int
+    sentiment_label: str
+    sentiment: str
+
+
+class NumericalColumnSchema(msgspec.Struct, tag_field="type", tag="numerical"):
+    ref: str
+    value: Optional[Union[int, float]]
+
+
+class BooleanColumnSchema(msgspec.Struct, tag_field="type", tag="boolean"):
+    ref: str
+    value: Optional[bool]
+
+
+class DateColumnSchema(msgspec.Struct, tag_field="type", tag="date"):
+    ref: str
+    # note: dates are kept as strings, as both dates and datetimes are valid values
+    value: Optional[str]
+
+
+class AnyColumnSchema(msgspec.Struct, tag_field="type", tag="any"):
+    ref: str
+    value: Any
+
+
+class TextColumnSchema(msgspec.Struct, tag_field="type", tag="text"):
+    ref: str
+    value: Optional[str]
+
+
+class TextToAnalyzeColumnSchema(msgspec.Struct, tag_field="type", tag="text_to_analyze"):
+    ref: str
+    value: Optional[str]
+    was_reviewed: Optional[bool]
+    sentiment_overall: Optional[str]
+    source_language: Optional[str]
+    translated_value: Optional[str]
+    topics: List[RowTopicSchema]
+
+
+RowColumnSchema = Union[
+    NumericalColumnSchema,
+    BooleanColumnSchema,
+    DateColumnSchema,
+    AnyColumnSchema,
+    TextColumnSchema,
+    TextToAnalyzeColumnSchema,
+]
+
+
+class RowSchema(msgspec.Struct):
+    id: str
+    created: datetime
+    last_modified: datetime
+    columns: List[RowColumnSchema]
+
+
+def build_row(
+    row: RowSchema, controller: Optional[BaseController], metadata: Dict[str, Any]
+) -> Row:
+    # note: columns are validated by their schemas, but built by the same parser as all other rows
+    columns: List[Dict[str, Any]] = msgspec.to_builtins(row.columns)
+    p_id = metadata.get("project")
+    if not isinstance(controller, ProjectsController):
+        parser = RowParser.from_row(p_id, {"columns": columns})
+        controller = None
+    elif p_id is not None:
+        parser = controller._row_parser(p_id, columns)
+    else:
+        parser = RowParser.from_row(None, {"columns": columns})
+
+    return parser.build(
+        row.id,
+        created=row.created,
+        last_modified=row.last_modified,
+        columns=columns,
+        controller=controller,
+        metadata=metadata,
+    )
+
+
+# --- Projects --- #
+
+
+class SentimentSchema(msgspec.Struct):
+    code: int
+    label: str
+
+
+class ProjectTopicSchema(msgspec.Struct):
+    id: str
+    label: str
+    category: str
+    sentiment_enabled: bool
+    sentiment_neutral: SentimentSchema
+    sentiment_negative: SentimentSchema
+    sentiment_positive: SentimentSchema
+    # note: optional values may be null or missing, fields with defaults must come last
+    color: Optional[str] = None
+    description: Optional[str] = None
+
+
+class LearnsFromSchema(msgspec.Struct):
+    project: str
+    ref: str
+
+
+class ColumnMetadataSchema(msgspec.Struct):
+    reviewed_count: int
+    learns_from: Optional[LearnsFromSchema]
+
+
+class ProjectTextToAnalyzeSchema(msgspec.Struct, tag_field="type", tag="text_to_analyze"):
+    ref: str
+    name: str
+    topics: List[ProjectTopicSchema]
+    metadata: ColumnMetadataSchema
+    description: Optional[str] = None
+
+
+class ProjectNumericalSchema(msgspec.Struct, tag_field="type", tag="numerical"):
+    ref: str
+    name: str
+
+
+class ProjectBooleanSchema(ProjectNumericalSchema, tag="boolean"):
+    pass
+
+
+class ProjectTextSchema(ProjectNumericalSchema, tag="text"):
+    pass
+
+
+class ProjectDateSchema(ProjectNumericalSchema, tag="date"):
+    pass
+
+
+class ProjectAnySchema(ProjectNumericalSchema, tag="any"):
+    pass
+
+
+ProjectColumnSchema = Union[
+    ProjectTextToAnalyzeSchema,
+    ProjectNumericalSchema,
+    ProjectBooleanSchema,
+    ProjectTextSchema,
+    ProjectDateSchema,
+    ProjectAnySchema,
+]
+
+
+class ListedProjectSchema(msgspec.Struct):
+    id: str
+    name: str
+    owner: str
+    tags: List[str]
+    upload_status: str
+    language: str
+    created: datetime
+    last_modified: datetime
+    translation_status: Optional[str]
+    translation_engine: Optional[str]
+
+
+class ProjectDetailSchema(ListedProjectSchema):
+    columns: List[ProjectColumnSchema]
+
+
+def _listed_project_attrs(project: ListedProjectSchema) -> Dict[str, Any]:
+    return {
+        "name": project.name,
+        "owner": project.owner,
+        "tags": list(project.tags),
+        "upload_status": project.upload_status,
+        "language": project.language,
+        "created": project.created,
+        "last_modified": project.last_modified,
+        "translation_status": project.translation_status,
+        "translation_engine": project.translation_engine,
+    }
+
+
+def _project_topic(topic: ProjectTopicSchema, controller: Optional[BaseController]) -> Any:
+    def sentiment(sentiment: SentimentSchema) -> Any:
+        attrs = {"code": sentiment.code, "label": sentiment.label}
+        return _build_object(
+            ProjectDetail.TextToAnalyze.Topic.Sentiment,
+            attrs,
+            previous=dict(attrs),
+            controller=controller,
+        )
+
+    attrs = {
+        "label": topic.label,
+        "category": topic.category,
+        "color": topic.color,
+        "description": topic.description,
+        "sentiment_enabled": topic.sentiment_enabled,
+        "sentiment_neutral": sentiment(topic.sentiment_neutral),
+        "sentiment_negative": sentiment(topic.sentiment_negative),
+        "sentiment_positive": sentiment(topic.sentiment_positive),
+    }
+    previous = {
+        **attrs,
+        "sentiment_neutral": _snapshot(attrs["sentiment_neutral"]),
+        "sentiment_negative": _snapshot(attrs["sentiment_negative"]),
+        "sentiment_positive": _snapshot(attrs["sentiment_positive"]),
+    }
+    return _build_object(
+        ProjectDetail.TextToAnalyze.Topic,
+        attrs,
+        previous=previous,
+        controller=controller,
+        id=topic.id,
+    )
+
+
+def _project_column(column: ProjectColumnSchema, controller: Optional[BaseController]) -> Any:
+    attrs: Dict[str, Any] = {
+        "ref": column.ref,
+        "name": column.name,
+        "type": column.__struct_config__.tag,
+    }
+    if not isinstance(column, ProjectTextToAnalyzeSchema):
+        return _build_object(
+            ProjectDetail.Auxiliary, attrs, previous=dict(attrs), controller=controller
+        )
+
+    learns_from = column.metadata.learns_from
+    metadata_attrs = {
+        "reviewed_count": column.metadata.reviewed_count,
+        # note: parsed projects keep this as a plain dictionary, too
+        "learns_from": (
+            {"project": learns_from.project, "ref": learns_from.ref}
+            if learns_from is not None
+            else None
+        ),
+    }
+    metadata_previous = {
+        **metadata_attrs,
+        "learns_from": copy(metadata_attrs["learns_from"]),
+    }
+    topics = [_project_topic(topic, controller) for topic in column.topics]
+
+    attrs["description"] = column.description
+    attrs["topics"] = CaplenaList(values=topics)
+    attrs["metadata"] = _build_object(
+        ProjectDetail.TextToAnalyze.Metadata,
+        metadata_attrs,
+        previous=metadata_previous,
+        controller=controller,
+    )
+    previous = {**attrs, "topics": _snapshots(topics), "metadata": _snapshot(attrs["metadata"])}
+    return _build_object(
+        ProjectDetail.TextToAnalyze, attrs, previous=previous, controller=controller
+    )
+
+
+def build_listed_project(
+    project: ListedProjectSchema, controller: Optional[BaseController], metadata: Dict[str, Any]
+) -> ListedProject:
+    attrs = _listed_project_attrs(project)
+    return _build_object(  # type: ignore[no-any-return]
+        ListedProject,
+        attrs,
+        previous={**attrs, "tags": list(project.tags)},
+        controller=controller,
+        id=project.id,
+        metadata=metadata,
+    )
+
+
+def build_project_detail(
+    project: ProjectDetailSchema, controller: Optional[BaseController], metadata: Dict[str, Any]
+) -> ProjectDetail:
+    columns = [_project_column(column, controller) for column in project.columns]
+    attrs = _listed_project_attrs(project)
+    attrs["columns"] = CaplenaList(values=columns)
+    return _build_object(  # type: ignore[no-any-return]
+        ProjectDetail,
+        attrs,
+        previous={**attrs, "tags": list(project.tags), "columns": _snapshots(columns)},
+        controller=controller,
+        id=project.id,
+        metadata=metadata,
+    )
+
+
+TYPED_DECODERS: Dict[Type[Any], TypedDecoder[Any]] = {
+    Row: TypedDecoder(schema=RowSchema, build=build_row),
+    ListedProject: TypedDecoder(schema=ListedProjectSchema, build=build_listed_project),
+    ProjectDetail: TypedDecoder(schema=ProjectDetailSchema, build=build_project_detail),
+}
@@ -0,0 +1,207 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from caplena.constants import DEFAULT_MAX_WORKERS
+from caplena.datetime_codec import DEFAULT_DATETIME_CODEC
+from caplena.endpoints.projects_endpoint import Row
+from caplena.http.json_codec import JsonCodec
+
+Layout = Tuple[Tuple[str, str], ...]
+# note: the slots of a column are the fields it is exported with and their positions in a row
+Slots = Tuple[Tuple[str, int], ...]
+
+_ROW_FIELDS = ("id", "created", "last_modified")
+
+
+class RowExport:
+    """An export of the rows of a project. Pages are fetched concurrently by threads, and their raw
+    bodies are sent to a pool of worker processes, which decode them and convert their rows into
+    plain values without building any objects. The converted pages are yielded in order.
+
+    Rows are exported with the :code:`fields` of the project layout, named as by
+    :code:`Row.to_columnar`. Datetimes are parsed and topics are exported as dictionaries. Columns
+    that are not part of the layout are skipped, missing columns are filled with :code:`None`.
+
+    :param layout: The reference and type of every column of the project.
+    :param pages: The estimated number of pages to export, which are fetched concurrently. As rows may
+        be added in the meantime, pages after the last estimated page are fetched one by one, until
+        a page has no next page. As rows may also be removed, the export ends early at the first page
+        without a next page, or at the first page that is out of range.
+    :param fetch_page: Returns the raw body of the page with the given number, or :code:`None` if
+        the page is out of range.
+    :param processes: The number of worker processes, defaults to :code:`None`, meaning one per CPU.
+        With a single process, pages are converted in the calling process instead.
+    :param max_workers: The maximum number of pages fetched concurrently, defaults to :code:`8`.
+    """
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return _compile_layout(self._layout)[0]
+
+    def __init__(
+        self,
+        *,
+        layout: Sequence[Tuple[str, str]],
+        pages: int,
+        fetch_page: Callable[[int], Optional[bytes]],
+        processes: Optional[int] = None,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+    ):
+        if processes is not None and processes < 1:
+            raise ValueError(
+                f"Invalid number of processes {processes}. HINT: Please specify a positive number."
+            )
+        self._layout: Layout = tuple((ref, type) for ref, type in layout)
+        self._pages = pages
+        self._fetch_page = fetch_page
+        self._processes = processes or os.cpu_count() or 1
+        self._max_workers = max_workers
+
+    def iter_tuples(self) -> Iterator[List[Tuple[Any, ...]]]:
+        """Yields the rows page by page, every row as a tuple of the values of its fields."""
+        return self._iter_pages(columnar=False)
+
+    def iter_columnar(self) -> Iterator[Dict[str, List[Any]]]:
+        """Yields the rows page by page, every page as a columnar batch mapping fields to values."""
+        return self._iter_pages(columnar=True)
+
+    def _iter_pages(self, *, columnar: bool) -> Iterator[Any]:
+        pages = iter(range(1, self._pages + 1))
+        next_page = self._pages + 1
+        pool = self._build_pool()
+        converting: Deque["Future[Any]"] = deque()
+        try:
+            with ThreadPoolExecutor(max_workers=self._max_workers) as fetchers:
+                # note: at most max_workers pages are fetched and as many pages as there are
+                # processes converted ahead of the consumer, bounding the memory of the export.
+                fetching: Deque["Future[Optional[bytes]]"] = deque(
+                    fetchers.submit(self._fetch_page, page)
+                    for _, page in zip(range(self._max_workers), pages)
+                )
+                # note: at least the first page is fetched, even if no rows were estimated
+                if not fetching:
+                    fetching.append(fetchers.submit(self._fetch_page, next_page))
+                    next_page += 1
+                while fetching or converting:
+                    if fetching:
+                        content = fetching.popleft().result()
+                        if content is None:
+                            # note: rows were removed after the estimate, all further pages are
+                            # out of range as well. the pages before are still converted.
+                            pages = iter(())
+                            self._discard(fetching)
+                        else:
+                            page = next(pages, None)
+                            if page is not None:
+                                fetching.append(fetchers.submit(self._fetch_page, page))
+                            converting.append(self._convert(pool, content, columnar=columnar))
+                    if converting and (len(converting) > self._processes or not fetching):
+                        converted, size, has_next = converting.popleft().result()
+                        if not has_next:
+                            # note: the last page was reached before the estimated last page, any
+                            # further pages are either out of range or empty.
+                            pages = iter(())
+                            self._discard(fetching)
+                            self._discard(converting)
+                        elif not fetching and not converting:
+                            # note: rows added after the estimate are fetched page by page
+                            fetching.append(fetchers.submit(self._fetch_page, next_page))
+                            next_page += 1
+                        if size > 0:
+                            yield converted
+        finally:
+            # note: pages that are still queued are discarded if the export is not consumed
+            self._discard(converting)
+            if pool is not None:
+                pool.shutdown()
+
+    @staticmethod
+    def _discard(futures: "Deque[Future[Any]]") -> None:
+        # note: futures that are already running cannot be cancelled, their results are ignored
+        for future in futures:
+            future.cancel()
+        futures.clear()
+
+    def _build_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self._processes <= 1:
+            return None
+        # note: the workers are started while the fetcher threads are running, so they must not be
+        # forked from this process, which would inherit the state of the locks held by its threads.
+        method = (
+            "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        return ProcessPoolExecutor(self._processes, mp_context=multiprocessing.get_context(method))
+
+    def _convert(
+        self, pool: Optional[ProcessPoolExecutor], content: bytes, *, columnar: bool
+    ) -> "Future[Any]":
+        # note: only the raw page and the layout are sent to the workers, and only builtin values
+        # are returned, such that neither the controller nor any resources are pickled.
+        if pool is not None:
+            return pool.submit(_convert_page, content, self._layout, columnar)
+
+        future: "Future[Any]" = Future()
+        future.set_result(_convert_page(content, self._layout, columnar))
+        return future
+
+
+def _convert_page(content: bytes, layout: Layout, columnar: bool) -> Tuple[Any, int, bool]:
+    # note: besides the converted page, the number of rows and whether there is a next page
+    page = _json_codec().decode(content)
+    results = page["results"]
+    converted = _convert_results(results, layout, columnar)
+    return converted, len(results), page.get("next_url") is not None
+
+
+def _convert_results(results: List[Dict[str, Any]], layout: Layout, columnar: bool) -> Any:
+    fields, slots = _compile_layout(layout)
+    parse_datetime = DEFAULT_DATETIME_CODEC.parse
+    rows: List[Tuple[Any, ...]] = []
+    for obj in results:
+        values: List[Any] = [None] * len(fields)
+        values[0] = obj["id"]
+        values[1] = parse_datetime(obj["created"])
+        values[2] = parse_datetime(obj["last_modified"])
+        for column in obj["columns"]:
+            column_slots = slots.get(column["ref"])
+            if column_slots is None:
+                continue
+            for field, idx in column_slots:
+                value = column.get(field)
+                if value is not None and field == "value" and column["type"] == "date":
+                    value = parse_datetime(value)
+                values[idx] = value
+        rows.append(tuple(values))
+
+    if not columnar:
+        return rows
+    if not rows:
+        return {field: [] for field in fields}
+    return {field: list(values) for field, values in zip(fields, zip(*rows))}
+
+
+@lru_cache(maxsize=None)
+def _json_codec() -> JsonCodec:
+    # note: every worker process creates its own codec
+    return JsonCodec.default()
+
+
+@lru_cache(maxsize=64)
+def _compile_layout(layout: Layout) -> Tuple[Tuple[str, ...], Dict[str, Slots]]:
+    fields = list(_ROW_FIELDS)
+    slots: Dict[str, Slots] = {}
+    for ref, type in layout:
+        column_fields = ["value"]
+        if type == "text_to_analyze":
+            column_fields = sorted(Row.TextToAnalyzeColumn.__fields__ - {"ref", "type"})
+
+        column_slots = []
+        for field in column_fields:
+            column_slots.append((field, len(fields)))
+            fields.append(f"columns.{ref}" if field == "value" else f"columns.{ref}.{field}")
+        slots[ref] = tuple(column_slots)
+    return tuple(fields), slots
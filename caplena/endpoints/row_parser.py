@@ -0,0 +1,244 @@
+from copy import deepcopy
+from datetime import datetime
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from caplena.endpoints.projects_endpoint import ProjectDetail, ProjectsController, Row
+from caplena.flyweight import FlyweightTable
+from caplena.helpers import Helpers
+from caplena.lazy import LazyValue
+from caplena.list import CaplenaList
+
+ColumnBuilder = Callable[[Dict[str, Any], Optional[ProjectsController]], Row.Column]
+
+# note: the reference and type of every column, in the order of the columns of a row
+RowLayout = Tuple[Tuple[str, str], ...]
+
+_TEXT_TO_ANALYZE_FIELDS = (
+    "value",
+    "was_reviewed",
+    "sentiment_overall",
+    "source_language",
+    "translated_value",
+)
+
+
+class RowParser:
+    """Parses the rows of a single column layout. The column classes and their attributes are
+    resolved once from the layout, such that parsing a row builds its columns by position, without
+    dispatching on their types or copying their attributes. All rows are built by a parser, whether
+    they are retrieved by a controller, parsed generically or decoded using typed schemas.
+
+    :param project: The project identifier, defaults to :code:`None` for rows without a project.
+    :param layout: The reference and type of every column, in the order of the columns of a row.
+    :param flyweights: The flyweight table of the project, defaults to :code:`None`, meaning that
+        no values are interned and every column gets its own metadata.
+    """
+
+    @property
+    def project(self) -> Optional[str]:
+        return self._project
+
+    @property
+    def layout(self) -> RowLayout:
+        return self._layout
+
+    def __init__(
+        self,
+        *,
+        project: Optional[str] = None,
+        layout: Sequence[Tuple[str, str]],
+        flyweights: Optional[FlyweightTable] = None,
+    ):
+        self._project = project
+        self._flyweights = flyweights
+        if flyweights is not None:
+            layout = [(flyweights.intern(ref), flyweights.intern(type)) for ref, type in layout]
+        self._layout = tuple(layout)
+        self._parse_topics = partial(Row.TextToAnalyzeColumn._parse_topics, flyweights=flyweights)
+        self._builders = [self._compile(ref, type) for ref, type in self._layout]
+
+    @staticmethod
+    def layout_of(columns: List[Dict[str, Any]]) -> RowLayout:
+        """Returns the layout of the given columns, as received from the API."""
+        return tuple((column["ref"], column["type"]) for column in columns)
+
+    @classmethod
+    def from_project(
+        cls, project: ProjectDetail, *, flyweights: Optional[FlyweightTable] = None
+    ) -> "RowParser":
+        """Compiles a parser from the columns of the given project."""
+        return cls(
+            project=project.id,
+            layout=[(column.ref, column.type) for column in project.columns],
+            flyweights=flyweights,
+        )
+
+    @classmethod
+    def from_row(
+        cls,
+        project: Optional[str],
+        row: Dict[str, Any],
+        *,
+        flyweights: Optional[FlyweightTable] = None,
+    ) -> "RowParser":
+        """Compiles a parser from the columns of the given row, as received from the API."""
+        return cls(project=project, layout=cls.layout_of(row["columns"]), flyweights=flyweights)
+
+    def matches(self, columns: List[Dict[str, Any]]) -> bool:
+        """Returns whether the given columns, as received from the API, follow the layout."""
+        layout = self._layout
+        if len(columns) != len(layout):
+            return False
+        for column, (ref, type) in zip(columns, layout):
+            if column["ref"] != ref or column["type"] != type:
+                return False
+        return True
+
+    def parse(
+        self,
+        obj: Dict[str, Any],
+        *,
+        controller: Optional[ProjectsController],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Row:
+        """Builds an existing row from the given object, as received from the API. Its columns
+        must follow the layout of this parser, see :meth:`matches`.
+
+        :param obj: The row to parse.
+        :param controller: The controller of the row.
+        :param metadata: The metadata of the row, defaults to the metadata shared by all rows
+            of the project.
+        """
+        return self.build(
+            obj["id"],
+            created=LazyValue(obj["created"], Helpers.from_rfc3339_datetime),
+            last_modified=LazyValue(obj["last_modified"], Helpers.from_rfc3339_datetime),
+            columns=obj["columns"],
+            controller=controller,
+            metadata=metadata,
+        )
+
+    def build(
+        self,
+        id: str,
+        *,
+        created: Union[datetime, LazyValue[datetime]],
+        last_modified: Union[datetime, LazyValue[datetime]],
+        columns: List[Dict[str, Any]],
+        controller: Optional[ProjectsController],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Row:
+        """Builds an existing row from its already decoded timestamps and its columns, as received
+        from the API. Its columns must follow the layout of this parser.
+
+        :param id: The row identifier.
+        :param created: The time the row was created.
+        :param last_modified: The time the row was last modified.
+        :param columns: The columns of the row.
+        :param controller: The controller of the row.
+        :param metadata: The metadata of the row, defaults to the metadata shared by all rows
+            of the project.
+        """
+        built = self.build_columns(columns, controller=controller)
+        attrs = {
+            "created": created,
+            "last_modified": last_modified,
+            "columns": CaplenaList(values=built),
+        }
+        previous = {**attrs, "columns": CaplenaList(values=[_snapshot(c) for c in built])}
+
+        flyweights = self._flyweights
+        if flyweights is not None and (metadata is None or metadata == flyweights.metadata):
+            metadata = flyweights.metadata
+        row = Row.build_prepared(attrs, previous=previous, controller=controller, metadata=metadata)
+        row.__dict__["_id"] = id
+        row._flyweights = flyweights
+        return row
+
+    def build_columns(
+        self, columns: List[Dict[str, Any]], *, controller: Optional[ProjectsController]
+    ) -> List[Row.Column]:
+        """Builds the given columns, as received from the API, which must follow the layout of this
+        parser.
+
+        :param columns: The columns to build.
+        :param controller: The controller of the row the columns belong to.
+        """
+        return [build(column, controller) for build, column in zip(self._builders, columns)]
+
+    def _compile(self, ref: str, type: str) -> ColumnBuilder:
+        metadata = self._flyweights.column_metadata if self._flyweights is not None else None
+        if type == "text_to_analyze":
+            parse_topics = self._parse_topics
+
+            def build_text_to_analyze(
+                column: Dict[str, Any], controller: Optional[ProjectsController]
+            ) -> Row.Column:
+                attrs = {field: column[field] for field in _TEXT_TO_ANALYZE_FIELDS}
+                attrs["ref"] = ref
+                attrs["type"] = type
+                attrs["topics"] = LazyValue(column["topics"], parse_topics)
+                return Row.TextToAnalyzeColumn.build_prepared(
+                    attrs, previous=dict(attrs), controller=controller, metadata=metadata
+                )
+
+            return build_text_to_analyze
+
+        elif type == "date":
+
+            def build_date(
+                column: Dict[str, Any], controller: Optional[ProjectsController]
+            ) -> Row.Column:
+                value = column["value"]
+                if value is not None:
+                    value = LazyValue(value, Helpers.from_rfc3339_datetime)
+                attrs = {"ref": ref, "type": type, "value": value}
+                return Row.DateColumn.build_prepared(
+                    attrs, previous=dict(attrs), controller=controller, metadata=metadata
+                )
+
+            return build_date
+
+        elif type == "any":
+
+            def build_any(
+                column: Dict[str, Any], controller: Optional[ProjectsController]
+            ) -> Row.Column:
+                # note: values of any type might be mutable, so the row gets its own copy, which
+                # it may modify without changing the payload or the previous version
+                value = column["value"]
+                attrs = {"ref": ref, "type": type, "value": deepcopy(value)}
+                previous = {"ref": ref, "type": type, "value": value}
+                return Row.AnyColumn.build_prepared(
+                    attrs, previous=previous, controller=controller, metadata=metadata
+                )
+
+            return build_any
+
+        else:
+            cls = {
+                "numerical": Row.NumericalColumn,
+                "boolean": Row.BooleanColumn,
+                "text": Row.TextColumn,
+            }[type]
+
+            # note: values of these columns are immutable, so they can be shared with the
+            # previous version of the column.
+            def build(
+                column: Dict[str, Any], controller: Optional[ProjectsController]
+            ) -> Row.Column:
+                attrs = {"ref": ref, "type": type, "value": column["value"]}
+                return cls.build_prepared(
+                    attrs, previous=dict(attrs), controller=controller, metadata=metadata
+                )
+
+            return build
+
+
+def _snapshot(column: Row.Column) -> Row.Column:
+    # note: the previous attributes of a column are only ever replaced by their parsed values,
+    # such that they can be shared with its snapshot instead of being copied.
+    return type(column).build_prepared(
+        column._previous, previous={}, controller=None, metadata=column._metadata
+    )
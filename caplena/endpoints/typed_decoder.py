@@ -0,0 +1,68 @@
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+)
+
+import msgspec
+
+if TYPE_CHECKING:
+    from caplena.endpoints.base_endpoint import BaseController
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class Page(msgspec.Struct, Generic[T]):
+    results: List[T]
+    next_url: Optional[str]
+    count: int
+
+
+class TypedDecoder(Generic[R]):
+    """Decodes response bodies straight into resource objects. The schema of the response is
+    declared once as a struct, such that the body is validated and converted, including all
+    datetimes, while decoding, without building any intermediate dictionaries.
+
+    :param schema: The struct describing a single resource.
+    :param build: Builds the resource object from a decoded struct, given the controller
+        and the metadata of the object.
+    """
+
+    def __init__(
+        self,
+        *,
+        schema: Type[Any],
+        build: Callable[[Any, Optional["BaseController"], Dict[str, Any]], R],
+    ):
+        self._build = build
+        self._decoder: msgspec.json.Decoder[Any] = msgspec.json.Decoder(schema)
+        self._page_decoder: msgspec.json.Decoder[Page[Any]] = msgspec.json.Decoder(Page[schema])  # type: ignore[valid-type]
+
+    def decode(
+        self,
+        content: bytes,
+        *,
+        controller: Optional["BaseController"],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> R:
+        return self._build(self._decoder.decode(content), controller, metadata or {})
+
+    def decode_page(
+        self,
+        content: bytes,
+        *,
+        controller: Optional["BaseController"],
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> Tuple[List[R], bool, int]:
+        page = self._page_decoder.decode(content)
+        metadata = metadata or {}
+        results = [self._build(result, controller, metadata) for result in page.results]
+        return results, page.next_url is not None, page.count
@@ -1,13 +1,116 @@
-from datetime import datetime
+import operator
+import re
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Optional, Sequence, Tuple
 
 from typing_extensions import Literal
 
 from caplena.api import ApiFilter, ZeroOrMany
+from caplena.api.api_filter import CompiledLiteral
+from caplena.helpers import Helpers
 
 DateRange = Literal[
     "all_time", "this_month", "last_month", "this_quarter", "last_quarter", "this_year", "last_year"
 ]
 
+ValueTest = Callable[[Any], bool]
+
+_COMPARISONS: Dict[str, Callable[[Any, Any], bool]] = {
+    "gte": operator.ge,
+    "gt": operator.gt,
+    "lte": operator.le,
+    "lt": operator.lt,
+}
+_RANGE_MONTHS = {"month": 1, "quarter": 3, "year": 12}
+_COLUMN_MODIFIER = re.compile(r"^(?P<ref>.+)\[(?P<type>[a-z_]+)\](?:\.(?P<lookup>.+))?$")
+
+
+def _to_aware_datetime(value: Any) -> datetime:
+    dt = Helpers.from_rfc3339_datetime(value) if isinstance(value, str) else value
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def _month_start(month_index: int) -> datetime:
+    return datetime(month_index // 12, month_index % 12 + 1, 1, tzinfo=timezone.utc)
+
+
+def _date_range_bounds(
+    date_range: str, now: datetime
+) -> Tuple[Optional[datetime], Optional[datetime]]:
+    if date_range == "all_time":
+        return None, None
+
+    relative, unit = date_range.split("_")
+    span = _RANGE_MONTHS[unit]
+    month_index = now.year * 12 + now.month - 1
+    start = month_index - month_index % span
+    if relative == "last":
+        start -= span
+    return _month_start(start), _month_start(start + span)
+
+
+def _build_comparison_test(
+    lookup: str, values: Sequence[Any], transform: Callable[[Any], Any] = lambda v: v
+) -> ValueTest:
+    # note: the disjunction of multiple bounds is equivalent to the least restrictive bound
+    bounds = [transform(value) for value in values]
+    bound = min(bounds) if lookup in ("gte", "gt") else max(bounds)
+    compare = _COMPARISONS[lookup]
+    return lambda value: value is not None and compare(transform(value), bound)
+
+
+def _build_value_test(lookup: Optional[str], values: Sequence[Any]) -> ValueTest:
+    if lookup is None:
+        allowed = set(values)
+        return lambda value: value in allowed
+    elif lookup == "exact.i":
+        allowed = {str(value).casefold() for value in values}
+        return lambda value: value is not None and value.casefold() in allowed
+    elif lookup == "contains.i":
+        parts = [str(value).casefold() for value in values]
+        return lambda value: value is not None and any(part in value.casefold() for part in parts)
+    elif lookup in _COMPARISONS:
+        return _build_comparison_test(lookup, values)
+    else:
+        raise ValueError(f"Unsupported filter lookup `{lookup}`.")
+
+
+def _build_date_test(lookup: Optional[str], values: Sequence[Any]) -> ValueTest:
+    if lookup in _COMPARISONS:
+        return _build_comparison_test(lookup, values, transform=_to_aware_datetime)
+    elif lookup == "range":
+        now = datetime.now(timezone.utc)
+        bounds = [_date_range_bounds(date_range, now) for date_range in values]
+
+        def test(value: Any) -> bool:
+            if value is None:
+                return False
+            dt = _to_aware_datetime(value)
+            return any(
+                (start is None or start <= dt) and (end is None or dt < end)
+                for start, end in bounds
+            )
+
+        return test
+    elif lookup is not None and lookup.split(".")[0] in ("year", "month", "day"):
+        part, _, part_lookup = lookup.partition(".")
+        part_test = _build_value_test(part_lookup or None, values)
+        return lambda value: value is not None and part_test(getattr(value, part))
+    else:
+        raise ValueError(f"Unsupported date filter lookup `{lookup}`.")
+
+
+def _column_getter(ref: str, attr: str) -> Callable[[Any], Any]:
+    def getter(row: Any) -> Any:
+        column = row.column(ref)
+        return getattr(column, attr) if column is not None else None
+
+    return getter
+
+
+def _compile_date_literal(name: str, modifier: str, values: Sequence[Any]) -> CompiledLiteral:
+    return name, operator.attrgetter(name), _build_date_test(modifier, values)
+
 
 class ProjectsFilter(ApiFilter):
     """The filter that can be used to filter projects.
@@ -16,6 +119,21 @@ class ProjectsFilter(ApiFilter):
     :param has_conjunction: The internal conjunction boolean. Should never be manually given.
     """
 
+    def compile_literal(self, name: str, modifier: str, values: Sequence[Any]) -> CompiledLiteral:
+        if name in ("created", "last_modified"):
+            return _compile_date_literal(name, modifier, values)
+        elif name == "name":
+            return name, operator.attrgetter(name), _build_value_test(modifier, values)
+        elif name == "owner" and modifier == "id":
+            return name, operator.attrgetter(name), _build_value_test(None, values)
+        elif name == "tags":
+            allowed = set(values)
+            return name, operator.attrgetter(name), lambda tags: not allowed.isdisjoint(tags or [])
+        elif name in ("upload_status", "language", "translation_status", "translation_engine"):
+            return name, operator.attrgetter(name), _build_value_test(None, values)
+        else:
+            return super().compile_literal(name, modifier, values)
+
     @classmethod
     def name(
         cls,
@@ -297,6 +415,28 @@ class RowsFilter(ApiFilter):
     :param has_conjunction: The internal conjunction boolean. Should never be manually given.
     """
 
+    def compile_literal(self, name: str, modifier: str, values: Sequence[Any]) -> CompiledLiteral:
+        if name in ("created", "last_modified"):
+            return _compile_date_literal(name, modifier, values)
+
+        match = _COLUMN_MODIFIER.match(modifier) if name == "columns" else None
+        if match is None:
+            return super().compile_literal(name, modifier, values)
+
+        ref, column_type, lookup = match.group("ref", "type", "lookup")
+        attr = "value"
+        if column_type == "text_to_analyze" and lookup in ("was_reviewed", "source_language"):
+            attr, lookup = lookup, None
+        elif column_type == "text_to_analyze" and lookup and lookup.startswith("translated_value."):
+            attr, lookup = "translated_value", lookup[len("translated_value.") :]
+
+        field = f"columns.{ref}" if attr == "value" else f"columns.{ref}.{attr}"
+        if column_type == "date":
+            test = _build_date_test(lookup, values)
+        else:
+            test = _build_value_test(lookup, values)
+        return field, _column_getter(ref, attr), test
+
     class Columns:
         """Allows filtering rows based on the values of its columns."""
 
@@ -0,0 +1,215 @@
+import threading
+from collections import OrderedDict
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Hashable,
+    NoReturn,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
+
+T = TypeVar("T")
+TopicKey = Tuple[Any, ...]
+
+
+class PositionIndex(Generic[T]):
+    """Maps keys to the positions of items within sequences sharing the same layout, such as the
+    columns of all rows of a project, such that a single index serves all of them. Positions are
+    verified on every lookup, and the index is rebuilt from the sequence at hand only if it has a
+    different layout, such that looking up missing keys never rebuilds the index.
+
+    :param key: Returns the key of an item.
+    """
+
+    def __init__(self, key: Callable[[T], Hashable]):
+        self._key = key
+        self._positions: Dict[Hashable, int] = {}
+
+    def find(self, items: Sequence[T], key: Hashable) -> Optional[T]:
+        """Returns the item with the given key, or :code:`None` if there is no such item.
+
+        :param items: The items to search.
+        :param key: The key of the item.
+        """
+        position = self._positions.get(key)
+        if position is not None and position < len(items):
+            item = items[position]
+            if self._key(item) == key:
+                return item
+        elif position is None and not any(self._key(item) == key for item in items):
+            # note: keys missing from both the index and the sequence don't change the layout
+            return None
+
+        # note: the index is replaced at once, such that concurrent lookups never see a partial one
+        positions: Dict[Hashable, int] = {}
+        for position, item in enumerate(items):
+            positions.setdefault(self._key(item), position)
+        self._positions = positions
+
+        position = positions.get(key)
+        return items[position] if position is not None else None
+
+
+class FrozenDict(Dict[str, Any]):
+    """A dictionary that cannot be modified, such that it can be shared by many objects."""
+
+    def _fail(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError(
+            "Shared metadata cannot be modified. HINT: Please assign a new dictionary instead."
+        )
+
+    def __setitem__(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def __delitem__(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def __ior__(self, *args: Any, **kwargs: Any) -> NoReturn:  # type: ignore[misc]
+        self._fail()
+
+    def clear(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def pop(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def popitem(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def setdefault(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def update(self, *args: Any, **kwargs: Any) -> NoReturn:
+        self._fail()
+
+    def __reduce__(self) -> Tuple[Any, Tuple[Dict[str, Any]]]:
+        return FrozenDict, (dict(self),)
+
+
+class FlyweightTable:
+    """Interns the values repeated across the rows of a project, such as column references, column
+    types, topic descriptors and metadata, such that thousands of rows share the same strings and
+    metadata instead of holding their own copies. Every column and topic keeps its own attributes,
+    as their changes are tracked per object. Interned values and shared metadata are immutable.
+
+    Tables are shared by all rows of a project retrieved by the same controller, such that rows of
+    different clients never share any values.
+
+    :param project: The project identifier.
+    :param maxsize: The maximum number of values and of topic descriptors to intern, defaults to
+        :code:`16384` each. Once full, the least recently used ones are forgotten.
+    """
+
+    DEFAULT_MAXSIZE: ClassVar[int] = 16384
+    TOPIC_DESCRIPTOR_FIELDS: ClassVar[Tuple[str, ...]] = (
+        "id",
+        "label",
+        "category",
+        "code",
+        "sentiment_label",
+    )
+
+    @property
+    def project(self) -> str:
+        return self._project
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        """The metadata shared by all rows of the project, which cannot be modified."""
+        return self._metadata
+
+    @property
+    def column_metadata(self) -> Dict[str, Any]:
+        """The metadata shared by all columns and topics of the rows of the project, which is empty
+        and cannot be modified.
+        """
+        return self._column_metadata
+
+    @property
+    def size(self) -> int:
+        """The number of interned values and topic descriptors."""
+        return len(self._values) + len(self._topics)
+
+    def __init__(self, project: str, *, maxsize: int = DEFAULT_MAXSIZE):
+        self._project = project
+        self._maxsize = maxsize
+        self._metadata: Dict[str, Any] = FrozenDict(project=project)
+        self._column_metadata: Dict[str, Any] = FrozenDict()
+        self._values: "OrderedDict[str, str]" = OrderedDict()
+        self._topics: "OrderedDict[TopicKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._indexes: Dict[str, PositionIndex[Any]] = {}
+
+    def intern(self, value: Any) -> Any:
+        """Returns the shared instance of the given string, other values are returned as they are.
+
+        :param value: The value to intern.
+        """
+        if type(value) is not str:
+            return value
+
+        with self._lock:
+            return self._remember(self._values, value, value)
+
+    def topic_descriptor(self, topic: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the shared descriptor of the given row topic, holding all of its immutable fields.
+
+        :param topic: The topic, either as received from the API or as already parsed attributes.
+        """
+        key = tuple(topic[field] for field in self.TOPIC_DESCRIPTOR_FIELDS)
+        with self._lock:
+            descriptor = self._topics.get(key)
+            if descriptor is not None:
+                self._topics.move_to_end(key)
+                return descriptor
+
+            values = (
+                self._remember(self._values, value, value) if type(value) is str else value
+                for value in key
+            )
+            descriptor = FrozenDict(zip(self.TOPIC_DESCRIPTOR_FIELDS, values))
+            self._remember(self._topics, key, descriptor)
+            return descriptor
+
+    def _remember(self, values: "OrderedDict[Any, Any]", key: Any, value: Any) -> Any:
+        # note: must be called holding the lock, as recently used values are moved to the end
+        remembered = values.get(key)
+        if remembered is not None:
+            values.move_to_end(key)
+            return remembered
+        values[key] = value
+        if len(values) > self._maxsize:
+            values.popitem(last=False)
+        return value
+
+    def topic(self, topic: Dict[str, Any]) -> Dict[str, Any]:
+        """Returns the given row topic as received from the API, with all of its values interned.
+
+        :param topic: The topic to intern.
+        """
+        return {**self.topic_descriptor(topic), "sentiment": self.intern(topic["sentiment"])}
+
+    def index(self, name: str, key: Callable[[T], Hashable]) -> PositionIndex[T]:
+        """Returns the position index with the given name, shared by all rows of the project.
+
+        :param name: The name of the index.
+        :param key: Returns the key of an item, only used if the index does not exist yet.
+        """
+        index = self._indexes.get(name)
+        if index is None:
+            index = self._indexes.setdefault(name, PositionIndex(key))
+        return index
+
+    def __reduce__(self) -> Tuple[Any, Tuple[str]]:
+        # note: pickled rows refer to a new table of their project instead of copying its values,
+        # rows pickled together share the same table once restored.
+        return FlyweightTable, (self._project,)
+
+    def __str__(self) -> str:
+        return f"FlyweightTable(project={self._project}, size={self.size})"
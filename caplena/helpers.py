@@ -6,6 +6,7 @@ from typing import Any, Dict, Iterable
 from urllib.parse import urlencode
 
 from caplena.constants import NOT_SET
+from caplena.datetime_codec import DEFAULT_DATETIME_CODEC
 from caplena.version import __version__
 
 
@@ -36,20 +37,11 @@ class Helpers:
 
     @staticmethod
     def from_rfc3339_datetime(value: str) -> datetime:
-        iso_8601 = value.replace("Z", "+00:00")
-        return datetime.fromisoformat(iso_8601)
+        return DEFAULT_DATETIME_CODEC.parse(value)
 
     @staticmethod
     def to_rfc3339_datetime(dt: datetime) -> str:
-        rfc3339 = dt.strftime("%Y-%m-%dT%H:%M:%S.")
-        rfc3339 += dt.strftime("%f")[:3]
-
-        tz = dt.strftime("%z")
-        if tz == "+0000":
-            tz = "Z"
-        elif tz != "":
-            tz = tz[:3] + ":" + tz[3:]
-        return rfc3339 + tz
+        return DEFAULT_DATETIME_CODEC.format(dt)
 
     @staticmethod
     def build_qualified_uri(
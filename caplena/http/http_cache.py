@@ -0,0 +1,302 @@
+import hashlib
+import json
+import os
+import re
+import tempfile
+import threading
+import time
+from typing import Any, ClassVar, Dict, FrozenSet, List, Optional, Pattern, Tuple
+from urllib.parse import urlsplit
+
+from cachetools import LRUCache
+
+from caplena.http.http_response import HttpResponse
+
+
+class HttpCacheEntry:
+    """A cached response, together with the validators required to revalidate it.
+
+    :param uri: The URI the response was received from.
+    :param response: The cached response.
+    :param etag: The entity tag the server returned for this response.
+    :param last_modified: The last modification date the server returned for this response.
+    :param expires_at: The unix timestamp until which the response may be used without
+        revalidating it, defaults to :code:`0`.
+    """
+
+    def __init__(
+        self,
+        *,
+        uri: str,
+        response: HttpResponse,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+        expires_at: float = 0,
+    ):
+        self.uri = uri
+        self.response = response
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+    @property
+    def path(self) -> str:
+        return urlsplit(self.uri).path
+
+    @property
+    def is_revalidatable(self) -> bool:
+        return self.etag is not None or self.last_modified is not None
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.expires_at
+
+    def build_conditional_headers(self) -> Dict[str, str]:
+        headers: Dict[str, str] = {}
+        if self.etag is not None:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified is not None:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def build_response(self) -> HttpResponse:
+        """Returns a new response with the cached body. Every request using the cache gets its own
+        response, such that decoded bodies are never shared between callers. The body is therefore
+        decoded again by every caller, which is about as expensive as copying a decoded body.
+        """
+        return self.response.copy()
+
+    def to_metadata(self) -> Dict[str, Any]:
+        return {
+            "uri": self.uri,
+            "status_code": self.response.status_code,
+            "reason": self.response.reason,
+            "headers": self.response.headers,
+            "has_body": self.response.content is not None,
+            "etag": self.etag,
+            "last_modified": self.last_modified,
+            "expires_at": self.expires_at,
+        }
+
+    def to_body(self) -> bytes:
+        content = self.response.content
+        return content if content is not None else b""
+
+    @classmethod
+    def from_metadata(cls, metadata: Dict[str, Any], body: bytes) -> "HttpCacheEntry":
+        response = HttpResponse(
+            status_code=metadata["status_code"],
+            reason=metadata["reason"],
+            content=body if metadata["has_body"] else None,
+            headers=metadata["headers"],
+        )
+        return cls(
+            uri=metadata["uri"],
+            response=response,
+            etag=metadata["etag"],
+            last_modified=metadata["last_modified"],
+            expires_at=metadata["expires_at"],
+        )
+
+
+class HttpCache:
+    """Base class for caches storing the responses of GET requests. Cached responses are
+    revalidated using conditional requests, so that unchanged resources are not transferred
+    again. Every request is given its own response, decoded from the cached body, as copying a
+    decoded body costs about as much as decoding it. Use an :code:`ObjectCache` to skip
+    the requests altogether. Successful write requests invalidate all cached responses of the
+    written resource, its parent resources and its child resources.
+
+    :param ttls: Number of seconds a cached response may be used without revalidating it, keyed
+        by path pattern, e.g. :code:`{"/projects/{id}": 30, "/projects/{id}/rows": 5}`.
+    :param default_ttl: Number of seconds a cached response may be used without revalidating it,
+        if none of the path patterns match, defaults to :code:`0`.
+    """
+
+    IGNORED_HEADERS: ClassVar[FrozenSet[str]] = frozenset(
+        {"user-agent", "if-none-match", "if-modified-since"}
+    )
+
+    def __init__(self, *, ttls: Optional[Dict[str, float]] = None, default_ttl: float = 0):
+        self.default_ttl = default_ttl
+        self._ttls: List[Tuple[Pattern[str], float]] = [
+            (self._compile_path_pattern(pattern), ttl)
+            for pattern, ttl in (ttls if ttls is not None else {}).items()
+        ]
+
+    def build_key(self, *, uri: str, headers: Dict[str, str]) -> str:
+        # note: the key includes the api key header, so that responses are never shared between
+        # different API keys. hashing the key ensures that no credentials are stored in plain text.
+        relevant = sorted(
+            (name.lower(), value)
+            for name, value in headers.items()
+            if name.lower() not in self.IGNORED_HEADERS
+        )
+        raw_key = "\n".join([uri] + [f"{name}:{value}" for name, value in relevant])
+        return hashlib.sha256(raw_key.encode("utf-8")).hexdigest()
+
+    def build_entry(self, *, uri: str, response: HttpResponse) -> HttpCacheEntry:
+        ttl = self.get_ttl(uri)
+        return HttpCacheEntry(
+            uri=uri,
+            response=response,
+            etag=response.get_header("ETag"),
+            last_modified=response.get_header("Last-Modified"),
+            expires_at=time.time() + ttl if ttl > 0 else 0,
+        )
+
+    def get_ttl(self, uri: str) -> float:
+        path = urlsplit(uri).path
+        for pattern, ttl in self._ttls:
+            if pattern.search(path):
+                return ttl
+        return self.default_ttl
+
+    @staticmethod
+    def is_affected(cached_path: str, written_path: str) -> bool:
+        cached_path = cached_path.rstrip("/")
+        written_path = written_path.rstrip("/")
+        return (
+            cached_path == written_path
+            or cached_path.startswith(written_path + "/")  # noqa: W503
+            or written_path.startswith(cached_path + "/")  # noqa: W503
+        )
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        raise NotImplementedError("HttpCache subclasses must implement `get`.")
+
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        raise NotImplementedError("HttpCache subclasses must implement `set`.")
+
+    def delete(self, key: str) -> None:
+        raise NotImplementedError("HttpCache subclasses must implement `delete`.")
+
+    def invalidate(self, uri: str) -> None:
+        raise NotImplementedError("HttpCache subclasses must implement `invalidate`.")
+
+    def clear(self) -> None:
+        raise NotImplementedError("HttpCache subclasses must implement `clear`.")
+
+    @staticmethod
+    def _compile_path_pattern(pattern: str) -> Pattern[str]:
+        parts = re.split(r"{[^}]*}", pattern.rstrip("/"))
+        return re.compile("[^/]+".join(re.escape(part) for part in parts) + "/?$")
+
+
+class InMemoryHttpCache(HttpCache):
+    """An in-memory cache, evicting the least recently used responses once full. Cached
+    responses keep their raw body, which is decoded for every request using it.
+
+    :param maxsize: The maximum number of responses to keep, defaults to :code:`256`.
+    """
+
+    DEFAULT_MAXSIZE: ClassVar[int] = 256
+
+    def __init__(
+        self,
+        *,
+        maxsize: int = DEFAULT_MAXSIZE,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl)
+        self._entries: "LRUCache[str, HttpCacheEntry]" = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        with self._lock:
+            return self._entries.get(key)
+
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self, uri: str) -> None:
+        path = urlsplit(uri).path
+        with self._lock:
+            for key, entry in list(self._entries.items()):
+                if self.is_affected(entry.path, path):
+                    del self._entries[key]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class FileHttpCache(HttpCache):
+    """An on-disk cache, storing every response in a separate file within the given directory.
+    Please note that cached responses contain your project data in plain text.
+
+    :param directory: The directory to store the cached responses in. Created if it does not exist.
+    """
+
+    FILE_SUFFIX: ClassVar[str] = ".response"
+
+    def __init__(
+        self,
+        *,
+        directory: str,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        try:
+            with open(self._build_path(key), "rb") as file:
+                metadata = json.loads(file.readline())
+                body = file.read()
+        except (OSError, ValueError):
+            return None
+
+        return HttpCacheEntry.from_metadata(metadata, body)
+
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        # note: we write to a temporary file first, so that readers never observe partial writes
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(json.dumps(entry.to_metadata()).encode("utf-8") + b"\n")
+                file.write(entry.to_body())
+            os.replace(tmp_path, self._build_path(key))
+        except OSError:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._build_path(key))
+        except FileNotFoundError:
+            pass
+
+    def invalidate(self, uri: str) -> None:
+        path = urlsplit(uri).path
+        for key in self._list_keys():
+            try:
+                with open(self._build_path(key), "rb") as file:
+                    metadata = json.loads(file.readline())
+            except (OSError, ValueError):
+                continue
+            if self.is_affected(urlsplit(metadata["uri"]).path, path):
+                self.delete(key)
+
+    def clear(self) -> None:
+        for key in self._list_keys():
+            self.delete(key)
+
+    def _list_keys(self) -> List[str]:
+        return [
+            filename[: -len(self.FILE_SUFFIX)]
+            for filename in os.listdir(self.directory)
+            if filename.endswith(self.FILE_SUFFIX)
+        ]
+
+    def _build_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + self.FILE_SUFFIX)
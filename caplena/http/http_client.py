@@ -1,13 +1,16 @@
+import copy
 from enum import Enum
-from json import dumps
-from typing import Any, ClassVar, Dict, List, Optional, Sequence, Type, Union
+from typing import Any, Callable, ClassVar, Dict, List, Optional, Sequence, Type, Union
 
 import backoff
 
+from caplena.http.http_cache import HttpCache
 from caplena.http.http_response import HttpResponse
+from caplena.http.json_codec import JsonCodec
 from caplena.http.json_encoder import JsonDateEncoder
+from caplena.http.single_flight import SingleFlight
 from caplena.logging.default_logger import DefaultLogger
-from caplena.logging.logger import Logger
+from caplena.logging.logger import Logger, LoggingLevel
 
 
 class HttpMethod(Enum):
@@ -27,20 +30,53 @@ class HttpMethod(Enum):
 
 
 class HttpRetry:
+    """The retry policy of an HTTP client. Policies are immutable, such that a single policy can
+    safely be shared by multiple clients and threads.
+
+    :param max_retries: The maximum number of times a request is retried, defaults to :code:`5`.
+    :param backoff_factor: The backoff factor to apply between attempts, defaults to :code:`2`.
+    """
+
     DEFAULT_MAX_RETRIES: ClassVar[int] = 5
     DEFAULT_BACKOFF_FACTOR: ClassVar[float] = 2
 
+    __slots__ = ("_max_retries", "_backoff_factor")
+
+    @property
+    def max_retries(self) -> int:
+        return self._max_retries
+
+    @property
+    def backoff_factor(self) -> float:
+        return self._backoff_factor
+
     def __init__(
         self,
         *,
         max_retries: int = DEFAULT_MAX_RETRIES,
         backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
     ):
-        self.max_retries = max_retries
-        self.backoff_factor = backoff_factor
+        self._max_retries = max_retries
+        self._backoff_factor = backoff_factor
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, HttpRetry):
+            return NotImplemented
+        return (self.max_retries, self.backoff_factor) == (other.max_retries, other.backoff_factor)
+
+    def __hash__(self) -> int:
+        return hash((self.max_retries, self.backoff_factor))
+
+    def __repr__(self) -> str:
+        return f"HttpRetry(max_retries={self.max_retries}, backoff_factor={self.backoff_factor})"
 
 
 class HttpClient:
+    """Base class for sending requests to the Caplena API. Clients may be shared by multiple threads.
+    Their timeout and retry policy are fixed once they are created, :code:`with_options` returns a
+    differently configured copy instead.
+    """
+
     DEFAULT_TIMEOUT: ClassVar[int] = 120
     DEFAULT_RETRY: ClassVar[HttpRetry] = HttpRetry()
     DEFAULT_LOGGER: ClassVar[Logger] = DefaultLogger("http[shared]")
@@ -51,6 +87,14 @@ class HttpClient:
     def identifier(self) -> str:
         raise NotImplementedError("HttpClient subclasses must provide a `identifier` property.")
 
+    @property
+    def timeout(self) -> int:
+        return self._timeout
+
+    @property
+    def retry(self) -> HttpRetry:
+        return self._retry
+
     def __init__(
         self,
         *,
@@ -58,11 +102,46 @@ class HttpClient:
         retry: HttpRetry = DEFAULT_RETRY,
         logger: Logger = DEFAULT_LOGGER,
         encoder: JsonDateEncoder = DEFAULT_ENCODER,
+        cache: Optional[HttpCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        json_codec: Optional[JsonCodec] = None,
     ):
-        self.timeout = timeout
-        self.retry = retry
+        self._timeout = timeout
+        self._retry = retry
         self.logger = logger
         self.encoder = encoder
+        self.cache = cache
+        self.single_flight = single_flight
+        self.json_codec = json_codec if json_codec is not None else JsonCodec.default()
+
+    def with_options(
+        self,
+        *,
+        timeout: Optional[int] = None,
+        retry: Optional[HttpRetry] = None,
+        logger: Optional[Logger] = None,
+        cache: Optional[HttpCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        json_codec: Optional[JsonCodec] = None,
+    ) -> "HttpClient":
+        """Returns a copy of this client using the given options, this client remains unchanged.
+        Options that are not given are taken from this client. The copy shares the connections of
+        this client.
+        """
+        client = copy.copy(self)
+        if timeout is not None:
+            client._timeout = timeout
+        if retry is not None:
+            client._retry = retry
+        if logger is not None:
+            client.logger = logger
+        if cache is not None:
+            client.cache = cache
+        if single_flight is not None:
+            client.single_flight = single_flight
+        if json_codec is not None:
+            client.json_codec = json_codec
+        return client
 
     def request(
         self,
@@ -82,8 +161,9 @@ class HttpClient:
         req_headers: Dict[str, str] = headers if headers is not None else {}
         if json is not None:
             req_headers["content-type"] = "application/json"
-            data = dumps(json, cls=JsonDateEncoder)
-            self.logger.debug("Sending request to Caplena API", data=data)
+            data = self.json_codec.encode(json)
+            if self.logger.is_enabled_for(LoggingLevel.DEBUG):
+                self.logger.debug("Sending request to Caplena API", data=data.decode("utf-8"))
 
         @backoff.on_exception(
             backoff.expo,
@@ -93,20 +173,77 @@ class HttpClient:
             jitter=backoff.full_jitter,
         )
         def _do_request() -> HttpResponse:
-            return self.request_raw(
+            response = self.request_raw(
                 uri=uri,
                 method=method,
                 timeout=req_timeout,
                 headers=req_headers,
                 data=data,
             )
+            # note: the codec is set before the response is cached or handed to coalesced requests
+            response.json_codec = self.json_codec
+            return response
 
-        response = _do_request()
-        self.logger.debug(
-            "Received response from server",
-            status_code=str(response.status_code),
-            text=str(response.text),
-        )
+        def _do_get() -> HttpResponse:
+            if self.cache is None:
+                return _do_request()
+            response = self._request_cached(
+                uri, cache=self.cache, headers=req_headers, do_request=_do_request
+            )
+            # note: responses built from the cache are new, but might have been stored by another client
+            response.json_codec = self.json_codec
+            return response
+
+        if method == HttpMethod.GET and self.single_flight is not None:
+            # note: the key includes all headers, such that requests with different api keys
+            # are never coalesced.
+            key = (uri, tuple(sorted(req_headers.items())))
+            response = self.single_flight.do(key, _do_get)
+        elif method == HttpMethod.GET:
+            response = _do_get()
+        else:
+            response = _do_request()
+            if self.cache is not None and response.status_code < 400:
+                self.cache.invalidate(uri)
+        # note: formatting the response body is expensive for large responses, such that
+        # we only do so if the message is logged.
+        if self.logger.is_enabled_for(LoggingLevel.DEBUG):
+            self.logger.debug(
+                "Received response from server",
+                status_code=str(response.status_code),
+                text=str(response.text),
+            )
+
+        return response
+
+    def _request_cached(
+        self,
+        uri: str,
+        *,
+        cache: HttpCache,
+        headers: Dict[str, str],
+        do_request: Callable[[], HttpResponse],
+    ) -> HttpResponse:
+        key = cache.build_key(uri=uri, headers=headers)
+        entry = cache.get(key)
+        if entry is not None and entry.is_fresh:
+            self.logger.info("Using cached response", uri=uri)
+            return entry.build_response()
+        elif entry is not None:
+            headers.update(entry.build_conditional_headers())
+
+        response = do_request()
+        if response.status_code == 304 and entry is not None:
+            self.logger.info("Resource not modified, reusing cached response", uri=uri)
+            # note: entries might be shared by threads, so a renewed entry replaces the old one
+            cache.set(key, cache.build_entry(uri=uri, response=entry.response))
+            return entry.build_response()
+        elif response.status_code == 200:
+            new_entry = cache.build_entry(uri=uri, response=response)
+            if new_entry.is_revalidatable or new_entry.is_fresh:
+                cache.set(key, new_entry)
+            elif entry is not None:
+                cache.delete(key)
 
         return response
 
@@ -117,7 +254,7 @@ class HttpClient:
         method: HttpMethod,
         timeout: int,
         headers: Dict[str, str],
-        data: Optional[str] = None,
+        data: Optional[bytes] = None,
     ) -> HttpResponse:
         raise NotImplementedError("HttpClient subclasses must implement `request_raw`.")
 
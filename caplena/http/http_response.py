@@ -1,16 +1,42 @@
-import json
-from typing import Any, Dict, Optional
+from typing import Any, ClassVar, Dict, Optional
+
+from caplena.http.json_codec import JsonCodec, StdlibJsonCodec
 
 
 class HttpResponse:
+    """A response received from the server. The body is kept as the raw bytes received, such that
+    JSON bodies are decoded straight from them without creating an intermediate string.
+
+    :param status_code: The HTTP status code.
+    :param reason: The HTTP reason phrase.
+    :param content: The raw body, defaults to :code:`None`, meaning that the response has no body.
+    :param text: The body as a string, can be given instead of :code:`content`.
+    :param headers: The response headers.
+    :param json_codec: The codec used to decode the body, defaults to the standard library.
+    """
+
+    DEFAULT_JSON_CODEC: ClassVar[JsonCodec] = StdlibJsonCodec()
+
     _json: Optional[Dict[str, Any]]
+    _text: Optional[str]
+
+    @property
+    def content(self) -> Optional[bytes]:
+        return self._content
+
+    @property
+    def text(self) -> Optional[str]:
+        # note: the body is only decoded to a string when requested, e.g. for logging.
+        if not hasattr(self, "_text"):
+            self._text = self._content.decode("utf-8") if self._content is not None else None
+        return self._text
 
     @property
     def json(self) -> Optional[Dict[str, Any]]:
         if hasattr(self, "_json"):
             return self._json
-        elif self.text:
-            self._json = json.loads(self.text)
+        elif self._content:
+            self._json = self.json_codec.decode(self._content)
             return self._json
         else:
             return None
@@ -20,16 +46,52 @@ class HttpResponse:
         *,
         status_code: int,
         reason: str,
+        content: Optional[bytes] = None,
         text: Optional[str] = None,
         headers: Optional[Dict[str, str]] = None,
+        json_codec: JsonCodec = DEFAULT_JSON_CODEC,
     ):
+        if content is not None and text is not None:
+            raise ValueError("Please specify either the `content` or the `text` of the response.")
+
         self.status_code = status_code
         self.reason = reason
-        self.text = text
         self.headers = headers
+        self.json_codec = json_codec
+        if text is not None:
+            self._text = text
+            self._content: Optional[bytes] = text.encode("utf-8")
+        else:
+            self._content = content
 
-    def __str__(self) -> str:
-        concat_text = (
-            self.text[:50] + "..." if self.text and len(self.text) > 50 else str(self.text)
+    def copy(self) -> "HttpResponse":
+        """Returns a new response sharing the raw body of this response. The body is decoded
+        separately by the new response, such that decoded bodies are never shared.
+        """
+        return HttpResponse(
+            status_code=self.status_code,
+            reason=self.reason,
+            content=self._content,
+            headers=dict(self.headers) if self.headers is not None else None,
+            json_codec=self.json_codec,
         )
+
+    def get_header(self, name: str) -> Optional[str]:
+        """Returns the value of the given response header, matched case-insensitively."""
+        if self.headers is None:
+            return None
+
+        name = name.lower()
+        for header, value in self.headers.items():
+            if header.lower() == name:
+                return value
+        return None
+
+    def __str__(self) -> str:
+        # note: only the beginning of the body is decoded, such that printing large responses is cheap.
+        content = self._content
+        if content is not None and len(content) > 50:
+            concat_text = content[:50].decode("utf-8", errors="ignore") + "..."
+        else:
+            concat_text = str(self.text)
         return f"HttpResponse(status_code={self.status_code}, reason='{self.reason}', text='{concat_text}')"
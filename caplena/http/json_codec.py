@@ -0,0 +1,141 @@
+import json
+from datetime import datetime
+from typing import Any
+
+from caplena.datetime_codec import DEFAULT_DATETIME_CODEC
+from caplena.helpers import Helpers
+from caplena.http.json_encoder import JsonDateEncoder
+
+
+class JsonCodec:
+    """Base class for encoding request bodies and decoding response bodies. Datetimes are
+    encoded as RFC3339 strings with millisecond precision. All codecs encode the same object to
+    the same bytes, i.e. compact and without escaping non-ASCII characters.
+    """
+
+    @property
+    def identifier(self) -> str:
+        raise NotImplementedError("JsonCodec subclasses must provide a `identifier` property.")
+
+    def encode(self, obj: Any) -> bytes:
+        raise NotImplementedError("JsonCodec subclasses must implement `encode`.")
+
+    def decode(self, data: bytes) -> Any:
+        raise NotImplementedError("JsonCodec subclasses must implement `decode`.")
+
+    @staticmethod
+    def default() -> "JsonCodec":
+        """Returns the fastest codec available, using orjson or msgspec if installed and
+        falling back to the standard library otherwise.
+        """
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            pass
+        try:
+            return MsgspecCodec()
+        except ImportError:
+            pass
+        return StdlibJsonCodec()
+
+
+class StdlibJsonCodec(JsonCodec):
+    @property
+    def identifier(self) -> str:
+        return "json"
+
+    def __init__(self) -> None:
+        # note: separators and escaping match the output of orjson and msgspec
+        self._encoder = JsonDateEncoder(separators=(",", ":"), ensure_ascii=False)
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return json.loads(data)
+
+
+class OrjsonCodec(JsonCodec):
+    """Codec using `orjson <https://github.com/ijl/orjson>`_.
+
+    :raises ImportError: If orjson is not installed.
+    """
+
+    @property
+    def identifier(self) -> str:
+        return f"orjson({self._orjson.__version__})"
+
+    def __init__(self) -> None:
+        import orjson
+
+        self._orjson = orjson
+        # note: orjson encodes datetimes with microsecond precision. datetimes are passed through
+        # instead, such that they are encoded in the same format as by all other codecs.
+        self._option = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def encode(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj, default=self._encode_default, option=self._option)
+
+    def decode(self, data: bytes) -> Any:
+        return self._orjson.loads(data)
+
+    @staticmethod
+    def _encode_default(obj: Any) -> Any:
+        if isinstance(obj, datetime):
+            return Helpers.to_rfc3339_datetime(obj)
+        raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class MsgspecCodec(JsonCodec):
+    """Codec using `msgspec <https://jcristharif.com/msgspec/>`_.
+
+    :raises ImportError: If msgspec is not installed.
+    """
+
+    @property
+    def identifier(self) -> str:
+        return f"msgspec({self._msgspec.__version__})"
+
+    def __init__(self) -> None:
+        import msgspec
+
+        self._msgspec = msgspec
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def encode(self, obj: Any) -> bytes:
+        return self._encoder.encode(_format_datetimes(obj))
+
+    def decode(self, data: bytes) -> Any:
+        return self._decoder.decode(data)
+
+
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+
+def _format_datetimes(obj: Any) -> Any:
+    # note: msgspec always encodes datetimes natively with microsecond precision and never calls
+    # its enc_hook for them. they are therefore formatted in a pass over the payload beforehand,
+    # which copies every dict and list. for a bulk upload with one datetime per row, encoding is
+    # then about as fast as with the standard library, two to three times slower than with
+    # orjson and an order of magnitude slower than msgspec's native format,
+    # see benchmarks/bench_json_codecs.py.
+    obj_type = type(obj)
+    if obj_type in _SCALAR_TYPES:
+        return obj
+    elif obj_type is dict:
+        return {
+            key: value if type(value) in _SCALAR_TYPES else _format_datetimes(value)
+            for key, value in obj.items()
+        }
+    elif obj_type is list or obj_type is tuple:
+        return [
+            value if type(value) in _SCALAR_TYPES else _format_datetimes(value) for value in obj
+        ]
+    elif isinstance(obj, datetime):
+        return DEFAULT_DATETIME_CODEC.format(obj)
+    elif isinstance(obj, dict):
+        return {key: _format_datetimes(value) for key, value in obj.items()}
+    elif isinstance(obj, (list, tuple)):
+        return [_format_datetimes(value) for value in obj]
+    return obj
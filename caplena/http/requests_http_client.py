@@ -1,28 +1,75 @@
+import threading
 from typing import Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 from requests.sessions import Session
 
 from caplena.http.http_client import HttpClient, HttpMethod, HttpRetry
 from caplena.http.http_response import HttpResponse
+from caplena.http.json_codec import JsonCodec
 
 
 class RequestsHttpClient(HttpClient):
+    """HTTP client using `requests <https://requests.readthedocs.io>`_. As sessions are not
+    thread-safe, every thread sends its requests using its own session. The connections are pooled
+    by a single adapter shared by all threads and copies of this client.
+
+    :param timeout: The maximum number of seconds before a request times out, defaults to :code:`120`.
+    :param retry: The retry policy of this client.
+    :param session: The session used to send all requests, defaults to :code:`None`, meaning that
+        every thread uses its own session. A given session is shared by all threads.
+    :param pool_maxsize: The maximum number of connections kept open, defaults to :code:`64`.
+    :param json_codec: The codec used to encode request bodies and decode response bodies.
+    """
+
     RETRYABLE_EXCEPTIONS = (requests.exceptions.RequestException,)
+    DEFAULT_POOL_MAXSIZE = 64
 
     @property
     def identifier(self) -> str:
         return f"requests({requests.__version__})"
 
+    @property
+    def session(self) -> Session:
+        """The session used by the calling thread."""
+        if self._session is not None:
+            return self._session
+
+        session: Optional[Session] = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = self.build_session(adapter=self._adapter)
+        return session
+
     def __init__(
         self,
         *,
         timeout: int = HttpClient.DEFAULT_TIMEOUT,
         retry: HttpRetry = HttpClient.DEFAULT_RETRY,
         session: Optional[Session] = None,
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+        json_codec: Optional[JsonCodec] = None,
     ):
-        super().__init__(timeout=timeout, retry=retry)
-        self.session = session if session is not None else Session()
+        super().__init__(timeout=timeout, retry=retry, json_codec=json_codec)
+        self._session = session
+        self._local = threading.local()
+        # note: the connection pool must be at least as large as the number of concurrent
+        # requests, otherwise connections are discarded instead of being reused.
+        self._adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+
+    @staticmethod
+    def build_session(
+        pool_maxsize: int = DEFAULT_POOL_MAXSIZE, *, adapter: Optional[HTTPAdapter] = None
+    ) -> Session:
+        """Builds a session sending its requests using the given adapter, defaults to an adapter
+        with its own connection pool of the given size.
+        """
+        if adapter is None:
+            adapter = HTTPAdapter(pool_connections=pool_maxsize, pool_maxsize=pool_maxsize)
+        session = Session()
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        return session
 
     def request_raw(
         self,
@@ -31,7 +78,7 @@ class RequestsHttpClient(HttpClient):
         method: HttpMethod,
         timeout: int,
         headers: Dict[str, str],
-        data: Optional[str] = None,
+        data: Optional[bytes] = None,
     ) -> HttpResponse:
         response = self.session.request(
             url=uri,
@@ -43,8 +90,12 @@ class RequestsHttpClient(HttpClient):
         if response.status_code >= 500:
             response.raise_for_status()
 
-        # note: we only support utf-8 encodings
-        if response.encoding is None or response.encoding.lower() != "utf-8":
+        # note: we only support utf-8 encodings. responses without a body (e.g. 304 Not Modified)
+        # usually do not specify any encoding. the body is passed on as raw bytes, such that it
+        # is never decoded to a string unless requested.
+        content = response.content
+        has_body = len(content) > 0
+        if has_body and (response.encoding is None or response.encoding.lower() != "utf-8"):
             raise ValueError(
                 f"Received a response with an unsupported encoding scheme (encoding='{response.encoding}')."
             )
@@ -52,6 +103,6 @@ class RequestsHttpClient(HttpClient):
         return HttpResponse(
             status_code=response.status_code,
             reason=response.reason,
-            text=response.text,
+            content=content if has_body else None,
             headers=dict(response.headers),
         )
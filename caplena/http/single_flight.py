@@ -0,0 +1,55 @@
+import threading
+from typing import Callable, Dict, Hashable, Optional
+
+from caplena.http.http_response import HttpResponse
+
+
+class _Call:
+    __slots__ = ("done", "response", "exception")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.response: Optional[HttpResponse] = None
+        self.exception: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Coalesces identical requests that are in flight at the same time. The first caller sends
+    the request, while all other callers with the same key wait for it to complete and receive
+    the same exception, or their own copy of the response. The copies share the raw body, but
+    decode it separately, such that decoded JSON bodies are never shared between callers.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def in_flight(self) -> int:
+        """The number of distinct requests currently in flight."""
+        with self._lock:
+            return len(self._calls)
+
+    def do(self, key: Hashable, fn: Callable[[], HttpResponse]) -> HttpResponse:
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+
+        if is_leader:
+            try:
+                call.response = fn()
+            except BaseException as exc:
+                call.exception = exc
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call.done.set()
+        else:
+            call.done.wait()
+
+        if call.exception is not None:
+            raise call.exception
+        assert call.response is not None
+        return call.response if is_leader else call.response.copy()
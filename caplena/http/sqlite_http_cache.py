@@ -0,0 +1,133 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import ClassVar, Dict, Optional
+from urllib.parse import urlsplit
+
+from caplena.http.http_cache import HttpCache, HttpCacheEntry
+
+
+class SqliteHttpCache(HttpCache):
+    """A persistent cache backed by a SQLite database, which can safely be shared by multiple
+    threads and processes, e.g. all workers of a gunicorn server or a multiprocessing pool.
+    Newly started workers are served from the responses cached by other workers. Once the
+    cached responses exceed :code:`max_size` bytes, the least recently used ones are evicted.
+    Reading a cached response doesn't write to the database, its access time is only stored with
+    the next response that is cached, or once :code:`MAX_PENDING_ACCESSES` responses were read.
+    Please note that cached responses contain your project data in plain text.
+
+    :param path: The path of the SQLite database file. Created if it does not exist.
+    :param max_size: The maximum total size of all cached response bodies in bytes,
+        defaults to :code:`256 MiB`.
+    :param ttls: Number of seconds a cached response may be used without revalidating it, keyed
+        by path pattern, e.g. :code:`{"/projects/{id}": 30, "/projects/{id}/rows": 5}`.
+    :param default_ttl: Number of seconds a cached response may be used without revalidating it,
+        if none of the path patterns match, defaults to :code:`0`.
+    :param timeout: Number of seconds to wait for locks held by other processes, defaults to :code:`30`.
+    """
+
+    DEFAULT_MAX_SIZE: ClassVar[int] = 256 * 1024 * 1024
+    DEFAULT_TIMEOUT: ClassVar[float] = 30
+    MAX_PENDING_ACCESSES: ClassVar[int] = 1024
+
+    def __init__(
+        self,
+        *,
+        path: str,
+        max_size: int = DEFAULT_MAX_SIZE,
+        ttls: Optional[Dict[str, float]] = None,
+        default_ttl: float = 0,
+        timeout: float = DEFAULT_TIMEOUT,
+    ):
+        super().__init__(ttls=ttls, default_ttl=default_ttl)
+        self.path = path
+        self.max_size = max_size
+        self.timeout = timeout
+        self._local = threading.local()
+        self._accessed: Dict[str, float] = {}
+        self._accessed_lock = threading.Lock()
+
+        with self._connect() as connection:
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, path TEXT NOT NULL, accessed_at REAL NOT NULL, "
+                "size INTEGER NOT NULL, metadata TEXT NOT NULL, body BLOB NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_accessed_at ON responses (accessed_at)"
+            )
+
+    def get(self, key: str) -> Optional[HttpCacheEntry]:
+        connection = self._connect()
+        row = connection.execute(
+            "SELECT metadata, body FROM responses WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+
+        # note: access times are collected and written in batches, such that reads neither lock
+        # the database nor wait for the writes of other processes.
+        with self._accessed_lock:
+            self._accessed[key] = time.time()
+            pending = len(self._accessed)
+        if pending >= self.MAX_PENDING_ACCESSES:
+            with connection:
+                self._store_accesses(connection)
+        return HttpCacheEntry.from_metadata(json.loads(row[0]), row[1])
+
+    def set(self, key: str, entry: HttpCacheEntry) -> None:
+        body = entry.to_body()
+        with self._connect() as connection:
+            # note: the pending access times are stored first, such that eviction takes them into account
+            self._store_accesses(connection)
+            connection.execute(
+                "INSERT OR REPLACE INTO responses (key, path, accessed_at, size, metadata, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, entry.path, time.time(), len(body), json.dumps(entry.to_metadata()), body),
+            )
+            # note: evicts the least recently used responses exceeding the maximum size
+            connection.execute(
+                "DELETE FROM responses WHERE key IN ("
+                "SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY accessed_at DESC, key) AS total "
+                "FROM responses) WHERE total > ?)",
+                (self.max_size,),
+            )
+
+    def delete(self, key: str) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses WHERE key = ?", (key,))
+
+    def invalidate(self, uri: str) -> None:
+        path = urlsplit(uri).path.rstrip("/")
+        with self._connect() as connection:
+            connection.execute(
+                "DELETE FROM responses WHERE path = ? "
+                "OR substr(path, 1, length(?) + 1) = ? || '/' "
+                "OR substr(?, 1, length(rtrim(path, '/')) + 1) = rtrim(path, '/') || '/'",
+                (path, path, path, path),
+            )
+
+    def clear(self) -> None:
+        with self._connect() as connection:
+            connection.execute("DELETE FROM responses")
+
+    def _store_accesses(self, connection: sqlite3.Connection) -> None:
+        with self._accessed_lock:
+            accessed, self._accessed = self._accessed, {}
+        connection.executemany(
+            "UPDATE responses SET accessed_at = MAX(accessed_at, ?) WHERE key = ?",
+            [(accessed_at, key) for key, accessed_at in accessed.items()],
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        # note: sqlite connections must neither be shared between threads nor inherited
+        # by forked processes, we therefore keep one connection per thread and process.
+        connection: Optional[sqlite3.Connection] = getattr(self._local, "connection", None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.path, timeout=self.timeout)
+            connection.execute("PRAGMA journal_mode=WAL")
+            self._local.connection = connection
+            self._local.pid = os.getpid()
+        return connection
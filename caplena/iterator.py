@@ -1,19 +1,52 @@
 import copy
-from typing import Callable, Generic, List, Optional, Tuple, TypeVar
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Dict,
+    Generic,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+    overload,
+)
 
-from caplena.constants import LIST_PAGINATION_LIMIT
+from cachetools import LRUCache
+from typing_extensions import Literal
+
+from caplena.concurrency import map_concurrently
+from caplena.constants import DEFAULT_MAX_WORKERS, LIST_PAGINATION_LIMIT
 
 T = TypeVar("T")
 
 
 class CaplenaIterator(Generic[T]):
-    """A lazy iterator, only fetches more results when the entries are iterated."""
+    """A lazy iterator, only fetches more results when the entries are iterated.
+
+    Results can also be accessed by index or slice, in which case up to :code:`PAGE_CACHE_MAXSIZE`
+    of the fetched pages are kept.
+
+    Fetched results are passed to :code:`track` by the thread consuming the iterator, even if their
+    pages were fetched concurrently by other threads. If given, :code:`counter` is called to
+    determine the total count before any page is fetched, instead of fetching the first page.
+    """
+
+    PAGE_CACHE_MAXSIZE: ClassVar[int] = 16
+
+    _total_count: Optional[int]
 
     @property
     def count(self) -> int:
         """The total number of elements that exist for the requested resource."""
         if self._total_count is not None:
             return self._total_count
+        elif self._counter is not None:
+            count = self._counter()
+            self._total_count = count
+            return count
         else:
             self._retrieve_next_page()
             return self._total_count  # type: ignore
@@ -28,22 +61,44 @@ class CaplenaIterator(Generic[T]):
         total_count: Optional[int] = None,
         limit: Optional[int] = None,
         has_next: bool = True,
+        page_size: int = LIST_PAGINATION_LIMIT,
+        track: Optional[Callable[[T], Any]] = None,
+        counter: Optional[Callable[[], int]] = None,
     ):
         self._results_fetcher = results_fetcher
+        self._track = track
+        self._counter = counter
         self._limit = limit
 
         self._total_results_iterated = 0
         self._current_results_index = 0
-        self._default_pagination_limit = LIST_PAGINATION_LIMIT
 
         self._current_page = current_page
         self._total_results_fetched = total_results_fetched
         self._results: List[T] = [] if results is None else results
-        self._total_count: Optional[int] = total_count
+        self._total_count = total_count
         self._has_next: bool = has_next
+        self._page_size = page_size
+        self._page_cache: "LRUCache[int, List[T]]" = LRUCache(maxsize=self.PAGE_CACHE_MAXSIZE)
+
+    @staticmethod
+    def page_size_for(limit: Optional[int], *, max_page_size: int = LIST_PAGINATION_LIMIT) -> int:
+        """Returns the size of the pages to request for the given limit. As pages are requested by
+        their number, all pages must have the same size. The limit is therefore spread evenly over
+        as few pages as the maximum page size allows, fetching less than one extra result per page.
+
+        :param limit: The maximum number of results, :code:`None` meaning all results.
+        :param max_page_size: The maximum number of results per page, defaults to :code:`30`.
+        """
+        if not limit or limit < 0:
+            return max_page_size
+        pages = -(-limit // max_page_size)
+        return -(-limit // pages)
 
     def __str__(self) -> str:
         # note: if nothing has been fetched yet, this will trigger the inital fetch
+        if self._current_page == 0 and self._has_next:
+            self._retrieve_next_page()
         count = self.count
 
         results = ", ".join([str(res) for res in self._results])
@@ -56,7 +111,7 @@ class CaplenaIterator(Generic[T]):
 
     def _retrieve_next_page(self) -> None:
         self._current_page += 1
-        results, has_next, count = self._results_fetcher(self._current_page)
+        results, has_next, count = self._fetch_page(self._current_page)
 
         self._total_results_fetched += len(results)
         self._current_results_index = 0
@@ -76,7 +131,93 @@ class CaplenaIterator(Generic[T]):
             results=copy.deepcopy(self._results),
             total_count=self._total_count,
             has_next=self._has_next,
+            page_size=self._page_size,
+            track=self._track,
+            counter=self._counter,
+        )
+
+    def iter_pages(self) -> Iterator[List[T]]:
+        """Yields the remaining results page by page, as they are fetched from the API. Pages start
+        at the next result that was not yet iterated, i.e. with the remainder of the current page,
+        and respect the limit. This iterator is not advanced, results of the current page are shared
+        with it instead of being copied, and pages are not kept once they are handed over.
+        """
+        remaining = None if self._limit is None else self._limit - self._total_results_iterated
+        return self._iter_pages(
+            self._current_page,
+            self._results[self._current_results_index :],
+            self._has_next,
+            remaining,
+        )
+
+    def _iter_pages(
+        self, page: int, results: List[T], has_next: bool, remaining: Optional[int]
+    ) -> Iterator[List[T]]:
+        while True:
+            if remaining is not None:
+                if len(results) > remaining:
+                    results = results[:remaining]
+                remaining -= len(results)
+            if results:
+                yield results
+            if not has_next or (remaining is not None and remaining <= 0):
+                return
+
+            # note: the previous page is released before fetching the next one
+            del results
+            page += 1
+            results, has_next, self._total_count = self._fetch_page(page)
+
+    @overload
+    def iter_batches(self, size: int, *, columnar: Literal[False] = ...) -> Iterator[List[T]]: ...
+
+    @overload
+    def iter_batches(
+        self, size: int, *, columnar: Literal[True]
+    ) -> Iterator[Dict[str, List[Any]]]: ...
+
+    def iter_batches(
+        self, size: int, *, columnar: bool = False
+    ) -> Iterator[Union[List[T], Dict[str, List[Any]]]]:
+        """Yields the results in batches of the given size, only the last batch may be smaller.
+        Batches are assembled from the fetched pages, see :code:`iter_pages`.
+
+        :param size: The number of results per batch.
+        :param columnar: Whether to yield columnar batches, as returned by :code:`to_columnar`
+            of the resource, instead of lists, defaults to :code:`False`.
+        """
+        if size < 1:
+            raise ValueError(f"Invalid batch size {size}. HINT: Please specify a positive size.")
+
+        batches = self._iter_batches(size)
+        if not columnar:
+            return batches
+        return (self._to_columnar(batch) for batch in batches)
+
+    @staticmethod
+    def _to_columnar(batch: List[T]) -> Dict[str, List[Any]]:
+        to_columnar: Callable[[List[T]], Dict[str, List[Any]]] = getattr(
+            type(batch[0]), "to_columnar"
         )
+        return to_columnar(batch)
+
+    def _iter_batches(self, size: int) -> Iterator[List[T]]:
+        batch: List[T] = []
+        for page in self.iter_pages():
+            if not batch and len(page) == size:
+                yield page
+                continue
+
+            start = 0
+            while start < len(page):
+                end = start + size - len(batch)
+                batch.extend(page[start:end])
+                start = end
+                if len(batch) == size:
+                    yield batch
+                    batch = []
+        if batch:
+            yield batch
 
     def __next__(self) -> T:
         if self._limit and self._total_results_iterated >= self._limit:
@@ -91,14 +232,62 @@ class CaplenaIterator(Generic[T]):
         self._current_results_index += 1
         return self._results[self._current_results_index - 1]
 
-    def __getitem__(self, key: int) -> T:
-        pagination_limit = (
-            self._limit if self._limit is not None else self._default_pagination_limit
+    @overload
+    def __getitem__(self, key: int) -> T: ...
+
+    @overload
+    def __getitem__(self, key: slice) -> List[T]: ...
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[T, List[T]]:
+        """Returns the result at the given index, or the results within the given slice. Only the
+        pages covering the requested results are fetched, concurrently for slices, and recently
+        fetched pages are kept, such that accessing nearby results doesn't fetch them again.
+        Negative indexes are relative to the number of results, respecting the limit.
+        """
+        if isinstance(key, slice):
+            indexes = range(*key.indices(len(self)))
+            pages = self._fetch_pages(sorted({idx // self._page_size + 1 for idx in indexes}))
+            return [pages[idx // self._page_size + 1][idx % self._page_size] for idx in indexes]
+
+        length = len(self)
+        index = key + length if key < 0 else key
+        if not 0 <= index < length:
+            raise IndexError(f"Index {key} is out of range for {length} results.")
+        key = index
+
+        target_page = key // self._page_size + 1
+        results = self._fetch_pages([target_page])[target_page]
+        return results[key % self._page_size]
+
+    def _fetch_pages(self, pages: List[int]) -> Dict[int, List[T]]:
+        fetched: Dict[int, List[T]] = {}
+        missing: List[int] = []
+        for page in pages:
+            if page == self._current_page and len(self._results) > 0:
+                fetched[page] = self._results
+            elif page in self._page_cache:
+                fetched[page] = self._page_cache[page]
+            else:
+                missing.append(page)
+
+        responses = map_concurrently(
+            self._results_fetcher, missing, max_workers=min(DEFAULT_MAX_WORKERS, len(missing) or 1)
         )
-        target_page = key // pagination_limit + 1
-        item_index = key - (target_page * pagination_limit)
-        if target_page == self._current_page and len(self._results) > 0:
-            return self._results[item_index]
-        else:
-            results, has_next, count = self._results_fetcher(target_page)
-            return results[item_index]
+        for page, response in zip(missing, responses):
+            if isinstance(response, Exception):
+                raise response
+            results, _, self._total_count = response
+            # note: the pages are fetched by worker threads, but tracked by the consuming thread
+            self._track_results(results)
+            fetched[page] = self._page_cache[page] = results
+        return fetched
+
+    def _fetch_page(self, page: int) -> Tuple[List[T], bool, int]:
+        response = self._results_fetcher(page)
+        self._track_results(response[0])
+        return response
+
+    def _track_results(self, results: List[T]) -> None:
+        if self._track is not None:
+            for result in results:
+                self._track(result)
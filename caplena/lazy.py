@@ -0,0 +1,34 @@
+from typing import Any, Callable, Dict, Generic, TypeVar
+
+T = TypeVar("T")
+
+
+class LazyValue(Generic[T]):
+    """A value that is only parsed from its raw representation once it is accessed.
+
+    Lazy values are immutable: copies share the same instance, and lazy values of equal raw
+    representations compare equal without being parsed.
+    """
+
+    __slots__ = ("raw", "_parse")
+
+    def __init__(self, raw: Any, parse: Callable[[Any], T]):
+        self.raw = raw
+        self._parse = parse
+
+    def parse(self) -> T:
+        """Returns a newly parsed value, every call returns a separate instance."""
+        return self._parse(self.raw)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> "LazyValue[T]":
+        return self
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, LazyValue):
+            return NotImplemented
+        return self.raw is other.raw or bool(self.raw == other.raw)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"LazyValue({self.raw!r})"
@@ -25,6 +25,10 @@ class Logger:
         self._name = name
         self._logging_level = logging_level
 
+    def is_enabled_for(self, level: LoggingLevel) -> bool:
+        """Returns whether messages of the given level are logged."""
+        return level.level >= self._logging_level.level
+
     def log(self, msg: str, *, level: LoggingLevel, **extra: str) -> None:
         raise NotImplementedError("Logger subclasses must implement `log`.")
 
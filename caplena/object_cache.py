@@ -0,0 +1,91 @@
+import threading
+from typing import Any, ClassVar, Dict, Hashable, Optional, Tuple
+
+from cachetools import Cache, LRUCache, TTLCache
+
+CacheKey = Tuple[Hashable, ...]
+
+
+class ObjectCache:
+    """An identity map of resources that were recently retrieved or written, keyed by their
+    identifiers. Responses of write requests update the cache and removals evict from it, so
+    that reading a resource right after writing it does not require another request. Every
+    cache hit builds a fresh object, such that unsaved modifications are never shared.
+
+    :param maxsize: The maximum number of resources to keep, defaults to :code:`1024`.
+        Once full, the least recently used resources are evicted.
+    :param ttl: Number of seconds after which cached resources expire, defaults to :code:`None`,
+        meaning that resources only expire once evicted.
+    """
+
+    DEFAULT_MAXSIZE: ClassVar[int] = 1024
+
+    @property
+    def hits(self) -> int:
+        """The number of lookups that were served from the cache."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """The number of lookups that could not be served from the cache."""
+        return self._misses
+
+    @property
+    def hit_ratio(self) -> float:
+        """The ratio of lookups that were served from the cache."""
+        lookups = self._hits + self._misses
+        return self._hits / lookups if lookups > 0 else 0.0
+
+    @property
+    def size(self) -> int:
+        """The number of resources currently cached."""
+        return len(self._entries)
+
+    @property
+    def maxsize(self) -> int:
+        return self._maxsize
+
+    def __init__(self, *, maxsize: int = DEFAULT_MAXSIZE, ttl: Optional[float] = None):
+        self._maxsize = maxsize
+        self._entries: "Cache[CacheKey, Dict[str, Any]]" = (
+            LRUCache(maxsize=maxsize) if ttl is None else TTLCache(maxsize=maxsize, ttl=ttl)
+        )
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def __str__(self) -> str:
+        return (
+            f"ObjectCache(size={self.size}, maxsize={self._maxsize}, hits={self._hits}, "
+            f"misses={self._misses})"
+        )
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            payload = self._entries.get(key)
+            if payload is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            return payload
+
+    def set(self, key: CacheKey, payload: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = payload
+
+    def evict(self, key: CacheKey) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def evict_prefix(self, prefix: CacheKey) -> None:
+        """Evicts all resources whose key starts with the given prefix."""
+        with self._lock:
+            for key in list(self._entries.keys()):
+                if key[: len(prefix)] == prefix:
+                    self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
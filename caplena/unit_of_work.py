@@ -0,0 +1,88 @@
+from typing import Dict, List, Optional, Protocol, Tuple
+
+from caplena.concurrency import RateLimiter, map_concurrently
+from caplena.constants import DEFAULT_MAX_WORKERS
+from caplena.logging.default_logger import DefaultLogger
+from caplena.logging.logger import Logger
+
+
+class SavableObject(Protocol):
+    @property
+    def is_modified(self) -> bool: ...
+
+    def save(self) -> None: ...
+
+
+class UnitOfWork:
+    """Tracks objects and saves all modified ones at once, sending the updates concurrently.
+    Objects that were not modified are skipped without sending any request. If some objects
+    cannot be saved, all other objects are saved nevertheless, and the failures are
+    available in :code:`errors`.
+
+    :param max_workers: The maximum number of concurrent requests, defaults to :code:`8`.
+    :param rate_limit: The maximum number of requests per second, defaults to :code:`None`,
+        meaning that requests are not rate limited.
+    :param logger: The logger to report failures to.
+    """
+
+    DEFAULT_LOGGER = DefaultLogger("unit_of_work[shared]")
+
+    @property
+    def objects(self) -> List[SavableObject]:
+        """The tracked objects, which have not been saved yet."""
+        return list(self._objects.values())
+
+    @property
+    def saved(self) -> List[SavableObject]:
+        """The objects that were successfully saved."""
+        return self._saved
+
+    @property
+    def errors(self) -> List[Tuple[SavableObject, Exception]]:
+        """The objects that could not be saved, together with the raised exception."""
+        return self._errors
+
+    def __init__(
+        self,
+        *,
+        max_workers: int = DEFAULT_MAX_WORKERS,
+        rate_limit: Optional[float] = None,
+        logger: Logger = DEFAULT_LOGGER,
+    ):
+        self.max_workers = max_workers
+        self.rate_limit = rate_limit
+        self.logger = logger
+        self._objects: Dict[int, SavableObject] = {}
+        self._saved: List[SavableObject] = []
+        self._errors: List[Tuple[SavableObject, Exception]] = []
+
+    def add(self, obj: SavableObject) -> None:
+        """Tracks the given object, such that it is saved once this unit of work is committed."""
+        self._objects.setdefault(id(obj), obj)
+
+    def commit(self) -> None:
+        """Saves all tracked objects that were modified."""
+        modified = [obj for obj in self._objects.values() if obj.is_modified]
+        self._objects.clear()
+        rate_limiter = RateLimiter(self.rate_limit) if self.rate_limit is not None else None
+
+        results = map_concurrently(
+            lambda obj: obj.save(),
+            modified,
+            max_workers=self.max_workers,
+            rate_limiter=rate_limiter,
+        )
+        failed = 0
+        for obj, result in zip(modified, results):
+            if isinstance(result, Exception):
+                self._errors.append((obj, result))
+                failed += 1
+            else:
+                self._saved.append(obj)
+
+        if failed > 0:
+            self.logger.warning(
+                "Failed saving some of the modified objects",
+                failed=str(failed),
+                modified=str(len(modified)),
+            )
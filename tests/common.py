@@ -1,5 +1,8 @@
+from typing import Any, Dict, Optional
+
 from caplena.api.api_base_uri import ApiBaseUri
 from caplena.configuration import Configuration
+from caplena.controllers import ProjectsController
 from caplena.http.requests_http_client import RequestsHttpClient
 from caplena.logging.logger import LoggingLevel
 
@@ -11,3 +14,98 @@ common_config = Configuration(
     api_base_uri=ApiBaseUri.LOCAL,
     logging_level=LoggingLevel.DEBUG,
 )
+
+
+def build_project_payload(id: str = "pj_1", *, name: str = "Project Name") -> Dict[str, Any]:
+    return {
+        "id": id,
+        "name": name,
+        "owner": "us_1",
+        "tags": ["my-tag"],
+        "upload_status": "succeeded",
+        "language": "en",
+        "translation_status": None,
+        "translation_engine": None,
+        "created": "2022-03-14T08:18:38.910Z",
+        "last_modified": "2022-03-14T08:18:38.910Z",
+        "columns": [
+            {"ref": "customer_age", "type": "numerical", "name": "Age of the customer"},
+            {
+                "ref": "our_strengths",
+                "type": "text_to_analyze",
+                "name": "Do you like us?",
+                "description": "",
+                "metadata": {"reviewed_count": 0, "learns_from": None},
+                "topics": [
+                    {
+                        "id": "cd_1",
+                        "label": "price",
+                        "category": "SERVICE",
+                        "color": "#FF0000",
+                        "description": "",
+                        "sentiment_enabled": True,
+                        "sentiment_neutral": {"code": 0, "label": "price"},
+                        "sentiment_positive": {"code": 1, "label": "price positive"},
+                        "sentiment_negative": {"code": 2, "label": "price negative"},
+                    }
+                ],
+            },
+        ],
+    }
+
+
+def build_row_payload(id: str = "ro_1", *, age: Optional[int] = 42) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "created": "2022-03-14T08:18:38.910Z",
+        "last_modified": "2022-03-14T08:18:38.910Z",
+        "columns": [
+            {"ref": "customer_age", "type": "numerical", "value": age},
+            {
+                "ref": "our_strengths",
+                "type": "text_to_analyze",
+                "value": "Good price.",
+                "was_reviewed": False,
+                "sentiment_overall": "positive",
+                "source_language": "en",
+                "translated_value": None,
+                "topics": [
+                    {
+                        "id": "cd_1",
+                        "label": "price",
+                        "category": "SERVICE",
+                        "code": 1,
+                        "sentiment_label": "price positive",
+                        "sentiment": "positive",
+                    }
+                ],
+            },
+        ],
+    }
+
+
+def build_controller(**options: Any) -> ProjectsController:
+    """Builds a controller for the local API, the given options are passed to its configuration."""
+    config = Configuration(
+        **{
+            "api_key": common_api_key,
+            "http_client": RequestsHttpClient(),
+            "api_base_uri": ApiBaseUri.LOCAL,
+            **options,
+        }
+    )
+    return ProjectsController(config=config)
+
+
+def build_wide_row_payload(id: str = "ro_1") -> Dict[str, Any]:
+    row = build_row_payload(id)
+    row["columns"].extend(
+        [
+            {"ref": "visited", "type": "date", "value": "2022-01-05T10:00:00.000Z"},
+            {"ref": "missing", "type": "date", "value": None},
+            {"ref": "member", "type": "boolean", "value": True},
+            {"ref": "comment", "type": "text", "value": "Hello."},
+            {"ref": "other", "type": "any", "value": {"nested": [1, 2]}},
+        ]
+    )
+    return row
@@ -1,8 +1,17 @@
 import unittest
 from datetime import datetime, timezone
 from typing import Any, ClassVar, List, Tuple
-
-from caplena.api import ApiBaseUri, ApiFilter, ApiRequestor, ApiVersion, ZeroOrMany
+from unittest import mock
+
+from caplena.api import (
+    ApiBaseUri,
+    ApiFilter,
+    ApiRequestor,
+    ApiRoute,
+    ApiVersion,
+    ZeroOrMany,
+)
+from caplena.helpers import Helpers
 from caplena.http.http_client import HttpClient
 from caplena.http.requests_http_client import RequestsHttpClient
 from caplena.logging.default_logger import DefaultLogger
@@ -210,6 +219,54 @@ class ApiRequestorTests(unittest.TestCase):
 
         self.assertAbsoluteUriListEqual(expected, absolute_uris)
 
+    def test_building_request_headers_succeeds(self) -> None:
+        api_requestor = ApiRequestor(http_client=self.http_client, logger=self.logger)
+        with mock.patch.object(Helpers, "get_user_agent", return_value="agent/1.0") as agent:
+            headers = api_requestor.build_request_headers(
+                headers={"User-Agent": "custom", "X-Custom": "yes"},
+                api_key="key",
+                api_version=ApiVersion.VER_2022_11_22,
+            )
+            api_requestor.build_request_headers(
+                api_key="key", api_version=ApiVersion.VER_2022_11_22
+            )
+
+        self.assertEqual(1, agent.call_count)
+        self.assertDictEqual(
+            {
+                "Accept": "application/json",
+                "X-Custom": "yes",
+                "User-Agent": "agent/1.0",
+                "Caplena-API-Key": "key",
+                "Caplena-API-Version": "2022-11-22",
+            },
+            headers,
+        )
+
+
+class ApiRouteTests(unittest.TestCase):
+    def test_building_route_fails(self) -> None:
+        with self.assertRaisesRegex(
+            ValueError,
+            "Path specifies an invalid path parameter. Parameter name must not be empty.",
+        ):
+            ApiRoute("/projects/{}/rows")
+
+    def test_building_path_succeeds(self) -> None:
+        route = ApiRoute("/projects/{p_id}/rows/{r_id}")
+
+        self.assertEqual(("p_id", "r_id"), route.params)
+        self.assertEqual(
+            "projects/pj_1/rows/ro_1", route.build_path({"p_id": "pj_1", "r_id": "ro_1"})
+        )
+        self.assertEqual(
+            "https://abc.xyz/projects/pj_1/rows/ro_1",
+            route.build_uri("https://abc.xyz/", {"p_id": "pj_1", "r_id": "ro_1"}),
+        )
+
+    def test_compiling_route_is_cached(self) -> None:
+        self.assertIs(ApiRoute.compile("/projects/{id}"), ApiRoute.compile("/projects/{id}"))
+
 
 class ApiFilterTests(unittest.TestCase):
     def test_constructing_filter_succeeds(self) -> None:
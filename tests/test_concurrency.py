@@ -0,0 +1,316 @@
+import threading
+import unittest
+from typing import Any, Dict, List, Tuple
+
+import requests_mock
+
+from caplena.api import ApiException
+from caplena.concurrency import map_concurrently
+from caplena.filters import ProjectsFilter, RowsFilter
+from caplena.resources import ProjectDetail, Row
+from tests.common import build_controller, build_project_payload, build_row_payload
+
+PROJECTS_URI = "http://localhost:8000/v2/projects"
+
+
+class MapConcurrentlyTests(unittest.TestCase):
+    def test_mapping_preserves_order_and_exceptions(self) -> None:
+        threads = set()
+
+        def square(value: int) -> int:
+            threads.add(threading.get_ident())
+            if value == 3:
+                raise ValueError("three")
+            return value * value
+
+        results = map_concurrently(square, list(range(6)), max_workers=3)
+
+        self.assertEqual([0, 1, 4], results[:3])
+        self.assertIsInstance(results[3], ValueError)
+        self.assertEqual([16, 25], results[4:])
+        self.assertLessEqual(len(threads), 3)
+
+    def test_mapping_with_invalid_max_workers_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "max_workers"):
+            map_concurrently(str, [1], max_workers=0)
+
+
+class RetrieveManyTests(unittest.TestCase):
+    def test_retrieving_many_projects_succeeds(self) -> None:
+        controller = build_controller()
+
+        with requests_mock.Mocker() as mocker:
+            for id in ["pj_1", "pj_2", "pj_3"]:
+                mocker.get(f"{PROJECTS_URI}/{id}", json=build_project_payload(id))
+            mocker.get(
+                f"{PROJECTS_URI}/pj_4",
+                status_code=404,
+                json={
+                    "type": "invalid_request_error",
+                    "code": "not_found",
+                    "message": "Not found.",
+                },
+            )
+
+            projects = controller.retrieve_many(ids=["pj_3", "pj_4", "pj_1", "pj_2"])
+
+        self.assertEqual(4, len(projects))
+        self.assertIsInstance(projects[1], ApiException)
+        ids = [p.id for p in projects if isinstance(p, ProjectDetail)]
+        self.assertEqual(["pj_3", "pj_1", "pj_2"], ids)
+
+    def test_retrieving_many_rows_succeeds(self) -> None:
+        controller = build_controller()
+
+        with requests_mock.Mocker() as mocker:
+            for id in ["ro_1", "ro_2"]:
+                mocker.get(f"{PROJECTS_URI}/pj_1/rows/{id}", json=build_row_payload(id))
+
+            rows = controller.retrieve_rows(p_id="pj_1", r_ids=["ro_2", "ro_1"], max_workers=2)
+
+        self.assertEqual(["ro_2", "ro_1"], [row.id for row in rows if isinstance(row, Row)])
+        self.assertTrue(all(isinstance(row, Row) for row in rows))
+
+
+class BulkRowsTests(unittest.TestCase):
+    def test_removing_rows_by_filter_succeeds(self) -> None:
+        controller = build_controller()
+        pages = [
+            {"json": {"results": [build_row_payload("ro_1")], "next_url": "page2", "count": 2}},
+            {"json": {"results": [build_row_payload("ro_2")], "next_url": None, "count": 2}},
+        ]
+        progress: List[Tuple[int, int]] = []
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(f"{PROJECTS_URI}/pj_1/rows", pages)
+            mocker.delete(f"{PROJECTS_URI}/pj_1/rows/ro_1", status_code=204)
+            mocker.delete(
+                f"{PROJECTS_URI}/pj_1/rows/ro_2",
+                status_code=404,
+                json={"type": "invalid_request_error", "code": "not_found", "message": "Gone."},
+            )
+
+            failures = controller.remove_rows(
+                p_id="pj_1",
+                filter=RowsFilter.Columns.numerical(ref="customer_age", gte=18),
+                on_progress=lambda done, total: progress.append((done, total)),
+            )
+
+            self.assertEqual(2, listed.call_count)
+            self.assertEqual(["customer_age[numerical].gte:18"], listed.last_request.qs["columns"])
+
+        self.assertEqual(["ro_2"], list(failures))
+        self.assertEqual([(1, 2), (2, 2)], progress)
+
+    def test_removing_rows_without_ids_or_filter_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "either the `ids` or the `filter`"):
+            build_controller().remove_rows(p_id="pj_1")
+
+    def test_updating_rows_succeeds(self) -> None:
+        controller = build_controller()
+
+        with requests_mock.Mocker() as mocker:
+            mocker.patch(f"{PROJECTS_URI}/pj_1/rows/ro_1", json=build_row_payload("ro_1", age=1))
+            mocker.patch(f"{PROJECTS_URI}/pj_1/rows/ro_2", json=build_row_payload("ro_2", age=2))
+
+            rows = controller.update_rows(
+                p_id="pj_1",
+                updates=[
+                    {"id": "ro_2", "columns": [{"ref": "customer_age", "value": 2}]},
+                    {"id": "ro_1", "columns": [{"ref": "customer_age", "value": 1}]},
+                ],
+                rate_limit=100,
+            )
+
+        self.assertEqual(
+            [("ro_2", 2), ("ro_1", 1)],
+            [(row.id, row.columns[0].value) for row in rows if isinstance(row, Row)],
+        )
+
+
+class ShardedListTests(unittest.TestCase):
+    def test_listing_rows_with_oversized_filter_succeeds(self) -> None:
+        controller = build_controller()
+        controller.api.max_filter_query_length = 200
+        created = {"ro_1": "2022-01-01", "ro_2": "2022-01-03", "ro_3": "2022-01-02"}
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            # note: every shard matches ro_3, which must only be returned once
+            matched = [r_id for r_id in created if r_id in request.query] + ["ro_3"]
+            results = [
+                {**build_row_payload(r_id), "created": f"{created[r_id]}T00:00:00Z"}
+                for r_id in sorted(set(matched), key=created.__getitem__)
+            ]
+            return {"results": results, "next_url": None, "count": len(results)}
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=respond)
+            values = ["ro_1", "ro_2"] + [f"other-value-{i}" for i in range(20)]
+            rows = controller.list_rows(
+                id="pj_1", filter=RowsFilter.Columns.text(ref="text", exact__i=values)
+            )
+
+            self.assertEqual(["ro_1", "ro_3", "ro_2"], [row.id for row in rows])
+            self.assertEqual(3, rows.count)
+            self.assertGreater(listed.call_count, 1)
+
+    def test_listing_rows_with_oversized_filter_and_limit_succeeds(self) -> None:
+        controller = build_controller()
+        controller.api.max_filter_query_length = 200
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            # note: the shards match rows 0 to 34 and 15 to 49 respectively, 50 rows in total
+            ids = range(35) if "ro_1" in request.query else range(15, 50)
+            page, limit = int(request.qs["page"][0]), int(request.qs["limit"][0])
+            matched = list(ids)[(page - 1) * limit : page * limit]
+            return {
+                "results": [
+                    {**build_row_payload(f"ro_{i}"), "created": f"2022-01-01T00:{i:02}:00Z"}
+                    for i in matched
+                ],
+                "next_url": "next" if page * limit < len(ids) else None,
+                "count": len(ids),
+            }
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=respond)
+            values = ["ro_1", "ro_2"] + [f"other-value-{i}" for i in range(20)]
+            rows = controller.list_rows(
+                id="pj_1", filter=RowsFilter.Columns.text(ref="text", exact__i=values), limit=7
+            )
+
+            self.assertEqual([f"ro_{i}" for i in range(7)], [row.id for row in rows])
+            self.assertEqual(50, rows.count)
+            self.assertEqual(7, len(rows))
+            # note: the shards are merged lazily, only their first pages of 7 rows are fetched
+            pages = [r.qs["page"] for r in listed.request_history if r.qs["limit"] == ["7"]]
+            self.assertEqual([["1"]] * len(pages), pages)
+
+    def test_listing_many_rows_with_oversized_filter_succeeds(self) -> None:
+        controller = build_controller()
+        controller.api.max_filter_query_length = 200
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            # note: the shards match rows 0 to 44 and 30 to 99 respectively, 100 rows in total
+            ids = range(45) if "ro_1" in request.query else range(30, 100)
+            page, limit = int(request.qs["page"][0]), int(request.qs["limit"][0])
+            matched = list(ids)[(page - 1) * limit : page * limit]
+            return {
+                "results": [
+                    {
+                        **build_row_payload(f"ro_{i}"),
+                        "created": f"2022-01-01T{i // 60:02}:{i % 60:02}:00Z",
+                    }
+                    for i in matched
+                ],
+                "next_url": "next" if page * limit < len(ids) else None,
+                "count": len(ids),
+            }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=respond)
+            values = ["ro_1", "ro_2"] + [f"other-value-{i}" for i in range(20)]
+            rows = controller.list_rows(
+                id="pj_1", filter=RowsFilter.Columns.text(ref="text", exact__i=values)
+            )
+
+            self.assertEqual([f"ro_{i}" for i in range(100)], [row.id for row in rows])
+            # note: pages before the last requested one are merged again
+            self.assertEqual(["ro_95", "ro_5", "ro_65"], [rows[95].id, rows[5].id, rows[65].id])
+
+
+class CountTests(unittest.TestCase):
+    def test_counting_rows_succeeds(self) -> None:
+        controller = build_controller()
+        page = {"results": [build_row_payload("ro_1")], "next_url": None, "count": 42}
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=page)
+            counts = [controller.count_rows(id="pj_1") for _ in range(2)]
+            controller.count_rows(id="pj_1", filter=RowsFilter.Columns.numerical(ref="age", gt=3))
+
+            self.assertEqual([42, 42], counts)
+            self.assertEqual(2, listed.call_count)
+            self.assertEqual(["1"], listed.request_history[0].qs["limit"])
+
+            mocker.delete(f"{PROJECTS_URI}/pj_1/rows/ro_1", status_code=204)
+            controller.remove_row(p_id="pj_1", r_id="ro_1")
+            controller.count_rows(id="pj_1")
+            self.assertEqual(3, listed.call_count)
+
+    def test_counting_projects_succeeds(self) -> None:
+        controller = build_controller()
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(PROJECTS_URI, json={"results": [], "next_url": None, "count": 7})
+
+            self.assertEqual(7, controller.count_projects())
+            self.assertEqual(1, listed.call_count)
+
+    def test_counting_many_projects_succeeds(self) -> None:
+        controller = build_controller()
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            return {"results": [], "next_url": None, "count": len(request.query)}
+
+        filters = [ProjectsFilter.name(exact__i=["a" * i]) for i in range(1, 4)]
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(PROJECTS_URI, json=respond)
+
+            counts = controller.count_projects_many(filters=[None, *filters])
+
+        self.assertEqual(4, len(set(counts)))
+        self.assertTrue(all(isinstance(count, int) for count in counts))
+        self.assertEqual([["1"]] * 4, [r.qs["limit"] for r in listed.request_history])
+
+    def test_counting_listed_rows_requests_single_row(self) -> None:
+        controller = build_controller()
+        page = {"results": [build_row_payload("ro_1")], "next_url": None, "count": 42}
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=page)
+            rows = controller.list_rows(id="pj_1")
+
+            self.assertEqual(42, rows.count)
+            self.assertEqual(42, len(rows))
+            self.assertEqual(42, controller.count_rows(id="pj_1"))
+            self.assertEqual(1, listed.call_count)
+            self.assertEqual(["1"], listed.request_history[0].qs["limit"])
+
+            self.assertEqual(["ro_1"], [row.id for row in rows])
+            self.assertEqual(["30"], listed.request_history[1].qs["limit"])
+
+    def test_counting_many_rows_succeeds(self) -> None:
+        controller = build_controller()
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            return {"results": [], "next_url": None, "count": len(request.query)}
+
+        filters = [RowsFilter.Columns.text(ref="text", exact__i=["a" * i]) for i in range(1, 4)]
+        with requests_mock.Mocker() as mocker:
+            mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=respond)
+
+            counts = controller.count_rows_many(id="pj_1", filters=[None, *filters])
+
+        self.assertEqual(4, len(set(counts)))
+        self.assertTrue(all(isinstance(count, int) for count in counts))
+
+    def test_counting_rows_with_oversized_filter_succeeds(self) -> None:
+        controller = build_controller()
+        controller.api.max_filter_query_length = 200
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            # note: every shard matches ro_3, which must only be counted once
+            matched = {r_id for r_id in ["ro_1", "ro_2"] if r_id in request.query} | {"ro_3"}
+            results = [build_row_payload(r_id) for r_id in sorted(matched)]
+            return {"results": results, "next_url": None, "count": len(results)}
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(f"{PROJECTS_URI}/pj_1/rows", json=respond)
+            values = ["ro_1", "ro_2"] + [f"other-value-{i}" for i in range(20)]
+
+            count = controller.count_rows(
+                id="pj_1", filter=RowsFilter.Columns.text(ref="text", exact__i=values)
+            )
+
+        self.assertEqual(3, count)
@@ -0,0 +1,116 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+
+from caplena.datetime_codec import DatetimeCodec
+from caplena.helpers import Helpers
+from caplena.resources import Row
+from tests.common import build_row_payload
+
+
+class DatetimeCodecTests(unittest.TestCase):
+    def test_parsing_datetimes_succeeds(self) -> None:
+        codec = DatetimeCodec()
+
+        dt = codec.parse("2021-12-29T14:46:55.787Z")
+
+        self.assertEqual(datetime(2021, 12, 29, 14, 46, 55, 787000, tzinfo=timezone.utc), dt)
+        self.assertEqual(
+            datetime(2021, 9, 1, 11, 43, 49, 500000, tzinfo=timezone(timedelta(hours=4))),
+            codec.parse("2021-09-01T11:43:49.500+04:00"),
+        )
+        self.assertEqual(datetime(2023, 12, 30), codec.parse("2023-12-30"))
+        self.assertEqual(
+            datetime(2021, 12, 29, 14, 46, 55, tzinfo=timezone.utc),
+            codec.parse("2021-12-29T14:46:55Z"),
+        )
+        self.assertEqual(
+            datetime(2021, 12, 29, 14, 46, 55, 787123, tzinfo=timezone.utc),
+            codec.parse("2021-12-29T14:46:55.787123Z"),
+        )
+
+    def test_parsing_repeated_datetimes_succeeds(self) -> None:
+        codec = DatetimeCodec(maxsize=2)
+
+        first = codec.parse("2021-12-29T14:46:55.787Z")
+        self.assertIs(first, codec.parse("2021-12-29T14:46:55.787Z"))
+        self.assertEqual(1, codec.size)
+
+        second = codec.parse("2021-12-29T14:46:56.787Z")
+        self.assertIs(first, codec.parse("2021-12-29T14:46:55.787Z"))
+        codec.parse("2021-12-29T14:46:57.787Z")
+        self.assertEqual(2, codec.size)
+        self.assertIs(first, codec.parse("2021-12-29T14:46:55.787Z"))
+        self.assertIsNot(second, codec.parse("2021-12-29T14:46:56.787Z"))
+        self.assertEqual(second, codec.parse("2021-12-29T14:46:56.787Z"))
+
+    def test_parsing_without_memo_succeeds(self) -> None:
+        codec = DatetimeCodec(maxsize=0)
+
+        codec.parse("2021-12-29T14:46:55.787Z")
+
+        self.assertEqual(0, codec.size)
+
+    def test_invalid_maxsize_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "HINT"):
+            DatetimeCodec(maxsize=-1)
+
+    def test_parsing_invalid_datetimes_fails(self) -> None:
+        codec = DatetimeCodec()
+
+        with self.assertRaises(ValueError):
+            codec.parse("yesterday")
+        self.assertEqual(0, codec.size)
+
+    def test_batch_parsing_and_formatting_succeeds(self) -> None:
+        codec = DatetimeCodec()
+        values = ["2021-12-29T14:46:55.787Z", None, "2021-12-31T08:43:49.444-07:00"]
+
+        parsed = codec.parse_many(values)
+
+        self.assertEqual([codec.parse(values[0]), None, codec.parse(values[2])], parsed)  # type: ignore[arg-type]
+        self.assertEqual(values, codec.format_many(parsed))
+
+    def test_formatting_matches_helpers(self) -> None:
+        codec = DatetimeCodec()
+        dts = [
+            datetime(2021, 5, 30),
+            datetime(2021, 12, 29, 14, 46, 55, 456789),
+            datetime(2021, 12, 29, 14, 46, 55, 787999, tzinfo=timezone.utc),
+            datetime(2021, 12, 31, 8, 43, 49, 444000, tzinfo=timezone(timedelta(hours=-7))),
+        ]
+
+        self.assertEqual(
+            [
+                "2021-05-30T00:00:00.000",
+                "2021-12-29T14:46:55.456",
+                "2021-12-29T14:46:55.787Z",
+                "2021-12-31T08:43:49.444-07:00",
+            ],
+            [codec.format(dt) for dt in dts],
+        )
+        self.assertEqual([Helpers.to_rfc3339_datetime(dt) for dt in dts], codec.format_many(dts))
+
+    def test_formatting_utc_datetimes_matches_isoformat(self) -> None:
+        codec = DatetimeCodec()
+        dts = [
+            datetime(999, 1, 2, 3, 4, 5, 999999, tzinfo=timezone.utc),
+            datetime(2022, 3, 14, 8, 18, 38, 910000, tzinfo=timezone.utc),
+            datetime(2022, 3, 14, 8, 18, 38, 910000, tzinfo=timezone(timedelta(0))),
+        ]
+
+        self.assertEqual(
+            [dt.isoformat(timespec="milliseconds").replace("+00:00", "Z") for dt in dts],
+            codec.format_many(dts),
+        )
+
+    def test_columnar_rows_datetimes_succeeds(self) -> None:
+        rows = [
+            Row.build_obj(build_row_payload(f"ro_{i}"), controller=None, obj_exists=True)
+            for i in range(3)
+        ]
+        accessed = rows[0].created
+
+        columnar = Row.to_columnar(rows)
+
+        self.assertEqual([accessed] * 3, columnar["created"])
+        self.assertEqual([accessed] * 3, columnar["last_modified"])
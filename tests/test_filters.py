@@ -0,0 +1,229 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from unittest import mock
+from urllib.parse import urlencode
+
+from caplena.api import ApiOrdering
+from caplena.filters import ProjectsFilter, RowsFilter
+from caplena.helpers import Helpers
+from caplena.resources import ListedProject, Row
+
+
+def build_row_dict(
+    id: str,
+    *,
+    age: Optional[int],
+    text: str,
+    was_reviewed: bool,
+    created: str = "2022-03-14T08:18:38.910Z",
+    date: Optional[str] = None,
+) -> Dict[str, Any]:
+    return {
+        "id": id,
+        "created": created,
+        "last_modified": created,
+        "columns": [
+            {"ref": "age", "type": "numerical", "value": age},
+            {"ref": "date_col", "type": "date", "value": date},
+            {
+                "ref": "why",
+                "type": "text_to_analyze",
+                "value": text,
+                "was_reviewed": was_reviewed,
+                "sentiment_overall": "neutral",
+                "source_language": "en",
+                "translated_value": None,
+                "topics": [],
+            },
+        ],
+    }
+
+
+def build_rows() -> List[Row]:
+    rows = [
+        build_row_dict("ro_1", age=20, text="Great Price!", was_reviewed=True),
+        build_row_dict(
+            "ro_2",
+            age=35,
+            text="bad network",
+            was_reviewed=False,
+            created="2021-05-01T10:00:00.000Z",
+            date="2021-05-03T00:00:00Z",
+        ),
+        build_row_dict("ro_3", age=None, text="nice price", was_reviewed=False),
+        build_row_dict(
+            "ro_4", age=60, text="Okay", was_reviewed=True, created="2020-01-01T00:00:00Z"
+        ),
+    ]
+    return [Row.build_obj(row, controller=None, obj_exists=True) for row in rows]
+
+
+def build_project(id: str, *, name: str, tags: List[str], language: str) -> ListedProject:
+    return ListedProject.build_obj(
+        {
+            "id": id,
+            "name": name,
+            "owner": "us_1",
+            "tags": tags,
+            "upload_status": "succeeded",
+            "language": language,
+            "created": "2022-03-14T08:18:38.910Z",
+            "last_modified": "2022-03-14T08:18:38.910Z",
+            "translation_status": None,
+            "translation_engine": None,
+        },
+        controller=None,
+        obj_exists=True,
+    )
+
+
+class RowsFilterLocalTests(unittest.TestCase):
+    def assertMatches(self, expected: List[str], filt: RowsFilter) -> None:
+        rows = build_rows()
+        self.assertListEqual(expected, [row.id for row in filt.apply(rows)])
+        mask = filt.to_mask(Row.to_columnar(rows))
+        self.assertListEqual(expected, [row.id for row, keep in zip(rows, mask) if keep])
+
+    def test_filtering_numerical_columns_succeeds(self) -> None:
+        self.assertMatches(["ro_2", "ro_4"], RowsFilter.Columns.numerical(ref="age", gte=30))
+        self.assertMatches(["ro_1", "ro_2"], RowsFilter.Columns.numerical(ref="age", lt=[30, 40]))
+        self.assertMatches(["ro_1"], RowsFilter.Columns.numerical(ref="age", exact=20))
+
+    def test_filtering_text_to_analyze_columns_succeeds(self) -> None:
+        self.assertMatches(
+            ["ro_1", "ro_3"], RowsFilter.Columns.text_to_analyze(ref="why", contains__i="PRICE")
+        )
+        self.assertMatches(
+            ["ro_1", "ro_4"], RowsFilter.Columns.text_to_analyze(ref="why", was_reviewed=True)
+        )
+        self.assertMatches(["ro_4"], RowsFilter.Columns.text_to_analyze(ref="why", exact__i="okay"))
+
+    def test_filtering_dates_succeeds(self) -> None:
+        self.assertMatches(["ro_2", "ro_4"], RowsFilter.created(year__lt=2022))
+        self.assertMatches(
+            ["ro_1", "ro_3"], RowsFilter.created(gte=datetime(2022, 1, 1, tzinfo=timezone.utc))
+        )
+        self.assertMatches(
+            ["ro_2"], RowsFilter.Columns.date(ref="date_col", lte=datetime(2022, 1, 1))
+        )
+
+    def test_filtering_date_ranges_succeeds(self) -> None:
+        now = datetime.now(timezone.utc)
+        row = Row.build_obj(
+            build_row_dict(
+                "ro_5",
+                age=1,
+                text="",
+                was_reviewed=False,
+                created=now.isoformat(),
+                date=(now - timedelta(days=800)).isoformat(),
+            ),
+            controller=None,
+        )
+
+        self.assertEqual([row], RowsFilter.created(range="this_quarter").apply([row]))
+        self.assertEqual([row], RowsFilter.created(range="this_year").apply([row]))
+        self.assertEqual([], RowsFilter.created(range="last_year").apply([row]))
+        self.assertEqual(
+            [], RowsFilter.Columns.date(ref="date_col", range="this_year").apply([row])
+        )
+
+    def test_filtering_conjunctions_and_disjunctions_succeeds(self) -> None:
+        filt = (
+            RowsFilter.Columns.numerical(ref="age", gt=25)
+            | RowsFilter.Columns.text_to_analyze(ref="why", contains__i="great")  # noqa: W503
+        ) & RowsFilter.created(year=[2021, 2022])
+        self.assertMatches(["ro_1", "ro_2"], filt)
+
+    def test_filtering_unsupported_filter_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "cannot be evaluated locally"):
+            RowsFilter.construct(name="unknown", filters={"exact": 1}).to_predicate()
+
+
+class ProjectsFilterLocalTests(unittest.TestCase):
+    def test_filtering_projects_succeeds(self) -> None:
+        projects = [
+            build_project("pj_1", name="NPS Survey", tags=["nps"], language="en"),
+            build_project("pj_2", name="Reviews", tags=["nps", "app"], language="de"),
+            build_project("pj_3", name="Other", tags=[], language="en"),
+        ]
+        filt = ProjectsFilter.tags(["app", "nps"]) & ProjectsFilter.language("en")
+        self.assertEqual(["pj_1"], [p.id for p in filt.apply(projects)])
+        filt = ProjectsFilter.name(contains__i="rev") | ProjectsFilter.name(exact__i="other")
+        self.assertEqual(["pj_2", "pj_3"], [p.id for p in filt.apply(projects)])
+
+
+class ApiOrderingLocalTests(unittest.TestCase):
+    def test_sorting_objects_succeeds(self) -> None:
+        rows = build_rows()
+        ordering = ApiOrdering.desc("created") & ApiOrdering.asc("id")
+        self.assertListEqual(["ro_1", "ro_3", "ro_2", "ro_4"], [r.id for r in ordering.sort(rows)])
+
+        batch = Row.to_columnar(rows)
+        ordering = ApiOrdering.asc("columns.age") & ApiOrdering.desc("id")
+        self.assertListEqual([0, 1, 3, 2], ordering.argsort(batch))
+
+
+class ApiFilterSplitTests(unittest.TestCase):
+    def test_splitting_oversized_filters_succeeds(self) -> None:
+        values = [f"value-{i}" for i in range(100)]
+        filt = RowsFilter.Columns.text(ref="text", exact__i=values) & RowsFilter.created(year=2022)
+        shards = filt.split(max_length=300)
+
+        self.assertGreater(len(shards), 1)
+        for shard in shards:
+            self.assertLessEqual(len(urlencode(shard.to_query_params())), 300)
+            self.assertIn("year:2022", shard.to_query_params()["created"])
+        shard_values = [
+            value
+            for shard in shards
+            for value in shard._constraints["columns"][0]["text[text].exact.i"]
+        ]
+        self.assertEqual(values, shard_values)
+
+    def test_splitting_short_filters_returns_filter(self) -> None:
+        filt = RowsFilter.created(year=2022)
+        self.assertEqual([filt], filt.split(max_length=300))
+
+    def test_splitting_single_oversized_value_fails(self) -> None:
+        filt = RowsFilter.Columns.text(ref="text", exact__i="x" * 500)
+        with self.assertRaisesRegex(ValueError, "exceeds the maximum query length"):
+            filt.split(max_length=300)
+
+
+class ImmutableFilterTests(unittest.TestCase):
+    def test_combining_filters_shares_clauses(self) -> None:
+        tags = ProjectsFilter.tags(["a", "b"])
+        name = ProjectsFilter.name(contains__i="survey")
+        combined = tags & name & ProjectsFilter.language("en")
+
+        self.assertIs(tags._constraints["tags"][0], combined._constraints["tags"][0])
+        self.assertIs(name._constraints["name"][0], combined._constraints["name"][0])
+        self.assertEqual(["a", "b"], list(tags._constraints["tags"][0]["__default__"]))
+
+    def test_serializing_filters_is_cached(self) -> None:
+        filt = RowsFilter.Columns.text(ref="text", exact__i=["a:b", "c;d", "e"])
+        combined = filt & RowsFilter.created(year=2022)
+
+        with mock.patch.object(
+            Helpers, "build_escaped_filter_str", wraps=Helpers.build_escaped_filter_str
+        ) as escape:
+            params = combined.to_query_params()
+            params["columns"] = "modified"
+            self.assertEqual(params["created"], combined.to_query_params()["created"])
+            self.assertNotEqual("modified", combined.to_query_params()["columns"])
+            filt.to_query_params()
+            self.assertEqual(4, escape.call_count)
+
+    def test_modifying_filters_fails(self) -> None:
+        filt = RowsFilter.created(year=2022)
+        with self.assertRaisesRegex(AttributeError, "immutable"):
+            filt._has_conjunction = True
+
+    def test_combining_orderings_does_not_modify_operands(self) -> None:
+        first = ApiOrdering.asc("created")
+        combined = first & ApiOrdering.desc("name")
+
+        self.assertEqual({"order_by": "asc:created"}, first.to_query_params())
+        self.assertEqual({"order_by": "asc:created;desc:name"}, combined.to_query_params())
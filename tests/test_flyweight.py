@@ -0,0 +1,119 @@
+import json
+import pickle
+import unittest
+from typing import List
+
+from caplena.endpoints.row_parser import RowParser
+from caplena.flyweight import FlyweightTable
+from caplena.resources import Row
+from tests.common import build_controller, build_row_payload
+
+
+def build_rows(project: str = "pj_1") -> List[Row]:
+    controller = build_controller()
+    payload = json.loads(json.dumps([build_row_payload(f"ro_{i}") for i in range(2)]))
+    return [
+        Row.build_obj(row, controller=controller, obj_exists=True, metadata={"project": project})
+        for row in payload
+    ]
+
+
+class FlyweightTableTests(unittest.TestCase):
+    def test_interning_values_succeeds(self) -> None:
+        table = FlyweightTable("pj_1")
+        first, second = "".join(["our_", "strengths"]), "".join(["our_", "strengths"])
+
+        self.assertIsNot(first, second)
+        self.assertIs(table.intern(first), table.intern(second))
+        self.assertEqual(42, table.intern(42))
+        self.assertEqual(1, table.size)
+
+    def test_interning_topic_descriptors_succeeds(self) -> None:
+        table = FlyweightTable("pj_1")
+        topic = build_row_payload()["columns"][1]["topics"][0]
+
+        descriptor = table.topic_descriptor(topic)
+
+        self.assertIs(descriptor, table.topic_descriptor(dict(topic)))
+        self.assertNotIn("sentiment", descriptor)
+        self.assertIsNot(descriptor, table.topic_descriptor({**topic, "label": "other"}))
+
+    def test_interning_beyond_maxsize_succeeds(self) -> None:
+        table = FlyweightTable("pj_1", maxsize=2)
+        first, second = "".join(["fir", "st"]), "".join(["sec", "ond"])
+        table.intern(first)
+        table.intern(second)
+        table.intern(first)
+
+        third = "".join(["thi", "rd"])
+        self.assertIs(third, table.intern(third))
+        self.assertEqual(2, table.size)
+        self.assertIs(first, table.intern("".join(["fir", "st"])))
+        second_copy = "".join(["sec", "ond"])
+        self.assertIs(second_copy, table.intern(second_copy))
+
+    def test_modifying_shared_metadata_fails(self) -> None:
+        table = FlyweightTable("pj_1")
+
+        with self.assertRaisesRegex(TypeError, "HINT"):
+            table.metadata["project"] = "pj_2"
+        with self.assertRaisesRegex(TypeError, "HINT"):
+            table.column_metadata.update(owner="someone")
+        self.assertEqual({"project": "pj_1"}, table.metadata)
+        self.assertEqual({}, pickle.loads(pickle.dumps(table.column_metadata)))
+
+    def test_tables_are_scoped_to_controllers(self) -> None:
+        controller = build_controller()
+        table = controller._flyweights("pj_1")
+
+        self.assertIs(table, controller._flyweights("pj_1"))
+        self.assertIsNot(table, controller._flyweights("pj_2"))
+        self.assertIsNot(table, build_controller()._flyweights("pj_1"))
+        self.assertEqual("pj_1", pickle.loads(pickle.dumps(table)).project)
+
+
+class RowInterningTests(unittest.TestCase):
+    def test_rows_share_repeated_values(self) -> None:
+        first, second = build_rows()
+
+        self.assertIs(first._metadata, second._metadata)
+        self.assertIs(first.columns[0].ref, second.columns[0].ref)
+        first_topic, second_topic = first.columns[1].topics[0], second.columns[1].topics[0]
+        self.assertIs(first_topic.label, second_topic.label)
+        self.assertIs(first_topic.sentiment_label, second_topic.sentiment_label)
+        self.assertIs(first.columns[0]._metadata, second.columns[1]._metadata)
+        self.assertIs(first.columns[0]._metadata, second_topic._metadata)
+        self.assertEqual({}, first_topic._metadata)
+
+    def test_modifying_interned_rows_succeeds(self) -> None:
+        first, second = build_rows()
+
+        first.columns[1].topics[0].sentiment = "negative"
+
+        self.assertEqual("positive", second.columns[1].topics[0].sentiment)
+        self.assertFalse(second.is_modified)
+        self.assertEqual(
+            {"columns": [{"ref": "our_strengths", "topics": [{"sentiment": "negative"}]}]},
+            first.modified_dict(),
+        )
+
+    def test_modifying_interned_row_metadata_fails(self) -> None:
+        first, second = build_rows()
+
+        with self.assertRaisesRegex(TypeError, "HINT"):
+            first._metadata["project"] = "pj_2"
+        with self.assertRaisesRegex(TypeError, "HINT"):
+            first.columns[0]._metadata["owner"] = "someone"
+        self.assertEqual({"project": "pj_1"}, second._metadata)
+        self.assertEqual({}, second.columns[1].topics[0]._metadata)
+
+    def test_pickling_interned_rows_succeeds(self) -> None:
+        # note: rows with a controller cannot be pickled, so this row is parsed without one
+        obj = json.loads(json.dumps(build_row_payload()))
+        parser = RowParser.from_row("pj_1", obj, flyweights=FlyweightTable("pj_1"))
+        row = parser.parse(obj, controller=None)
+
+        restored = pickle.loads(pickle.dumps(row))
+
+        self.assertEqual(row, restored)
+        self.assertEqual(row.columns[1].topics[0].label, restored.columns[1].topics[0].label)
@@ -0,0 +1,210 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import requests_mock
+
+from caplena.http.http_cache import (
+    FileHttpCache,
+    HttpCache,
+    HttpCacheEntry,
+    InMemoryHttpCache,
+)
+from caplena.http.http_response import HttpResponse
+from caplena.http.requests_http_client import RequestsHttpClient
+from caplena.http.sqlite_http_cache import SqliteHttpCache
+from tests.common import build_controller, build_project_payload
+
+PROJECT_URI = "http://localhost:8000/v2/projects/pj_1"
+
+
+class HttpCacheTests(unittest.TestCase):
+    def test_revalidating_cached_response_succeeds(self) -> None:
+        cache = InMemoryHttpCache()
+        controller = build_controller(http_cache=cache)
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(
+                PROJECT_URI,
+                [
+                    {"json": build_project_payload(), "headers": {"ETag": '"v1"'}},
+                    {"status_code": 304, "headers": {"ETag": '"v1"'}},
+                ],
+            )
+            first = controller.retrieve(id="pj_1")
+            second = controller.retrieve(id="pj_1")
+
+            self.assertEqual(2, mocked.call_count)
+            self.assertNotIn("If-None-Match", mocked.request_history[0].headers)
+            self.assertEqual('"v1"', mocked.request_history[1].headers["If-None-Match"])
+
+        self.assertEqual(first, second)
+        self.assertIsNot(first, second)
+        self.assertEqual(["my-tag"], second.tags)
+
+    def test_modified_response_replaces_cached_response(self) -> None:
+        cache = InMemoryHttpCache()
+        controller = build_controller(http_cache=cache)
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(
+                PROJECT_URI,
+                [
+                    {
+                        "json": build_project_payload(),
+                        "headers": {"Last-Modified": "Mon, 14 Mar 2022 08:18:38 GMT"},
+                    },
+                    {"json": build_project_payload(name="Renamed"), "headers": {"ETag": '"v2"'}},
+                    {"status_code": 304},
+                ],
+            )
+            controller.retrieve(id="pj_1")
+            self.assertEqual("Renamed", controller.retrieve(id="pj_1").name)
+            self.assertEqual("Renamed", controller.retrieve(id="pj_1").name)
+
+            self.assertEqual(
+                "Mon, 14 Mar 2022 08:18:38 GMT",
+                mocked.request_history[1].headers["If-Modified-Since"],
+            )
+            self.assertEqual('"v2"', mocked.request_history[2].headers["If-None-Match"])
+
+    def test_cache_keys_differ_per_api_key(self) -> None:
+        cache = InMemoryHttpCache()
+        key_a = cache.build_key(uri=PROJECT_URI, headers={"Caplena-API-Key": "a"})
+        key_b = cache.build_key(uri=PROJECT_URI, headers={"Caplena-API-Key": "b"})
+
+        self.assertNotEqual(key_a, key_b)
+        self.assertNotIn("Caplena", key_a)
+
+    def test_storing_responses_on_disk_succeeds(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            cache = FileHttpCache(directory=directory)
+            response = HttpResponse(
+                status_code=200, reason="OK", text='{"id": "pj_1"}', headers={"ETag": '"v1"'}
+            )
+            cache.set("key", cache.build_entry(uri=PROJECT_URI, response=response))
+
+            entry = FileHttpCache(directory=directory).get("key")
+            self.assertIsNotNone(entry)
+            assert entry is not None
+            self.assertEqual('"v1"', entry.etag)
+            self.assertEqual({"id": "pj_1"}, entry.response.json)
+
+            cache.clear()
+            self.assertIsNone(cache.get("key"))
+
+    def test_using_fresh_responses_without_revalidation_succeeds(self) -> None:
+        cache = InMemoryHttpCache(ttls={"/projects/{id}": 60, "/projects/{id}/rows": 0})
+        controller = build_controller(http_cache=cache)
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(PROJECT_URI, json=build_project_payload())
+            controller.retrieve(id="pj_1")
+            controller.retrieve(id="pj_1")
+            self.assertEqual(1, mocked.call_count)
+
+    def test_cached_responses_are_not_shared(self) -> None:
+        for ttl, status_code in [(60, 200), (0, 304)]:
+            cache = InMemoryHttpCache(default_ttl=ttl)
+            http_client = RequestsHttpClient().with_options(cache=cache)
+
+            with requests_mock.Mocker() as mocker:
+                mocker.get(
+                    PROJECT_URI,
+                    [
+                        {"json": {"tags": ["my-tag"]}, "headers": {"ETag": '"v1"'}},
+                        {"status_code": status_code, "headers": {"ETag": '"v1"'}},
+                    ],
+                )
+                key = cache.build_key(uri=PROJECT_URI, headers={})
+                first = http_client.request(PROJECT_URI)
+                assert first.json is not None
+                first.json["tags"].append("modified")
+                entry = cache.get(key)
+                second = http_client.request(PROJECT_URI)
+                third = http_client.request(PROJECT_URI)
+
+            self.assertEqual({"tags": ["my-tag"]}, second.json)
+            self.assertIsNot(second, third)
+            # note: revalidated entries are replaced instead of being modified in place
+            self.assertEqual(status_code == 304, entry is not cache.get(key))
+
+    def test_writing_resources_invalidates_cached_responses(self) -> None:
+        cache = InMemoryHttpCache(default_ttl=60)
+        controller = build_controller(http_cache=cache)
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(PROJECT_URI, json=build_project_payload())
+            mocker.delete(PROJECT_URI + "/rows/ro_1", status_code=204)
+            controller.retrieve(id="pj_1")
+            controller.remove_row(p_id="pj_1", r_id="ro_1")
+            controller.retrieve(id="pj_1")
+            self.assertEqual(2, mocked.call_count)
+
+    def test_matching_affected_paths_succeeds(self) -> None:
+        self.assertTrue(HttpCache.is_affected("/v2/projects/pj_1", "/v2/projects/pj_1/rows/ro_1"))
+        self.assertTrue(HttpCache.is_affected("/v2/projects/pj_1/rows", "/v2/projects/pj_1"))
+        self.assertTrue(HttpCache.is_affected("/v2/projects", "/v2/projects/pj_1"))
+        self.assertFalse(HttpCache.is_affected("/v2/projects/pj_12", "/v2/projects/pj_1"))
+
+
+class SqliteHttpCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cache.sqlite3")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def build_entry(self, cache: HttpCache, uri: str, text: str) -> HttpCacheEntry:
+        response = HttpResponse(status_code=200, reason="OK", text=text, headers={"ETag": '"1"'})
+        return cache.build_entry(uri=uri, response=response)
+
+    def test_sharing_responses_between_caches_succeeds(self) -> None:
+        writer = SqliteHttpCache(path=self.path, ttls={"/projects/{id}": 60})
+        writer.set("key", self.build_entry(writer, PROJECT_URI, '{"id": "pj_1"}'))
+
+        entry = SqliteHttpCache(path=self.path).get("key")
+        assert entry is not None
+        self.assertTrue(entry.is_fresh)
+        self.assertEqual({"id": "pj_1"}, entry.response.json)
+
+    def test_evicting_least_recently_used_responses_succeeds(self) -> None:
+        cache = SqliteHttpCache(path=self.path, max_size=25)
+        cache.set("a", self.build_entry(cache, PROJECT_URI, "a" * 10))
+        cache.set("b", self.build_entry(cache, PROJECT_URI + "/rows", "b" * 10))
+        cache.get("a")
+        cache.set("c", self.build_entry(cache, "http://localhost:8000/v2/projects", "c" * 10))
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    @mock.patch.object(SqliteHttpCache, "MAX_PENDING_ACCESSES", 2)
+    def test_reading_responses_does_not_write(self) -> None:
+        cache = SqliteHttpCache(path=self.path)
+        cache.set("a", self.build_entry(cache, PROJECT_URI, "a" * 10))
+        cache.set("b", self.build_entry(cache, PROJECT_URI + "/rows", "b" * 10))
+        connection = cache._connect()
+        changes = connection.total_changes
+
+        cache.get("a")
+        self.assertEqual(changes, connection.total_changes)
+        self.assertFalse(connection.in_transaction)
+
+        cache.get("a")
+        cache.get("b")
+        self.assertEqual(changes + 2, connection.total_changes)
+        self.assertFalse(connection.in_transaction)
+
+    def test_invalidating_responses_succeeds(self) -> None:
+        cache = SqliteHttpCache(path=self.path)
+        cache.set("project", self.build_entry(cache, PROJECT_URI, "{}"))
+        cache.set("rows", self.build_entry(cache, PROJECT_URI + "/rows?page=1", "{}"))
+        cache.set("other", self.build_entry(cache, PROJECT_URI + "2", "{}"))
+
+        cache.invalidate(PROJECT_URI + "/rows/ro_1")
+        self.assertIsNone(cache.get("project"))
+        self.assertIsNone(cache.get("rows"))
+        self.assertIsNotNone(cache.get("other"))
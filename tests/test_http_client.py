@@ -0,0 +1,82 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import requests_mock
+from requests.sessions import Session
+
+from caplena.api.api_base_uri import ApiBaseUri
+from caplena.configuration import Configuration
+from caplena.http.http_client import HttpClient, HttpRetry
+from caplena.http.requests_http_client import RequestsHttpClient
+from tests.common import common_api_key
+
+URI = "http://localhost:8000/v2/projects"
+
+
+def build_config(http_client: RequestsHttpClient, *, max_retries: int) -> Configuration:
+    return Configuration(
+        api_key=common_api_key,
+        http_client=http_client,
+        api_base_uri=ApiBaseUri.LOCAL,
+        timeout=max_retries * 10,
+        max_retries=max_retries,
+    )
+
+
+class HttpRetryTests(unittest.TestCase):
+    def test_retry_policies_are_immutable(self) -> None:
+        retry = HttpRetry(max_retries=2)
+
+        with self.assertRaises(AttributeError):
+            retry.max_retries = 3  # type: ignore[misc]
+        self.assertEqual(HttpRetry(max_retries=2, backoff_factor=2), retry)
+        self.assertNotEqual(HttpRetry(max_retries=3), retry)
+
+
+class HttpClientTests(unittest.TestCase):
+    def test_configurations_do_not_modify_shared_client(self) -> None:
+        http_client = RequestsHttpClient()
+
+        first = build_config(http_client, max_retries=1)
+        second = build_config(http_client, max_retries=2)
+
+        self.assertEqual(HttpRetry(max_retries=1), first.http_client.retry)
+        self.assertEqual(20, second.http_client.timeout)
+        self.assertEqual(HttpRetry(max_retries=2), second.http_client.retry)
+        self.assertIs(HttpClient.DEFAULT_RETRY, http_client.retry)
+        self.assertEqual(HttpRetry.DEFAULT_MAX_RETRIES, HttpClient.DEFAULT_RETRY.max_retries)
+        self.assertEqual(HttpClient.DEFAULT_TIMEOUT, http_client.timeout)
+
+    def test_threads_use_own_sessions(self) -> None:
+        http_client = RequestsHttpClient()
+        sessions: List[Session] = []
+
+        thread = threading.Thread(target=lambda: sessions.append(http_client.session))
+        thread.start()
+        thread.join()
+
+        self.assertIs(http_client.session, http_client.session)
+        self.assertIsNot(http_client.session, sessions[0])
+        self.assertIs(http_client.session.get_adapter(URI), sessions[0].get_adapter(URI))
+
+    def test_given_session_is_shared_by_threads(self) -> None:
+        session = Session()
+        http_client = RequestsHttpClient(session=session)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            shared = executor.submit(lambda: http_client.session).result()
+
+        self.assertIs(session, shared)
+
+    def test_sending_requests_from_many_threads_succeeds(self) -> None:
+        http_client = build_config(RequestsHttpClient(), max_retries=1).http_client
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(URI, json={"count": 0})
+            with ThreadPoolExecutor(max_workers=64) as executor:
+                responses = list(executor.map(lambda _: http_client.request(URI), range(256)))
+
+            self.assertEqual(256, mocker.call_count)
+        self.assertTrue(all(response.json == {"count": 0} for response in responses))
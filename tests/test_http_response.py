@@ -0,0 +1,48 @@
+import unittest
+
+import requests_mock
+
+from caplena.http.http_client import HttpMethod
+from caplena.http.http_response import HttpResponse
+from caplena.http.requests_http_client import RequestsHttpClient
+
+PROJECT_URI = "http://localhost:8000/v2/projects/pj_1"
+
+
+class HttpResponseTests(unittest.TestCase):
+    def test_decoding_json_from_bytes_succeeds(self) -> None:
+        response = HttpResponse(
+            status_code=200, reason="OK", content='{"name": "Überblick"}'.encode()
+        )
+
+        self.assertEqual({"name": "Überblick"}, response.json)
+        self.assertFalse(hasattr(response, "_text"))
+        self.assertEqual('{"name": "Überblick"}', response.text)
+
+    def test_constructing_response_from_text_succeeds(self) -> None:
+        response = HttpResponse(status_code=200, reason="OK", text='{"id": "pj_1"}')
+
+        self.assertEqual(b'{"id": "pj_1"}', response.content)
+        self.assertEqual({"id": "pj_1"}, response.json)
+
+    def test_constructing_response_without_body_succeeds(self) -> None:
+        response = HttpResponse(status_code=304, reason="Not Modified")
+
+        self.assertIsNone(response.content)
+        self.assertIsNone(response.text)
+        self.assertIsNone(response.json)
+
+    def test_constructing_response_from_content_and_text_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "either the `content` or the `text`"):
+            HttpResponse(status_code=200, reason="OK", content=b"{}", text="{}")
+
+    def test_receiving_response_keeps_raw_bytes(self) -> None:
+        client = RequestsHttpClient()
+        with requests_mock.Mocker() as mocker:
+            mocker.get(PROJECT_URI, json={"id": "pj_1"})
+            response = client.request(PROJECT_URI, method=HttpMethod.GET)
+
+        self.assertEqual(b'{"id": "pj_1"}', response.content)
+        self.assertEqual({"id": "pj_1"}, response.json)
+        # note: the body is not logged with the default logging level, so it is never decoded
+        self.assertFalse(hasattr(response, "_text"))
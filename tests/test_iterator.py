@@ -0,0 +1,179 @@
+import unittest
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests_mock
+
+from caplena.iterator import CaplenaIterator
+from caplena.resources import Row
+from tests.common import build_controller, build_row_payload
+
+PAGE_SIZE = 3
+
+
+class PageFetcher:
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self.fetched: List[int] = []
+
+    def __call__(self, page: int) -> Tuple[List[Any], bool, int]:
+        self.fetched.append(page)
+        end = page * PAGE_SIZE
+        return self.items[end - PAGE_SIZE : end], end < len(self.items), len(self.items)
+
+
+def build_iterator(
+    items: List[Any], *, limit: Optional[int] = None
+) -> Tuple[CaplenaIterator[Any], PageFetcher]:
+    fetcher = PageFetcher(items)
+    return CaplenaIterator(results_fetcher=fetcher, limit=limit, page_size=PAGE_SIZE), fetcher
+
+
+class CaplenaIteratorTests(unittest.TestCase):
+    def test_iterating_pages_succeeds(self) -> None:
+        iterator, fetcher = build_iterator(list(range(8)))
+
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6, 7]], list(iterator.iter_pages()))
+        self.assertEqual([1, 2, 3], fetcher.fetched)
+        self.assertEqual(list(range(8)), list(iterator))
+
+    def test_iterating_pages_respects_limit(self) -> None:
+        iterator, fetcher = build_iterator(list(range(8)), limit=4)
+
+        self.assertEqual([[0, 1, 2], [3]], list(iterator.iter_pages()))
+        self.assertEqual([1, 2], fetcher.fetched)
+
+    def test_iterating_pages_hands_over_fetched_page(self) -> None:
+        items: List[Dict[str, int]] = [{"value": i} for i in range(4)]
+        iterator, fetcher = build_iterator(items)
+        self.assertEqual(4, iterator.count)
+
+        pages = list(iterator.iter_pages())
+
+        self.assertIs(items[0], pages[0][0])
+        self.assertEqual([1, 2], fetcher.fetched)
+        self.assertEqual(items, list(iterator))
+        self.assertEqual(4, len(iterator))
+
+    def test_iterating_pages_of_partially_consumed_iterator_succeeds(self) -> None:
+        items: List[Dict[str, int]] = [{"value": i} for i in range(4)]
+        iterator, _ = build_iterator(items)
+        self.assertEqual({"value": 0}, next(iterator))
+
+        pages = list(iterator.iter_pages())
+
+        self.assertEqual([items[1:3], items[3:]], pages)
+        self.assertIs(items[1], pages[0][0])
+        self.assertEqual({"value": 1}, next(iterator))
+
+    def test_iterating_pages_of_partially_consumed_iterator_respects_limit(self) -> None:
+        iterator, fetcher = build_iterator(list(range(8)), limit=5)
+        self.assertEqual([0, 1, 2, 3], [next(iterator) for _ in range(4)])
+
+        self.assertEqual([[4]], list(iterator.iter_pages()))
+        self.assertEqual([1, 2], fetcher.fetched)
+        self.assertEqual(4, next(iterator))
+
+    def test_iterating_batches_succeeds(self) -> None:
+        iterator, _ = build_iterator(list(range(8)))
+
+        self.assertEqual([[0, 1], [2, 3], [4, 5], [6, 7]], list(iterator.iter_batches(2)))
+        self.assertEqual([[0, 1, 2], [3, 4, 5], [6, 7]], list(iterator.iter_batches(3)))
+        self.assertEqual([[0, 1, 2, 3, 4], [5, 6, 7]], list(iterator.iter_batches(5)))
+        self.assertEqual([list(range(8))], list(iterator.iter_batches(100)))
+
+    def test_iterating_batches_with_invalid_size_fails(self) -> None:
+        iterator, _ = build_iterator(list(range(8)))
+
+        with self.assertRaisesRegex(ValueError, "HINT"):
+            iterator.iter_batches(0)
+
+    def test_iterating_columnar_batches_succeeds(self) -> None:
+        rows = [
+            Row.build_obj(build_row_payload(f"ro_{i}", age=i), controller=None, obj_exists=True)
+            for i in range(4)
+        ]
+        iterator, _ = build_iterator(rows)
+
+        batches = list(iterator.iter_batches(2, columnar=True))
+
+        self.assertEqual(2, len(batches))
+        self.assertEqual(["ro_0", "ro_1"], batches[0]["id"])
+        self.assertEqual([2, 3], batches[1]["columns.customer_age"])
+
+    def test_accessing_items_caches_pages(self) -> None:
+        iterator, fetcher = build_iterator(list(range(100)))
+
+        self.assertEqual([0, 31, 1, 32], [iterator[0], iterator[31], iterator[1], iterator[32]])
+        self.assertEqual([1, 11], fetcher.fetched)
+
+    def test_accessing_items_with_limit_succeeds(self) -> None:
+        iterator, _ = build_iterator(list(range(10)), limit=4)
+
+        self.assertEqual(3, iterator[3])
+        self.assertEqual(3, iterator[-1])
+        with self.assertRaises(IndexError):
+            iterator[4]
+
+    def test_accessing_items_with_negative_index_succeeds(self) -> None:
+        iterator, _ = build_iterator(list(range(10)))
+
+        self.assertEqual(9, iterator[-1])
+        self.assertEqual(0, iterator[-10])
+        with self.assertRaises(IndexError):
+            iterator[-11]
+        with self.assertRaises(IndexError):
+            iterator[10]
+
+    def test_accessing_items_out_of_range_fails_without_fetching(self) -> None:
+        iterator, fetcher = build_iterator(list(range(10)))
+
+        with self.assertRaisesRegex(IndexError, "Index 12 is out of range for 10 results."):
+            iterator[12]
+        with self.assertRaisesRegex(IndexError, "Index 100 is out of range for 10 results."):
+            iterator[100]
+        self.assertEqual([1], fetcher.fetched)
+
+    def test_slicing_items_succeeds(self) -> None:
+        iterator, fetcher = build_iterator(list(range(20)))
+
+        self.assertEqual([4, 5, 6, 7], iterator[4:8])
+        self.assertEqual([1, 2, 3], sorted(fetcher.fetched))
+        self.assertEqual([18, 19], iterator[-2:])
+        self.assertEqual([0, 5, 10, 15], iterator[::5])
+        self.assertEqual([], iterator[30:40])
+        self.assertEqual([1, 2, 3, 4, 6, 7], sorted(fetcher.fetched))
+
+
+class PageSizeTests(unittest.TestCase):
+    def test_sizing_pages_for_limit_succeeds(self) -> None:
+        self.assertEqual(30, CaplenaIterator.page_size_for(None))
+        self.assertEqual(1, CaplenaIterator.page_size_for(1))
+        self.assertEqual(30, CaplenaIterator.page_size_for(30))
+        self.assertEqual(18, CaplenaIterator.page_size_for(35))
+        self.assertEqual(25, CaplenaIterator.page_size_for(100))
+
+    def test_listing_rows_with_limit_requests_small_pages(self) -> None:
+        controller = build_controller()
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            page, limit = int(request.qs["page"][0]), int(request.qs["limit"][0])
+            ids = range((page - 1) * limit, min(page * limit, 100))
+            return {
+                "results": [build_row_payload(f"ro_{i}") for i in ids],
+                "next_url": "next" if page * limit < 100 else None,
+                "count": 100,
+            }
+
+        with requests_mock.Mocker() as mocker:
+            listed = mocker.get("http://localhost:8000/v2/projects/pj_1/rows", json=respond)
+
+            peeked = [row.id for row in controller.list_rows(id="pj_1", limit=5)]
+            self.assertEqual(1, listed.call_count)
+            self.assertEqual(["5"], listed.last_request.qs["limit"])
+
+            rows = controller.list_rows(id="pj_1", limit=35)
+            self.assertEqual("ro_34", rows[34].id)
+            self.assertEqual(35, len([row for row in rows]))
+
+        self.assertEqual([f"ro_{i}" for i in range(5)], peeked)
+        self.assertEqual(["18"], listed.last_request.qs["limit"])
@@ -0,0 +1,85 @@
+import importlib.util
+import unittest
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List
+
+import requests_mock
+
+from caplena.http.http_client import HttpMethod
+from caplena.http.json_codec import (
+    JsonCodec,
+    MsgspecCodec,
+    OrjsonCodec,
+    StdlibJsonCodec,
+)
+from caplena.http.requests_http_client import RequestsHttpClient
+
+HAS_ORJSON = importlib.util.find_spec("orjson") is not None
+HAS_MSGSPEC = importlib.util.find_spec("msgspec") is not None
+
+PAYLOAD: Dict[str, Any] = {
+    "name": "Überblick",
+    "created": datetime(2022, 3, 4, 5, 6, 7, 890123, tzinfo=timezone.utc),
+    "values": [1, 2.5, None, True],
+}
+
+
+class JsonCodecTests(unittest.TestCase):
+    def assertCodecRoundTrips(self, codec: JsonCodec) -> None:
+        decoded = codec.decode(codec.encode(PAYLOAD))
+        self.assertEqual("Überblick", decoded["name"])
+        self.assertEqual([1, 2.5, None, True], decoded["values"])
+
+    def test_stdlib_codec_succeeds(self) -> None:
+        codec = StdlibJsonCodec()
+        local = datetime(2022, 3, 4, 5, 6, 7, 890123, tzinfo=timezone(timedelta(hours=2)))
+
+        self.assertCodecRoundTrips(codec)
+        self.assertEqual('"2022-03-04T05:06:07.890+02:00"', codec.encode(local).decode("utf-8"))
+        self.assertEqual("2022-03-04T05:06:07.890Z", codec.decode(codec.encode(PAYLOAD))["created"])
+
+    @unittest.skipUnless(HAS_ORJSON, "orjson is not installed")
+    def test_orjson_codec_encodes_like_stdlib(self) -> None:
+        codec = OrjsonCodec()
+
+        self.assertCodecRoundTrips(codec)
+        self.assertEqual(
+            StdlibJsonCodec().decode(StdlibJsonCodec().encode(PAYLOAD)),
+            codec.decode(codec.encode(PAYLOAD)),
+        )
+
+    def test_codecs_encode_identical_bytes(self) -> None:
+        codecs: List[JsonCodec] = [StdlibJsonCodec()]
+        if HAS_ORJSON:
+            codecs.append(OrjsonCodec())
+        if HAS_MSGSPEC:
+            codecs.append(MsgspecCodec())
+        payload = {**PAYLOAD, "rows": [{"created": PAYLOAD["created"], "tags": ("a", "b")}]}
+
+        encoded = [codec.encode(payload) for codec in codecs]
+
+        self.assertEqual([encoded[0]] * len(codecs), encoded)
+        self.assertIn('"2022-03-04T05:06:07.890Z"', encoded[0].decode("utf-8"))
+
+    @unittest.skipUnless(HAS_MSGSPEC, "msgspec is not installed")
+    def test_msgspec_codec_succeeds(self) -> None:
+        codec = MsgspecCodec()
+
+        self.assertCodecRoundTrips(codec)
+        self.assertEqual("2022-03-04T05:06:07.890Z", codec.decode(codec.encode(PAYLOAD))["created"])
+
+    def test_default_codec_succeeds(self) -> None:
+        expected = OrjsonCodec if HAS_ORJSON else MsgspecCodec if HAS_MSGSPEC else StdlibJsonCodec
+        self.assertIsInstance(JsonCodec.default(), expected)
+
+    def test_requesting_with_codec_succeeds(self) -> None:
+        client = RequestsHttpClient(json_codec=StdlibJsonCodec())
+        uri = "http://localhost:8000/v2/projects"
+
+        with requests_mock.Mocker() as mocker:
+            mocker.post(uri, json={"id": "pj_1"})
+            response = client.request(uri, method=HttpMethod.POST, json=PAYLOAD)
+
+            self.assertEqual("2022-03-04T05:06:07.890Z", mocker.last_request.json()["created"])
+        self.assertIs(client.json_codec, response.json_codec)
+        self.assertEqual({"id": "pj_1"}, response.json)
@@ -0,0 +1,98 @@
+import copy
+import pickle
+import unittest
+from datetime import datetime, timezone
+
+from caplena.lazy import LazyValue
+from caplena.list import CaplenaList
+from caplena.resources import ListedProject, Row
+from tests.common import build_project_payload, build_row_payload
+
+
+class LazyValueTests(unittest.TestCase):
+    def test_parsing_lazy_value_succeeds(self) -> None:
+        lazy = LazyValue([1, 2], list)
+
+        first, second = lazy.parse(), lazy.parse()
+        self.assertEqual([1, 2], first)
+        self.assertIsNot(first, second)
+        self.assertIs(lazy, copy.deepcopy(lazy))
+
+    def test_lazy_value_equivalence_succeeds(self) -> None:
+        self.assertEqual(LazyValue({"a": 1}, dict), LazyValue({"a": 1}, dict))
+        self.assertNotEqual(LazyValue({"a": 1}, dict), LazyValue({"a": 2}, dict))
+        self.assertNotEqual(LazyValue({"a": 1}, dict), {"a": 1})
+
+
+class LazyParsingTests(unittest.TestCase):
+    def test_unaccessed_fields_stay_lazy(self) -> None:
+        row = Row.build_obj(build_row_payload(), controller=None, obj_exists=True)
+
+        self.assertIsInstance(row._attrs["columns"], LazyValue)
+        self.assertIsInstance(row._attrs["created"], LazyValue)
+        self.assertEqual(datetime(2022, 3, 14, 8, 18, 38, 910000, timezone.utc), row.last_modified)
+        self.assertIsInstance(row._attrs["columns"], LazyValue)
+
+        column = row.columns[1]
+        self.assertIsInstance(row._attrs["columns"], CaplenaList)
+        self.assertIsInstance(column._attrs["topics"], LazyValue)
+        self.assertEqual("cd_1", column.topics[0].id)
+        self.assertFalse(row.is_modified)
+
+    def test_lazily_parsed_objects_equivalence_succeeds(self) -> None:
+        payload = build_row_payload()
+        row = Row.build_obj(payload, controller=None, obj_exists=True)
+        other = Row.build_obj(payload, controller=None, obj_exists=True)
+
+        self.assertEqual(row, other)
+        self.assertIsInstance(row._attrs["columns"], LazyValue)
+
+        # note: comparing parsed to lazy fields parses the lazy ones
+        other.columns
+        self.assertEqual(row, other)
+        self.assertEqual(other.dict(), row.dict())
+
+        other.columns[0].value = 7
+        self.assertNotEqual(row, other)
+
+    def test_modifying_lazily_parsed_fields_succeeds(self) -> None:
+        row = Row.build_obj(build_row_payload(), controller=None, obj_exists=True)
+
+        row.columns[0].value = 7
+        row.columns[1].topics[0].sentiment = "negative"
+
+        self.assertTrue(row.is_modified)
+        self.assertEqual(
+            {
+                "columns": [
+                    {"ref": "customer_age", "value": 7},
+                    {"ref": "our_strengths", "topics": [{"sentiment": "negative"}]},
+                ]
+            },
+            row.modified_dict(),
+        )
+
+    def test_replacing_lazy_fields_succeeds(self) -> None:
+        payload = build_row_payload()
+        payload["columns"].append(
+            {"ref": "visited", "type": "date", "value": "2022-01-05T10:00:00.000Z"}
+        )
+        row = Row.build_obj(payload, controller=None, obj_exists=True)
+        column = row.columns[2]
+        self.assertIsInstance(column._attrs["value"], LazyValue)
+
+        column.value = datetime(2022, 1, 6, tzinfo=timezone.utc)
+
+        self.assertTrue(row.is_modified)
+        self.assertEqual(
+            {"columns": [{"ref": "visited", "value": datetime(2022, 1, 6, tzinfo=timezone.utc)}]},
+            row.modified_dict(),
+        )
+
+    def test_pickling_lazily_parsed_objects_succeeds(self) -> None:
+        project = ListedProject.build_obj(build_project_payload(), controller=None, obj_exists=True)
+
+        restored = pickle.loads(pickle.dumps(project))
+
+        self.assertEqual(project, restored)
+        self.assertEqual(project.created, restored.created)
@@ -0,0 +1,82 @@
+import unittest
+
+from caplena.flyweight import PositionIndex
+from caplena.resources import ProjectDetail, Row
+from tests.common import build_controller, build_project_payload, build_row_payload
+
+
+class PositionIndexTests(unittest.TestCase):
+    def test_finding_items_succeeds(self) -> None:
+        index: PositionIndex[str] = PositionIndex(lambda item: item[0])
+
+        self.assertEqual("bar", index.find(["foo", "bar"], "b"))
+        self.assertEqual("baz", index.find(["foo", "baz"], "b"))
+        # note: sequences with a different layout are looked up correctly, too
+        self.assertEqual("baz", index.find(["baz", "foo"], "b"))
+        self.assertIsNone(index.find(["foo"], "b"))
+        self.assertEqual("first", index.find(["first", "fake"], "f"))
+
+    def test_finding_missing_items_keeps_index(self) -> None:
+        index: PositionIndex[str] = PositionIndex(lambda item: item[0])
+        index.find(["foo", "bar"], "b")
+        positions = index._positions
+
+        self.assertIsNone(index.find(["foo", "bar"], "x"))
+        self.assertIsNone(index.find(["foo"], "y"))
+        self.assertIs(positions, index._positions)
+        self.assertEqual("qux", index.find(["qux", "bar"], "q"))
+        self.assertIsNot(positions, index._positions)
+
+
+class RowLookupTests(unittest.TestCase):
+    def test_looking_up_columns_succeeds(self) -> None:
+        row = Row.build_obj(build_row_payload(), controller=None, metadata={"project": "pj_43"})
+
+        self.assertEqual("our_strengths", row.column("our_strengths").ref)  # type: ignore[union-attr]
+        self.assertEqual(42, row.column("customer_age").value)  # type: ignore[union-attr]
+        self.assertIsNone(row.column("missing"))
+
+    def test_rows_share_column_index(self) -> None:
+        controller = build_controller()
+        table = controller._flyweights("pj_43")
+        payload = build_row_payload()
+        reordered = {**payload, "columns": list(reversed(payload["columns"]))}
+        rows = [
+            Row.build_obj(obj, controller=controller, metadata={"project": "pj_43"})
+            for obj in [payload, reordered, payload]
+        ]
+
+        for row in rows:
+            self.assertEqual("customer_age", row.column("customer_age").ref)  # type: ignore[union-attr]
+        self.assertIs(table.index("row_columns", str), table.index("row_columns", str))
+
+    def test_looking_up_columns_without_project_succeeds(self) -> None:
+        row = Row.build_obj(build_row_payload(age=7), controller=None)
+
+        self.assertEqual(7, row.column("customer_age").value)  # type: ignore[union-attr]
+        self.assertIsNone(row.column("missing"))
+
+
+class ProjectLookupTests(unittest.TestCase):
+    def test_looking_up_columns_and_topics_succeeds(self) -> None:
+        project = ProjectDetail.build_obj(build_project_payload(), controller=None)
+
+        column = project.column("our_strengths")
+        self.assertIsInstance(column, ProjectDetail.TextToAnalyze)
+        self.assertIsNone(project.column("missing"))
+
+        topic = project.topic("cd_1")
+        self.assertEqual("price", topic.label)  # type: ignore[union-attr]
+        self.assertIs(topic, project.topic(0))
+        self.assertIs(topic, project.topic(2))
+        self.assertIsNone(project.topic(3))
+        self.assertIsNone(project.topic("cd_2"))
+
+    def test_joining_row_topics_succeeds(self) -> None:
+        project = ProjectDetail.build_obj(build_project_payload(), controller=None)
+        row = Row.build_obj(build_row_payload(), controller=None, metadata={"project": "pj_1"})
+
+        row_topic = row.column("our_strengths").topics[0]  # type: ignore[union-attr]
+
+        self.assertEqual("#FF0000", project.topic(row_topic.id).color)  # type: ignore[union-attr]
+        self.assertIs(project.topic(row_topic.id), project.topic(row_topic.code))
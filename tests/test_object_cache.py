@@ -0,0 +1,119 @@
+import unittest
+from typing import Any
+
+import requests_mock
+
+from caplena.object_cache import ObjectCache
+from tests.common import (
+    build_controller,
+    build_project_payload,
+    build_row_payload,
+    build_wide_row_payload,
+)
+
+PROJECT_URI = "http://localhost:8000/v2/projects/pj_1"
+ROW_URI = PROJECT_URI + "/rows/ro_1"
+
+
+class ObjectCacheTests(unittest.TestCase):
+    def test_retrieving_cached_project_succeeds(self) -> None:
+        cache = ObjectCache()
+        controller = build_controller(object_cache=cache)
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(PROJECT_URI, json=build_project_payload())
+            first = controller.retrieve(id="pj_1")
+            first.name = "Modified"
+            second = controller.retrieve(id="pj_1")
+
+            self.assertEqual(1, mocked.call_count)
+
+        self.assertIsNot(first, second)
+        self.assertEqual("Project Name", second.name)
+        self.assertEqual((1, 1), (cache.hits, cache.misses))
+
+    def test_reading_after_writing_succeeds(self) -> None:
+        controller = build_controller(object_cache=ObjectCache())
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(PROJECT_URI, json=build_project_payload())
+            mocker.patch(PROJECT_URI, json=build_project_payload(name="Renamed"))
+            mocked_row = mocker.get(ROW_URI, json=build_row_payload())
+            mocker.patch(ROW_URI, json=build_row_payload(age=43))
+
+            controller.update(id="pj_1", name="Renamed")
+            self.assertEqual("Renamed", controller.retrieve(id="pj_1").name)
+            controller.update_row(
+                p_id="pj_1", r_id="ro_1", columns=[{"ref": "customer_age", "value": 43}]
+            )
+            row = controller.retrieve_row(p_id="pj_1", r_id="ro_1")
+
+            self.assertEqual(43, row.columns[0].value)
+            self.assertEqual("pj_1", row._metadata["project"])
+            self.assertEqual(0, mocked_row.call_count)
+            # note: updating a row evicts its project, as the row counts might have changed
+            controller.retrieve(id="pj_1")
+            self.assertEqual(1, mocked.call_count)
+
+    def test_modifying_cached_rows_with_unknown_columns_succeeds(self) -> None:
+        controller = build_controller(object_cache=ObjectCache())
+        payload = build_wide_row_payload()
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(PROJECT_URI, json=build_project_payload())
+            mocker.get(ROW_URI, json=payload)
+            # note: the row has columns that are not part of the project, so it is parsed generically
+            controller.retrieve(id="pj_1")
+            first = controller.retrieve_row(p_id="pj_1", r_id="ro_1")
+            value: Any = first.columns[-1].value
+            value["nested"].append(3)
+            second = controller.retrieve_row(p_id="pj_1", r_id="ro_1")
+
+        self.assertEqual({"nested": [1, 2]}, second.columns[-1].value)
+        self.assertEqual(
+            {"columns": [{"ref": "other", "value": {"nested": [1, 2, 3]}}]}, first.modified_dict()
+        )
+
+    def test_removing_project_evicts_its_rows(self) -> None:
+        cache = ObjectCache()
+        controller = build_controller(object_cache=cache)
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(PROJECT_URI, json=build_project_payload())
+            mocker.get(ROW_URI, json=build_row_payload())
+            mocker.delete(PROJECT_URI, status_code=204)
+            controller.retrieve(id="pj_1")
+            controller.retrieve_row(p_id="pj_1", r_id="ro_1")
+            self.assertEqual(2, cache.size)
+
+            controller.remove(id="pj_1")
+            self.assertEqual(0, cache.size)
+
+    def test_refreshing_bypasses_cache(self) -> None:
+        controller = build_controller(object_cache=ObjectCache())
+
+        with requests_mock.Mocker() as mocker:
+            mocked = mocker.get(
+                PROJECT_URI,
+                [{"json": build_project_payload()}, {"json": build_project_payload(name="New")}],
+            )
+            project = controller.retrieve(id="pj_1")
+            project.refresh()
+
+            self.assertEqual(2, mocked.call_count)
+            self.assertEqual("New", project.name)
+            self.assertEqual("New", controller.retrieve(id="pj_1").name)
+
+    def test_evicting_least_recently_used_objects_succeeds(self) -> None:
+        cache = ObjectCache(maxsize=2)
+        cache.set(("projects", "pj_1"), {"id": "pj_1"})
+        cache.set(("projects", "pj_2"), {"id": "pj_2"})
+        cache.get(("projects", "pj_1"))
+        cache.set(("projects", "pj_3"), {"id": "pj_3"})
+
+        self.assertIsNotNone(cache.get(("projects", "pj_1")))
+        self.assertIsNone(cache.get(("projects", "pj_2")))
+        self.assertEqual(2 / 3, cache.hit_ratio)
+
+        cache.clear()
+        self.assertEqual((0, 0, 0), (cache.size, cache.hits, cache.misses))
@@ -0,0 +1,175 @@
+import json
+import unittest
+from typing import Any, Dict, List, Optional
+
+import requests_mock
+
+from caplena.endpoints.row_export import RowExport, _convert_page
+from caplena.filters import RowsFilter
+from caplena.resources import Row
+from tests.common import build_controller, build_project_payload, build_row_payload
+
+PROJECT_URI = "http://localhost:8000/v2/projects/pj_1"
+LAYOUT = (("customer_age", "numerical"), ("our_strengths", "text_to_analyze"))
+PAGE_SIZE = 3
+
+
+def build_page(ids: List[int], *, has_next: bool = False) -> bytes:
+    results = [build_row_payload(f"ro_{i}", age=i) for i in ids]
+    next_url = "next" if has_next else None
+    return json.dumps({"results": results, "next_url": next_url, "count": 0}).encode("utf-8")
+
+
+def build_export(rows: int, *, processes: int, estimated: Optional[int] = None) -> RowExport:
+    def fetch_page(page: int) -> Optional[bytes]:
+        # note: like the API, pages after the first are out of range if they contain no rows
+        if page > 1 and (page - 1) * PAGE_SIZE >= rows:
+            return None
+        ids = list(range((page - 1) * PAGE_SIZE, min(page * PAGE_SIZE, rows)))
+        return build_page(ids, has_next=page * PAGE_SIZE < rows)
+
+    estimated = rows if estimated is None else estimated
+    return RowExport(
+        layout=LAYOUT, pages=-(-estimated // PAGE_SIZE), fetch_page=fetch_page, processes=processes
+    )
+
+
+class ConvertPageTests(unittest.TestCase):
+    def test_converting_pages_matches_columnar_rows(self) -> None:
+        content = build_page([1, 2])
+        rows = [
+            Row.build_obj(row, controller=None, obj_exists=True)
+            for row in json.loads(content)["results"]
+        ]
+
+        converted, size, has_next = _convert_page(content, LAYOUT, True)
+        expected = Row.to_columnar(rows)
+
+        self.assertEqual((2, False), (size, has_next))
+        self.assertEqual(set(expected), set(converted))
+        for field in expected.keys() - {"columns.our_strengths.topics"}:
+            self.assertEqual(expected[field], converted[field], field)
+        self.assertEqual("price", converted["columns.our_strengths.topics"][0][0]["label"])
+
+    def test_converting_pages_into_tuples_succeeds(self) -> None:
+        payload = build_row_payload("ro_1")
+        payload["columns"] = [
+            {"ref": "visited", "type": "date", "value": "2022-01-05T10:00:00.000Z"},
+            {"ref": "unknown", "type": "text", "value": "skipped"},
+        ]
+        content = json.dumps({"results": [payload]}).encode("utf-8")
+
+        (row,), _, _ = _convert_page(content, (("visited", "date"), ("missing", "text")), False)
+
+        self.assertEqual(5, row[3].day)
+        self.assertEqual(5, len(row))
+        self.assertIsNone(row[4])
+
+
+class RowExportTests(unittest.TestCase):
+    def test_exporting_rows_succeeds(self) -> None:
+        export = build_export(10, processes=1)
+
+        pages = list(export.iter_tuples())
+
+        self.assertEqual([3, 3, 3, 1], [len(page) for page in pages])
+        self.assertEqual(
+            ["id", "created", "last_modified", "columns.customer_age"], [*export.fields[:4]]
+        )
+        self.assertEqual(list(range(10)), [row[3] for page in pages for row in page])
+
+    def test_exporting_rows_added_after_estimate_succeeds(self) -> None:
+        for estimated in [0, 5, 9, 20]:
+            export = build_export(13, processes=1, estimated=estimated)
+
+            pages = list(export.iter_tuples())
+
+            self.assertEqual(list(range(13)), [row[3] for page in pages for row in page])
+
+    def test_exporting_rows_removed_after_estimate_succeeds(self) -> None:
+        for estimated in [13, 20, 40]:
+            export = build_export(7, processes=1, estimated=estimated)
+
+            pages = list(export.iter_tuples())
+
+            self.assertEqual(list(range(7)), [row[3] for page in pages for row in page])
+
+    def test_exporting_rows_with_processes_succeeds(self) -> None:
+        export = build_export(20, processes=2)
+
+        batches = list(export.iter_columnar())
+
+        self.assertEqual(7, len(batches))
+        self.assertEqual(
+            list(range(20)), [age for b in batches for age in b["columns.customer_age"]]
+        )
+
+    def test_exporting_rows_with_invalid_processes_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "HINT"):
+            build_export(10, processes=0)
+
+    def test_controller_exports_rows(self) -> None:
+        controller = build_controller()
+
+        rows = 40
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            page, limit = int(request.qs["page"][0]), int(request.qs["limit"][0])
+            ids = range((page - 1) * limit, min(page * limit, rows))
+            return {
+                "results": [build_row_payload(f"ro_{i}", age=i) for i in ids],
+                "next_url": "next" if page * limit < rows else None,
+                "count": rows,
+            }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(PROJECT_URI, json=build_project_payload("pj_1"))
+            listed = mocker.get(PROJECT_URI + "/rows", json=respond)
+
+            self.assertEqual(40, controller.count_rows(id="pj_1"))
+            export = controller.export_rows(id="pj_1", processes=1)
+            # note: rows added after counting or building the export are exported as well
+            rows = 65
+            ages = [row[3] for page in export.iter_tuples() for row in page]
+
+            # note: the cached count, the uncached count and three pages of 30 rows
+            self.assertEqual(5, listed.call_count)
+            self.assertEqual(list(range(65)), ages)
+
+            controller.api.max_filter_query_length = 50
+            with self.assertRaisesRegex(ValueError, "HINT"):
+                controller.export_rows(
+                    id="pj_1",
+                    filter=RowsFilter.Columns.text(ref="text", exact__i=["a" * 30, "b" * 30]),
+                )
+
+    def test_controller_exports_rows_removed_after_counting(self) -> None:
+        controller = build_controller()
+
+        rows = 100
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            page, limit = int(request.qs["page"][0]), int(request.qs["limit"][0])
+            if page > 1 and (page - 1) * limit >= rows:
+                context.status_code = 404
+                return {"type": "not_found", "code": "not_found", "message": "Invalid page."}
+            ids = range((page - 1) * limit, min(page * limit, rows))
+            return {
+                "results": [build_row_payload(f"ro_{i}", age=i) for i in ids],
+                "next_url": "next" if page * limit < rows else None,
+                "count": rows,
+            }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(PROJECT_URI, json=build_project_payload("pj_1"))
+            listed = mocker.get(PROJECT_URI + "/rows", json=respond)
+
+            export = controller.export_rows(id="pj_1", processes=1)
+            # note: the export estimated four pages, of which only two remain
+            rows = 45
+            ages = [row[3] for page in export.iter_tuples() for row in page]
+
+            self.assertEqual(list(range(45)), ages)
+            # note: whether the out-of-range pages were requested before the export stopped
+            # depends on the fetcher threads, but no pages beyond the estimate are requested
+            self.assertTrue(all(int(r.qs["page"][0]) <= 4 for r in listed.request_history))
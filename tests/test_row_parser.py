@@ -0,0 +1,113 @@
+import unittest
+from datetime import datetime, timezone
+from typing import Any
+
+import requests_mock
+
+from caplena.endpoints.row_parser import RowParser
+from caplena.flyweight import FlyweightTable
+from caplena.resources import Row
+from tests.common import (
+    build_controller,
+    build_project_payload,
+    build_row_payload,
+    build_wide_row_payload,
+)
+
+PROJECT_URI = "http://localhost:8000/v2/projects/pj_44"
+
+
+class RowParserTests(unittest.TestCase):
+    def test_parsing_rows_matches_generic_parsing(self) -> None:
+        controller = build_controller()
+        payload = build_wide_row_payload()
+        parser = RowParser.from_row("pj_44", payload, flyweights=FlyweightTable("pj_44"))
+
+        parsed = Row.build_obj(payload, controller=None, obj_exists=True)
+        compiled = parser.parse(payload, controller=controller, metadata={"project": "pj_44"})
+
+        assert compiled is not None
+        self.assertEqual(parsed, compiled)
+        self.assertEqual(parsed.dict(), compiled.dict())
+        self.assertEqual("ro_1", compiled.id)
+        self.assertEqual({"project": "pj_44"}, compiled._metadata)
+        self.assertIs(controller, compiled.columns[1].topics[0].controller)
+        self.assertIs(compiled.columns[0]._metadata, compiled.columns[1].topics[0]._metadata)
+        self.assertEqual(datetime(2022, 1, 5, 10, tzinfo=timezone.utc), compiled.columns[2].value)
+        self.assertFalse(compiled.is_modified)
+
+    def test_modifying_compiled_rows_succeeds(self) -> None:
+        payload = build_wide_row_payload()
+        compiled = RowParser.from_row("pj_44", payload).parse(payload, controller=None)
+        assert compiled is not None
+
+        value: Any = compiled.columns[-1].value
+        value["nested"].append(3)
+        compiled.columns[1].topics[0].sentiment = "negative"
+
+        self.assertTrue(compiled.is_modified)
+        self.assertEqual({"nested": [1, 2]}, payload["columns"][-1]["value"])
+        self.assertEqual(
+            {
+                "columns": [
+                    {"ref": "our_strengths", "topics": [{"sentiment": "negative"}]},
+                    {"ref": "other", "value": {"nested": [1, 2, 3]}},
+                ]
+            },
+            compiled.modified_dict(),
+        )
+
+    def test_matching_rows_with_different_layout_fails(self) -> None:
+        payload = build_wide_row_payload()
+        parser = RowParser.from_row("pj_44", payload)
+        reordered = list(reversed(payload["columns"]))
+        retyped = [{**payload["columns"][0], "type": "text"}, *payload["columns"][1:]]
+
+        self.assertTrue(parser.matches(payload["columns"]))
+        self.assertFalse(parser.matches(reordered))
+        self.assertFalse(parser.matches(retyped))
+        self.assertFalse(parser.matches(payload["columns"][:3]))
+
+    def test_controller_compiles_parser_from_project(self) -> None:
+        controller = build_controller()
+        project = build_project_payload("pj_44")
+        row = build_row_payload("ro_1")
+        rows = {"results": [row], "next_url": None, "count": 1}
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(PROJECT_URI, json=project)
+            mocker.get(PROJECT_URI + "/rows", json=rows)
+            controller.retrieve(id="pj_44")
+            parser = controller._row_parser("pj_44", row["columns"])
+            listed = list(controller.list_rows(id="pj_44"))
+
+        self.assertEqual(1, len(controller._row_parsers))
+        self.assertEqual(
+            (("customer_age", "numerical"), ("our_strengths", "text_to_analyze")), parser.layout
+        )
+        self.assertEqual(42, listed[0].column("customer_age").value)  # type: ignore[union-attr]
+
+    def test_controller_compiles_parser_per_layout(self) -> None:
+        controller = build_controller()
+        first, second = build_row_payload("ro_1"), build_row_payload("ro_2")
+        second["columns"].append({"ref": "comment", "type": "text", "value": "Hello."})
+        third = {**first, "id": "ro_3", "columns": list(reversed(first["columns"]))}
+
+        rows = [
+            Row.build_obj(
+                row, controller=controller, obj_exists=True, metadata={"project": "pj_45"}
+            )
+            for row in [first, second, third, first]
+        ]
+
+        self.assertEqual("Hello.", rows[1].column("comment").value)  # type: ignore[union-attr]
+        self.assertEqual(rows[0], rows[3])
+        self.assertEqual(["our_strengths", "customer_age"], [c.ref for c in rows[2].columns])
+        self.assertEqual(
+            [RowParser.layout_of(row["columns"]) for row in [first, second, third]],
+            [layout for _, layout in controller._row_parsers.keys()],
+        )
+        self.assertIs(
+            controller._row_parser("pj_45", first["columns"]),
+            controller._row_parser("pj_45", build_row_payload("ro_4")["columns"]),
+        )
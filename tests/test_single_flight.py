@@ -0,0 +1,129 @@
+import json
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from caplena.http.http_client import HttpClient, HttpMethod
+from caplena.http.http_response import HttpResponse
+from caplena.http.single_flight import SingleFlight
+from tests.common import build_controller, build_project_payload
+
+
+class BlockingHttpClient(HttpClient):
+    """An http client holding back all responses until released."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.released = threading.Event()
+        self.uris: List[str] = []
+
+    @property
+    def identifier(self) -> str:
+        return "blocking"
+
+    def request_raw(
+        self,
+        uri: str,
+        *,
+        method: HttpMethod,
+        timeout: int,
+        headers: Dict[str, str],
+        data: Optional[bytes] = None,
+    ) -> HttpResponse:
+        self.uris.append(uri)
+        self.released.wait(timeout=5)
+        return HttpResponse(
+            status_code=200, reason="OK", text=json.dumps(build_project_payload(uri[-4:]))
+        )
+
+
+class SingleFlightTests(unittest.TestCase):
+    def wait_for_requests(self, single_flight: SingleFlight, count: int) -> None:
+        for _ in range(500):
+            if single_flight.in_flight == count:
+                return
+            threading.Event().wait(0.01)
+
+    def test_coalescing_identical_requests_succeeds(self) -> None:
+        http_client = BlockingHttpClient()
+        controller = build_controller(http_client=http_client, coalesce_requests=True)
+        # note: the configuration sends its requests using a copy of the given client
+        single_flight = controller.config.http_client.single_flight
+        assert single_flight is not None
+
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            futures = [executor.submit(controller.retrieve, id="pj_1") for _ in range(8)]
+            futures.append(executor.submit(controller.retrieve, id="pj_2"))
+            self.wait_for_requests(single_flight, 2)
+            threading.Event().wait(0.1)
+            http_client.released.set()
+            projects = [future.result() for future in futures]
+
+        self.assertEqual(2, len(http_client.uris))
+        self.assertEqual(["pj_1"] * 8 + ["pj_2"], [project.id for project in projects])
+        self.assertEqual(0, single_flight.in_flight)
+
+    def test_requests_with_different_api_keys_are_not_coalesced(self) -> None:
+        http_client = BlockingHttpClient()
+        controller_a = build_controller(
+            http_client=http_client, api_key="key-a", coalesce_requests=True
+        )
+        controller_b = build_controller(
+            http_client=http_client, api_key="key-b", coalesce_requests=True
+        )
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            future_a = executor.submit(controller_a.retrieve, id="pj_1")
+            future_b = executor.submit(controller_b.retrieve, id="pj_1")
+            http_client.released.set()
+            future_a.result()
+            future_b.result()
+
+        self.assertEqual(2, len(http_client.uris))
+
+    def test_coalesced_requests_get_their_own_responses(self) -> None:
+        single_flight = SingleFlight()
+        started = threading.Event()
+        released = threading.Event()
+
+        def respond() -> HttpResponse:
+            started.set()
+            released.wait(timeout=5)
+            return HttpResponse(status_code=200, reason="OK", text='{"id": "pj_1"}')
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, "key", respond)
+            started.wait(timeout=5)
+            follower = executor.submit(single_flight.do, "key", respond)
+            self.wait_for_requests(single_flight, 1)
+            threading.Event().wait(0.05)
+            released.set()
+            responses = [leader.result(), follower.result()]
+
+        self.assertIsNot(responses[0], responses[1])
+        self.assertIs(responses[0].content, responses[1].content)
+        json_body = responses[1].json
+        assert json_body is not None
+        json_body["id"] = "pj_2"
+        self.assertEqual({"id": "pj_1"}, responses[0].json)
+
+    def test_sharing_exceptions_succeeds(self) -> None:
+        single_flight = SingleFlight()
+        started = threading.Event()
+        released = threading.Event()
+
+        def fail() -> HttpResponse:
+            started.set()
+            released.wait(timeout=5)
+            raise ConnectionError("unreachable")
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, "key", fail)
+            started.wait(timeout=5)
+            follower = executor.submit(single_flight.do, "key", fail)
+            threading.Event().wait(0.05)
+            released.set()
+
+            self.assertRaises(ConnectionError, leader.result)
+            self.assertRaises(ConnectionError, follower.result)
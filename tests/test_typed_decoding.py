@@ -0,0 +1,146 @@
+import importlib.util
+import json
+import unittest
+from datetime import datetime, timezone
+from typing import Any
+
+import requests_mock
+
+from caplena.resources import ListedProject, ProjectDetail, Row
+from tests.common import (
+    build_controller,
+    build_project_payload,
+    build_row_payload,
+    build_wide_row_payload,
+)
+
+HAS_MSGSPEC = importlib.util.find_spec("msgspec") is not None
+ROWS_URI = "http://localhost:8000/v2/projects/pj_1/rows"
+
+
+@unittest.skipUnless(HAS_MSGSPEC, "msgspec is not installed")
+class TypedDecodingTests(unittest.TestCase):
+    def test_decoding_rows_matches_parsing(self) -> None:
+        from caplena.endpoints.projects_schema import TYPED_DECODERS
+
+        controller = build_controller(typed_decoding=True)
+        payload = build_wide_row_payload()
+        parsed = Row.build_obj(
+            payload, controller=controller, obj_exists=True, metadata={"project": "pj_1"}
+        )
+        decoded: Row = TYPED_DECODERS[Row].decode(
+            json.dumps(payload).encode(), controller=controller, metadata={"project": "pj_1"}
+        )
+
+        self.assertEqual(parsed, decoded)
+        self.assertEqual(parsed.dict(), decoded.dict())
+        self.assertEqual("ro_1", decoded.id)
+        self.assertEqual({"project": "pj_1"}, decoded._metadata)
+        self.assertEqual(datetime(2022, 3, 14, 8, 18, 38, 910000, timezone.utc), decoded.created)
+        self.assertEqual(datetime(2022, 1, 5, 10, tzinfo=timezone.utc), decoded.columns[2].value)
+        self.assertIs(controller, decoded.columns[1].topics[0].controller)
+        self.assertIs(decoded.columns[0]._metadata, decoded.columns[1].topics[0]._metadata)
+        self.assertFalse(decoded.is_modified)
+
+        for row in [parsed, decoded]:
+            row.columns[0].value = 7
+            row.columns[1].topics[0].sentiment = "negative"
+        self.assertTrue(decoded.is_modified)
+        self.assertEqual(parsed.modified_dict(), decoded.modified_dict())
+
+    def test_modifying_decoded_values_in_place_succeeds(self) -> None:
+        from caplena.endpoints.projects_schema import TYPED_DECODERS
+
+        payload = build_wide_row_payload()
+        payload["columns"][-1]["value"] = [1, 2]
+        decoded: Row = TYPED_DECODERS[Row].decode(json.dumps(payload).encode(), controller=None)
+
+        value: Any = decoded.columns[-1].value
+        value.append(3)
+
+        self.assertTrue(decoded.is_modified)
+        self.assertEqual(
+            {"columns": [{"ref": "other", "value": [1, 2, 3]}]}, decoded.modified_dict()
+        )
+
+    def test_decoding_projects_matches_parsing(self) -> None:
+        from caplena.endpoints.projects_schema import TYPED_DECODERS
+
+        payload = build_project_payload()
+        payload["columns"][1]["metadata"]["learns_from"] = {"project": "pj_2", "ref": "other"}
+        content = json.dumps(payload).encode()
+        parsed = ProjectDetail.build_obj(payload, controller=None, obj_exists=True)
+        decoded: ProjectDetail = TYPED_DECODERS[ProjectDetail].decode(content, controller=None)
+        listed: ListedProject = TYPED_DECODERS[ListedProject].decode(content, controller=None)
+
+        self.assertEqual(parsed, decoded)
+        self.assertEqual(parsed.dict(), decoded.dict())
+        self.assertEqual("cd_1", decoded.columns[1].topics[0].id)
+        self.assertEqual(ListedProject.build_obj(payload, controller=None, obj_exists=True), listed)
+
+        decoded.tags.append("other-tag")
+        decoded.columns[1].name = "Do you really like us?"
+        self.assertEqual(["my-tag"], decoded._previous["tags"])
+        self.assertEqual(
+            {
+                "tags": ["my-tag", "other-tag"],
+                "columns": [
+                    {
+                        "ref": "our_strengths",
+                        "type": "text_to_analyze",
+                        "name": "Do you really like us?",
+                    }
+                ],
+            },
+            decoded.modified_dict(),
+        )
+
+    def test_decoding_projects_with_optional_values_succeeds(self) -> None:
+        from caplena.endpoints.projects_schema import TYPED_DECODERS
+
+        payload = build_project_payload()
+        payload["columns"][1]["description"] = None
+        payload["columns"][1]["topics"][0].update(color=None, description=None)
+        parsed = ProjectDetail.build_obj(payload, controller=None, obj_exists=True)
+        decoded: ProjectDetail = TYPED_DECODERS[ProjectDetail].decode(
+            json.dumps(payload).encode(), controller=None
+        )
+
+        self.assertEqual(parsed, decoded)
+        self.assertEqual(parsed.dict(), decoded.dict())
+        self.assertIsNone(decoded.columns[1].topics[0].color)
+
+        # note: missing optional values are decoded as null
+        del payload["columns"][1]["description"]
+        del payload["columns"][1]["topics"][0]["color"]
+        missing: ProjectDetail = TYPED_DECODERS[ProjectDetail].decode(
+            json.dumps(payload).encode(), controller=None
+        )
+        self.assertEqual(decoded.dict(), missing.dict())
+
+    def test_listing_rows_succeeds(self) -> None:
+        controller = build_controller(typed_decoding=True)
+        page = {
+            "results": [build_wide_row_payload(f"ro_{i}") for i in range(3)],
+            "next_url": None,
+            "count": 3,
+        }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(ROWS_URI, json=page)
+            rows = list(controller.list_rows(id="pj_1"))
+
+        self.assertEqual(["ro_0", "ro_1", "ro_2"], [row.id for row in rows])
+        self.assertEqual("pj_1", rows[0]._metadata["project"])
+
+    def test_decoding_invalid_rows_fails(self) -> None:
+        import msgspec
+
+        controller = build_controller(typed_decoding=True)
+        row = build_row_payload()
+        row["columns"][0]["value"] = "not a number"
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(ROWS_URI + "/ro_1", json=row)
+            with self.assertRaises(msgspec.ValidationError):
+                controller.retrieve_row(p_id="pj_1", r_id="ro_1")
@@ -0,0 +1,124 @@
+import time
+import unittest
+from typing import Any, Dict
+
+import requests_mock
+
+from caplena.api import ApiException
+from caplena.concurrency import RateLimiter
+from caplena.resources import Row
+from caplena.unit_of_work import UnitOfWork
+from tests.common import build_controller, build_row_payload
+
+ROWS_URI = "http://localhost:8000/v2/projects/pj_1/rows"
+
+
+class UnitOfWorkTests(unittest.TestCase):
+    def test_saving_modified_rows_succeeds(self) -> None:
+        controller = build_controller()
+        page = {
+            "results": [build_row_payload(f"ro_{i}") for i in range(4)],
+            "next_url": None,
+            "count": 4,
+        }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(ROWS_URI, json=page)
+            mocker.patch(ROWS_URI + "/ro_1", json=build_row_payload("ro_1", age=1))
+            mocker.patch(ROWS_URI + "/ro_2", json=build_row_payload("ro_2", age=2))
+            mocker.patch(
+                ROWS_URI + "/ro_3",
+                status_code=400,
+                json={"type": "invalid_request_error", "code": "invalid", "message": "Invalid."},
+            )
+
+            with controller.unit_of_work(max_workers=2) as uow:
+                rows = list(controller.list_rows(id="pj_1"))
+                for age, row in enumerate(rows[1:], start=1):
+                    row.columns[0].value = age
+
+            patches = {r.path: r.json() for r in mocker.request_history if r.method == "PATCH"}
+            self.assertEqual(3, len(patches))
+            self.assertEqual(
+                {"columns": [{"ref": "customer_age", "value": 1}]},
+                patches["/v2/projects/pj_1/rows/ro_1"],
+            )
+
+        self.assertEqual(
+            ["ro_1", "ro_2"], sorted(row.id for row in uow.saved if isinstance(row, Row))
+        )
+        self.assertEqual(1, len(uow.errors))
+        self.assertIsInstance(uow.errors[0][1], ApiException)
+        self.assertFalse(rows[1].is_modified)
+        self.assertEqual([], uow.objects)
+
+    def test_saving_rows_of_prefetched_pages_succeeds(self) -> None:
+        controller = build_controller()
+        rows = 70
+
+        def respond(request: Any, context: Any) -> Dict[str, Any]:
+            page, limit = int(request.qs["page"][0]), int(request.qs["limit"][0])
+            ids = range((page - 1) * limit, min(page * limit, rows))
+            return {
+                "results": [build_row_payload(f"ro_{i}") for i in ids],
+                "next_url": "next" if page * limit < rows else None,
+                "count": rows,
+            }
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(ROWS_URI, json=respond)
+            mocker.patch(ROWS_URI + "/ro_45", json=build_row_payload("ro_45", age=1))
+            mocker.patch(ROWS_URI + "/ro_65", json=build_row_payload("ro_65", age=2))
+
+            with controller.unit_of_work() as uow:
+                # note: the pages of a slice are fetched concurrently by worker threads
+                listed = controller.list_rows(id="pj_1")[40:]
+                listed[5].columns[0].value = 1
+                listed[25].columns[0].value = 2
+
+            patched = sorted(r.path for r in mocker.request_history if r.method == "PATCH")
+
+        self.assertEqual(["/v2/projects/pj_1/rows/ro_45", "/v2/projects/pj_1/rows/ro_65"], patched)
+        self.assertEqual(2, len(uow.saved))
+
+    def test_raising_within_unit_of_work_discards_updates(self) -> None:
+        controller = build_controller()
+
+        with requests_mock.Mocker() as mocker:
+            mocker.get(ROWS_URI + "/ro_1", json=build_row_payload("ro_1"))
+            with self.assertRaises(KeyError):
+                with controller.unit_of_work() as uow:
+                    row = controller.retrieve_row(p_id="pj_1", r_id="ro_1")
+                    row.columns[0].value = 1
+                    raise KeyError("abort")
+
+            self.assertEqual(1, mocker.call_count)
+            self.assertEqual(1, len(uow.objects))
+
+        # note: objects retrieved after leaving the unit of work are not tracked anymore
+        self.assertEqual([], controller._units_of_work)
+
+    def test_adding_objects_explicitly_succeeds(self) -> None:
+        controller = build_controller()
+        row = Row.build_obj(build_row_payload(), controller=controller, obj_exists=True)
+        uow = UnitOfWork()
+        uow.add(row)
+        uow.add(row)
+
+        self.assertEqual(1, len(uow.objects))
+        uow.commit()
+        self.assertEqual([], uow.saved)
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_limiting_rate_succeeds(self) -> None:
+        limiter = RateLimiter(50)
+        start = time.monotonic()
+        for _ in range(6):
+            limiter.acquire()
+
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
+
+    def test_invalid_rate_fails(self) -> None:
+        with self.assertRaisesRegex(ValueError, "rate"):
+            RateLimiter(0)